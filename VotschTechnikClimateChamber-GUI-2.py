@@ -1,26 +1,82 @@
 import tkinter as tk
-from tkinter import ttk, Frame, Label, Button, Scale, Canvas, Entry
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from matplotlib.figure import Figure
-import numpy as np
+from tkinter import ttk, Frame, Label, Button, Scale, Canvas, Entry, filedialog, simpledialog
 from threading import Thread
+import argparse
+import json
+import math
+import multiprocessing
+import os
 import time
-import random
-from colorsys import hsv_to_rgb
-from VotschTechnikClimateChamber.ClimateChamber import ClimateChamber
 from version import __version__
+from chamber_gui import events
+from chamber_gui import budget as render_budget
+from chamber_gui.backends import open_backend
+from chamber_gui.colors import TemperatureColorMap, adjust_brightness
+from chamber_gui.eventloop import LoopLagMonitor, RenderGate, SamplingProfiler
+from chamber_gui.instrumentation import CommandStats, PERCENTILES
+from chamber_gui.logview import BatchedLogView
+from chamber_gui.markers import MarkerIndex
+from chamber_gui.metadata_cache import ChamberMetadataCache
+from chamber_gui.supervisor import ConnectionSupervisor
+from chamber_gui.viewport import Viewport
+
+# Set by the startup benchmark to record launch timings and exit
+STARTUP_PROBE_ENV = 'VT_GUI_STARTUP_PROBE'
 
 
 class DarkThemeThermalChamber:
-    def __init__(self, root):
+    # Time ranges offered by the event search bar, in seconds
+    EVENT_RANGES = {"all": None, "1 h": 3600, "24 h": 24 * 3600, "7 days": 7 * 24 * 3600}
+    # Start time ranges offered by the session search bar, in seconds
+    SESSION_RANGES = {"all": None, "24 h": 24 * 3600, "7 days": 7 * 24 * 3600, "30 days": 30 * 24 * 3600,
+                      "1 year": 365 * 24 * 3600}
+    # How often finished frames are collected from the render process
+    FRAME_POLL_MS = 15
+    # Windows offered for following the live history, in seconds
+    PLOT_SPANS = {"all": None, "10 min": 600, "1 h": 3600, "8 h": 8 * 3600, "24 h": 24 * 3600,
+                  "7 days": 7 * 24 * 3600}
+
+    def __init__(self, root, isolated_acquisition=False, render_process=False,
+                 budget=render_budget.DEFAULT_BUDGET, data_dir=None):
         self.root = root
+        # Metadata cache, logs, recorded sessions and profiles all live under data_dir
+        self.data_dir = data_dir or os.path.join(os.path.expanduser("~"), ".votsch_gui")
         self.root.title("Thermal Chamber Controller - Gradient Mode")
         self.root.geometry("1100x750")
         self.root.configure(bg='#121212')
 
         # Application settings
         self.tcam = None
+        self.metadata_cache = ChamberMetadataCache(os.path.join(self.data_dir, "chamber_cache.json"))
+        # Static chamber fields already queried during this session, keyed by IP
+        self.session_metadata = {}
+        self.supervisor = None
+        # Every run is recorded to its own session directory and indexed in the catalog. Both need
+        # numpy and sqlite3, so they are set up off the Tk thread once the control UI is shown
+        self.session_dir = os.path.join(self.data_dir, "sessions")
+        self.catalog = None
+        self.recorder = None
+        # Latency histograms of every call made through the chamber backend
+        self.chamber_stats = CommandStats()
+        # Sample in a separate process so rendering cannot delay acquisition
+        self.isolated_acquisition = isolated_acquisition
+        self.acquisition = None
+        # Render the plot in a separate process so drawing cannot block the Tk thread
+        self.render_process = render_process
+        # How much CPU the plot and log may use; acquisition always runs at full rate
+        self.budget = render_budget.BUDGETS[budget]
+        self.startup_probe = None
+        # Redraws are skipped while the plot is on a hidden tab or the window is minimized
+        self.render_gate = RenderGate(max_fps=self.budget.max_fps)
+        self.throttled_frame = None
+        self.window_mapped = True
+        # Event-loop diagnostics, both idle until switched on in the Logs tab
+        self.loop_monitor = LoopLagMonitor(root)
+        self.profiler = SamplingProfiler()
+        self.update_plot = self.loop_monitor.wrap('update_plot', self.update_plot)
+        self.set_temp = self.loop_monitor.wrap('set_temp', self.set_temp)
+        self.log = self.loop_monitor.wrap('log_event', self.log)
+        self.show_frame = self.loop_monitor.wrap('show_frame', self.show_frame)
         # self.default_port = 2049  # Default port for chamber communication
 
         # Color settings
@@ -32,6 +88,7 @@ class DarkThemeThermalChamber:
         self.min_temp = -40
         self.max_temp = 130
         self.temp_range = self.max_temp - self.min_temp
+        self.color_map = TemperatureColorMap(self.min_temp, self.max_temp)
 
         # Configure styles
         self.style = ttk.Style()
@@ -73,12 +130,18 @@ class DarkThemeThermalChamber:
         self.create_control_tab()
         self.create_settings_tab()
         self.create_logs_tab()
+        self.create_diagnostics_tab()
+        self.create_sessions_tab()
+        self.notebook.bind('<<NotebookTabChanged>>', self.update_plot_visibility)
+        self.root.bind('<Map>', self.update_plot_visibility, add='+')
+        self.root.bind('<Unmap>', self.update_plot_visibility, add='+')
 
         # Initialize state
         self.current_temp = 25.0
         self.target_temp = 25.0
         self.is_running = False
         self.is_connected = False
+        self.in_gap = False
         self.running = True
 
         # Start temperature simulation thread
@@ -113,7 +176,7 @@ class DarkThemeThermalChamber:
         self.ip_var = tk.StringVar(value="192.168.0.11")
         self.ip_combobox = ttk.Combobox(ip_control_frame,
                                         textvariable=self.ip_var,
-                                        values=["192.168.0.11", "192.168.0.21", "192.168.0.31", "localhost"],
+                                        values=["192.168.0.11", "192.168.0.21", "192.168.0.31", "localhost", "simulator"],
                                         font=('Helvetica', 10),
                                         width=15)
         self.ip_combobox.pack(side='left', padx=(0, 5))
@@ -158,6 +221,12 @@ class DarkThemeThermalChamber:
                                       style='Status.TLabel')
         self.status_label.pack(side='right', padx=(0, 5))
 
+        # Rendering budget
+        self.budget_label = ttk.Label(ip_control_frame,
+                                      text=render_budget.describe(self.budget),
+                                      style='Status.TLabel')
+        self.budget_label.pack(side='right', padx=(0, 5))
+
         # Temperature Display
         self.temp_display_frame = ttk.Frame(self.control_tab, style='Card.TFrame')
         self.temp_display_frame.pack(fill='x', pady=5, padx=5)
@@ -251,6 +320,11 @@ class DarkThemeThermalChamber:
         self.control_frame = ttk.Frame(self.control_tab, style='Card.TFrame')
         self.control_frame.pack(fill='x', pady=5, padx=5)
 
+        # Profile name recorded with the session
+        ttk.Label(self.control_frame, text="Profile:", font=('Helvetica', 11)).pack(side='left', padx=(10, 0))
+        self.profile_entry = ttk.Entry(self.control_frame, width=14)
+        self.profile_entry.pack(side='left', padx=5)
+
         self.run_button = Button(self.control_frame,
                                  text="START CHAMBER",
                                  command=self.start_chamber,
@@ -353,6 +427,86 @@ class DarkThemeThermalChamber:
         logs_frame = ttk.Frame(self.logs_tab, style='Card.TFrame')
         logs_frame.pack(fill='both', expand=True, padx=10, pady=10)
 
+        # Diagnostics controls
+        tools_frame = ttk.Frame(logs_frame, style='Card.TFrame')
+        tools_frame.pack(fill='x', padx=5, pady=(5, 0))
+
+        self.loop_monitor_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(tools_frame,
+                       text="Event-loop monitor",
+                       variable=self.loop_monitor_var,
+                       command=self.toggle_loop_monitor,
+                       bg=self.card_color,
+                       fg=self.text_color,
+                       selectcolor=self.card_color,
+                       activebackground=self.card_color,
+                       activeforeground=self.text_color,
+                       highlightthickness=0).pack(side='left', padx=(0, 15))
+
+        ttk.Label(tools_frame, text="Profile for (s):", style='Status.TLabel').pack(side='left')
+        self.profile_seconds_entry = ttk.Entry(tools_frame, width=5)
+        self.profile_seconds_entry.insert(0, "10")
+        self.profile_seconds_entry.pack(side='left', padx=5)
+        self.profile_button = Button(tools_frame,
+                                     text="Start profiler",
+                                     command=self.toggle_profiler,
+                                     bg=self.get_temp_color(25),
+                                     fg='white',
+                                     font=('Helvetica', 10, 'bold'),
+                                     relief='flat',
+                                     padx=10,
+                                     activebackground=self.get_temp_color(40),
+                                     borderwidth=0)
+        self.profile_button.pack(side='left', padx=5)
+
+        # Event filter and search bar
+        search_frame = ttk.Frame(logs_frame, style='Card.TFrame')
+        search_frame.pack(fill='x', padx=5, pady=(5, 0))
+
+        ttk.Label(search_frame, text="Kind:", style='Status.TLabel').pack(side='left')
+        self.event_kind_var = tk.StringVar(value="all")
+        ttk.Combobox(search_frame,
+                     textvariable=self.event_kind_var,
+                     values=["all"] + list(events.KINDS),
+                     state='readonly',
+                     width=12).pack(side='left', padx=5)
+
+        ttk.Label(search_frame, text="Last:", style='Status.TLabel').pack(side='left')
+        self.event_range_var = tk.StringVar(value="all")
+        ttk.Combobox(search_frame,
+                     textvariable=self.event_range_var,
+                     values=list(self.EVENT_RANGES),
+                     state='readonly',
+                     width=8).pack(side='left', padx=5)
+
+        ttk.Label(search_frame, text="Search:", style='Status.TLabel').pack(side='left')
+        self.event_search_entry = ttk.Entry(search_frame, width=25)
+        self.event_search_entry.pack(side='left', padx=5)
+        self.event_search_entry.bind('<Return>', self.search_events)
+        Button(search_frame,
+               text="Search",
+               command=self.search_events,
+               bg=self.get_temp_color(25),
+               fg='white',
+               font=('Helvetica', 10, 'bold'),
+               relief='flat',
+               padx=10,
+               activebackground=self.get_temp_color(40),
+               borderwidth=0).pack(side='left', padx=5)
+        self.event_search_status = tk.StringVar(value="")
+        ttk.Label(search_frame, textvariable=self.event_search_status, style='Status.TLabel').pack(side='left')
+
+        self.event_tree = ttk.Treeview(logs_frame, columns=('kind', 'chamber', 'message'), height=6)
+        self.event_tree.heading('#0', text="Time")
+        self.event_tree.column('#0', width=150)
+        self.event_tree.heading('kind', text="Kind")
+        self.event_tree.column('kind', width=90)
+        self.event_tree.heading('chamber', text="Chamber")
+        self.event_tree.column('chamber', width=110)
+        self.event_tree.heading('message', text="Message")
+        self.event_tree.column('message', width=600)
+        self.event_tree.pack(fill='x', padx=5, pady=5)
+
         # Log text widget
         self.log_text = tk.Text(logs_frame,
                                 bg=self.card_color,
@@ -367,9 +521,602 @@ class DarkThemeThermalChamber:
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         self.log_text.config(yscrollcommand=scrollbar.set)
 
+        # Bounded record ring, batched widget updates and a rotating log file
+        self.log_view = BatchedLogView(self.root, self.log_text, flush_interval_ms=self.budget.log_flush_ms,
+                                       log_path=os.path.join(self.data_dir, "logs", "chamber_gui.log"))
+        # The widget insert, trim and scroll all happen in the scheduled flush, so that is what gets timed
+        self.log_view.flush = self.loop_monitor.wrap('log_flush', self.log_view.flush)
+        # Every event with its kind and payload, indexed for the search bar
+        self.event_store = events.EventStore()
+
         # Add initial log message
-        self.log_text.insert(tk.END, "System initialized\n")
-        self.log_text.insert(tk.END, "Waiting for connection...\n")
+        self.log("System initialized")
+        self.log("Waiting for connection...")
+
+    def log(self, message, kind=events.INFO, **payload):
+        """Record a structured event and append its text to the log tab"""
+        chamber = self.tcam.address if self.tcam is not None else None
+        self.event_store.append(kind, message, chamber, **payload)
+        self.log_view.append(message)
+
+    def search_events(self, event=None):
+        """Show events matching the kind, time range and search text"""
+        kind = self.event_kind_var.get()
+        seconds = self.EVENT_RANGES[self.event_range_var.get()]
+        started = time.perf_counter()
+        results = self.event_store.query(kinds=None if kind == "all" else [kind],
+                                         text=self.event_search_entry.get(),
+                                         start=None if seconds is None else time.time() - seconds,
+                                         limit=1000)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        self.event_tree.delete(*self.event_tree.get_children())
+        for record in results:
+            self.event_tree.insert('', tk.END,
+                                   text=time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(record.timestamp)),
+                                   values=(record.kind, record.chamber or "", record.message))
+        more = "+" if len(results) >= 1000 else ""
+        self.event_search_status.set(f"{len(results)}{more} of {len(self.event_store)} events in {elapsed_ms:.1f} ms")
+
+    def toggle_loop_monitor(self):
+        """Switch event-loop lag and callback timing on or off"""
+        if self.loop_monitor_var.get():
+            self.loop_monitor.start()
+            self.log("Event-loop monitor enabled", events.DIAGNOSTICS)
+        else:
+            self.loop_monitor.stop()
+            self.log("Event-loop monitor disabled", events.DIAGNOSTICS)
+
+    def toggle_profiler(self):
+        """Start a sampling profile of the Tk thread, or end the running one early"""
+        if self.profiler.running:
+            self.profiler.stop()
+            return
+        try:
+            duration = float(self.profile_seconds_entry.get())
+            if duration <= 0:
+                raise ValueError
+        except ValueError:
+            self.log("Profiler duration must be a positive number of seconds", events.ERROR)
+            return
+        report_dir = os.path.join(self.data_dir, "profiles")
+        try:
+            os.makedirs(report_dir, exist_ok=True)
+        except OSError as e:
+            self.log(f"Error creating profile directory: {str(e)}", events.ERROR)
+            return
+        report_path = os.path.join(report_dir, time.strftime("profile-%Y%m%d-%H%M%S.txt"))
+        self.profiler.start(duration, report_path,
+                            on_done=lambda *result: self.root.after(0, self._on_profile_done, *result))
+        self.profile_button.config(text="Stop profiler")
+        self.log(f"Profiling the GUI thread for {duration:g} s", events.DIAGNOSTICS)
+
+    def _on_profile_done(self, report_path, samples, error):
+        """Report where the profile was saved"""
+        self.profile_button.config(text="Start profiler")
+        if error is not None:
+            self.log(f"Error saving profile: {str(error)}", events.ERROR)
+        else:
+            self.log(f"Profile with {samples} samples saved to {report_path}", events.DIAGNOSTICS)
+
+    def create_diagnostics_tab(self):
+        """Create the diagnostics tab with chamber command latency statistics"""
+        self.diagnostics_tab = ttk.Frame(self.notebook)
+        self.notebook.add(self.diagnostics_tab, text="Diagnostics")
+
+        diagnostics_frame = ttk.Frame(self.diagnostics_tab, style='Card.TFrame')
+        diagnostics_frame.pack(fill='both', expand=True, padx=10, pady=10)
+
+        ttk.Label(diagnostics_frame, text="Chamber command latency (ms):",
+                  font=('Helvetica', 12)).pack(anchor='w', padx=10, pady=(10, 5))
+
+        columns = ['count'] + [f'p{percent}' for percent in PERCENTILES] + ['max', 'timeouts', 'errors']
+        self.latency_tree = ttk.Treeview(diagnostics_frame, columns=columns, height=10)
+        self.latency_tree.heading('#0', text="Command")
+        self.latency_tree.column('#0', width=220)
+        for column in columns:
+            self.latency_tree.heading(column, text=column)
+            self.latency_tree.column(column, width=80, anchor='e')
+        self.latency_tree.pack(fill='both', expand=True, padx=10, pady=5)
+
+        ttk.Label(diagnostics_frame, text="Tk event loop (ms, enable the monitor in the Logs tab):",
+                  font=('Helvetica', 12)).pack(anchor='w', padx=10, pady=(10, 5))
+        self.loop_tree = ttk.Treeview(diagnostics_frame, columns=columns, height=6)
+        self.loop_tree.heading('#0', text="Callback")
+        self.loop_tree.column('#0', width=220)
+        for column in columns:
+            self.loop_tree.heading(column, text=column)
+            self.loop_tree.column(column, width=80, anchor='e')
+        self.loop_tree.pack(fill='both', expand=True, padx=10, pady=5)
+
+        button_frame = ttk.Frame(diagnostics_frame, style='Card.TFrame')
+        button_frame.pack(fill='x', padx=10, pady=(0, 10))
+        for text, command in (("Export...", self.export_latency_stats), ("Reset", self.reset_latency_stats)):
+            Button(button_frame,
+                   text=text,
+                   command=command,
+                   bg=self.get_temp_color(25),
+                   fg='white',
+                   font=('Helvetica', 10, 'bold'),
+                   relief='flat',
+                   padx=10,
+                   activebackground=self.get_temp_color(40),
+                   borderwidth=0).pack(side='left', padx=(0, 10))
+
+        self.root.after(1000, self.refresh_latency_stats)
+
+    def refresh_latency_stats(self):
+        """Show the current latency percentiles in the diagnostics tab"""
+        for tree, stats in ((self.latency_tree, self.chamber_stats), (self.loop_tree, self.loop_monitor.stats)):
+            tree.delete(*tree.get_children())
+            for row in stats.summary():
+                values = [row['count']] + [f"{row[f'p{percent}_ms']:.1f}" for percent in PERCENTILES] + \
+                         [f"{row['max_ms']:.1f}", row['timeouts'], row['errors']]
+                tree.insert('', tk.END, text=row['command'], values=values)
+        self.root.after(1000, self.refresh_latency_stats)
+
+    def export_latency_stats(self):
+        """Save the latency statistics as JSON or CSV"""
+        path = filedialog.asksaveasfilename(title="Export latency statistics",
+                                            defaultextension='.json',
+                                            filetypes=[("JSON", "*.json"), ("CSV", "*.csv")])
+        if not path:
+            return
+        try:
+            self.chamber_stats.export(path)
+            self.log(f"Latency statistics exported to {path}", events.DIAGNOSTICS)
+        except OSError as e:
+            self.log(f"Error exporting latency statistics: {str(e)}", events.ERROR)
+
+    def reset_latency_stats(self):
+        """Clear the latency statistics"""
+        self.chamber_stats.reset()
+        self.loop_monitor.stats.reset()
+        self.latency_tree.delete(*self.latency_tree.get_children())
+        self.loop_tree.delete(*self.loop_tree.get_children())
+
+    def create_sessions_tab(self):
+        """Create the sessions tab listing recorded runs from the catalog"""
+        self.sessions_tab = ttk.Frame(self.notebook)
+        self.notebook.add(self.sessions_tab, text="Sessions")
+
+        sessions_frame = ttk.Frame(self.sessions_tab, style='Card.TFrame')
+        sessions_frame.pack(fill='both', expand=True, padx=10, pady=10)
+
+        # Session filter bar
+        search_frame = ttk.Frame(sessions_frame, style='Card.TFrame')
+        search_frame.pack(fill='x', padx=5, pady=(5, 0))
+
+        ttk.Label(search_frame, text="Chamber:", style='Status.TLabel').pack(side='left')
+        self.session_chamber_var = tk.StringVar(value="all")
+        self.session_chamber_combobox = ttk.Combobox(search_frame,
+                                                     textvariable=self.session_chamber_var,
+                                                     values=["all"],
+                                                     width=14)
+        self.session_chamber_combobox.pack(side='left', padx=5)
+
+        ttk.Label(search_frame, text="Started:", style='Status.TLabel').pack(side='left')
+        self.session_range_var = tk.StringVar(value="all")
+        ttk.Combobox(search_frame,
+                     textvariable=self.session_range_var,
+                     values=list(self.SESSION_RANGES),
+                     state='readonly',
+                     width=8).pack(side='left', padx=5)
+
+        ttk.Label(search_frame, text="Reached ≤ °C:", style='Status.TLabel').pack(side='left')
+        self.session_below_entry = ttk.Entry(search_frame, width=6)
+        self.session_below_entry.pack(side='left', padx=5)
+
+        ttk.Label(search_frame, text="≥ °C:", style='Status.TLabel').pack(side='left')
+        self.session_above_entry = ttk.Entry(search_frame, width=6)
+        self.session_above_entry.pack(side='left', padx=5)
+
+        ttk.Label(search_frame, text="Profile:", style='Status.TLabel').pack(side='left')
+        self.session_profile_entry = ttk.Entry(search_frame, width=12)
+        self.session_profile_entry.pack(side='left', padx=5)
+        for entry in (self.session_below_entry, self.session_above_entry, self.session_profile_entry):
+            entry.bind('<Return>', self.search_sessions)
+
+        self.session_alarms_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(search_frame,
+                       text="With alarms",
+                       variable=self.session_alarms_var,
+                       command=self.search_sessions,
+                       bg=self.card_color,
+                       fg=self.text_color,
+                       selectcolor=self.card_color,
+                       activebackground=self.card_color,
+                       activeforeground=self.text_color,
+                       highlightthickness=0).pack(side='left', padx=5)
+
+        for text, command in (("Search", self.search_sessions), ("Open", self.open_session),
+                              ("Compare", self.compare_sessions), ("Report...", self.export_session_report),
+                              ("Export...", self.export_session_data)):
+            Button(search_frame,
+                   text=text,
+                   command=command,
+                   bg=self.get_temp_color(25),
+                   fg='white',
+                   font=('Helvetica', 10, 'bold'),
+                   relief='flat',
+                   padx=10,
+                   activebackground=self.get_temp_color(40),
+                   borderwidth=0).pack(side='left', padx=5)
+        self.session_search_status = tk.StringVar(value="")
+        ttk.Label(search_frame, textvariable=self.session_search_status, style='Status.TLabel').pack(side='left')
+
+        columns = ('chamber', 'profile', 'duration', 'min', 'max', 'alarms', 'gaps', 'samples')
+        self.session_tree = ttk.Treeview(sessions_frame, columns=columns)
+        self.session_tree.heading('#0', text="Start")
+        self.session_tree.column('#0', width=150)
+        for column, heading, width in zip(columns,
+                                          ("Chamber", "Profile", "Duration", "Min °C", "Max °C", "Alarms", "Gaps",
+                                           "Samples"),
+                                          (130, 160, 90, 80, 80, 70, 70, 90)):
+            self.session_tree.heading(column, text=heading)
+            self.session_tree.column(column, width=width, anchor='w' if column in ('chamber', 'profile') else 'e')
+        self.session_tree.pack(fill='both', expand=True, padx=5, pady=5)
+        self.session_tree.bind('<Double-Button-1>', self.open_session)
+
+        self.sync_sessions()
+
+    def sync_sessions(self):
+        """Index sessions recorded while the catalog was not looking, off the Tk thread"""
+        def sync():
+            import sqlite3
+            try:
+                if self.catalog is None:
+                    self._open_catalog()
+                added = self.catalog.sync(self.session_dir)
+            except (OSError, sqlite3.Error) as e:
+                self.root.after(0, self.log, f"Error indexing sessions: {str(e)}", events.ERROR)
+                return
+            self.root.after(0, self._on_sessions_synced, added)
+
+        sync_thread = Thread(target=sync)
+        sync_thread.daemon = True
+        sync_thread.start()
+
+    def _open_catalog(self):
+        """Open the session catalog, falling back to one in memory; runs off the Tk thread"""
+        import sqlite3
+        from chamber_gui.catalog import SessionCatalog
+        try:
+            self.catalog = SessionCatalog(os.path.join(self.session_dir, "catalog.sqlite3"))
+        except (OSError, sqlite3.Error):
+            # Searching still works for this session's runs, the next start rebuilds the index
+            self.catalog = SessionCatalog(":memory:")
+
+    def _on_sessions_synced(self, added):
+        if added:
+            self.log(f"Indexed {added} session(s) in the catalog", events.INFO)
+        self.search_sessions()
+
+    def search_sessions(self, event=None):
+        """List catalogued sessions matching the filter bar"""
+        if self.catalog is None:
+            self.session_search_status.set("Loading the session catalog...")
+            return
+        import sqlite3
+        try:
+            below = self.session_below_entry.get().strip()
+            below = float(below) if below else None
+            above = self.session_above_entry.get().strip()
+            above = float(above) if above else None
+        except ValueError:
+            self.session_search_status.set("Temperatures must be numbers")
+            return
+        chamber = self.session_chamber_var.get().strip()
+        seconds = self.SESSION_RANGES[self.session_range_var.get()]
+        started = time.perf_counter()
+        try:
+            results = self.catalog.query(chamber=None if chamber == "all" else chamber,
+                                         start=None if seconds is None else time.time() - seconds,
+                                         below=below, above=above,
+                                         profile=self.session_profile_entry.get().strip(),
+                                         alarms=self.session_alarms_var.get(), limit=1000)
+            chambers = self.catalog.chambers()
+        except sqlite3.Error as e:
+            self.log(f"Error searching sessions: {str(e)}", events.ERROR)
+            return
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        self.session_chamber_combobox['values'] = ["all"] + chambers
+        self.session_tree.delete(*self.session_tree.get_children())
+        for session in results:
+            if session.end is None:
+                duration = "unfinished"
+            else:
+                duration = time.strftime("%H:%M:%S", time.gmtime(max(0, session.end - session.start)))
+            self.session_tree.insert('', tk.END, iid=session.path,
+                                     text=time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(session.start)),
+                                     values=(session.chamber_id or session.chamber_ip or "", session.profile,
+                                             duration,
+                                             "" if session.min_temp is None else f"{session.min_temp:.1f}",
+                                             "" if session.max_temp is None else f"{session.max_temp:.1f}",
+                                             session.alarm_count or 0, session.gap_count, session.samples))
+        more = "+" if len(results) >= 1000 else ""
+        self.session_search_status.set(f"{len(results)}{more} sessions in {elapsed_ms:.1f} ms")
+
+    def open_session(self, event=None):
+        """Load the selected session off the Tk thread and show its history in its own window"""
+        selection = self.session_tree.selection()
+        if not selection:
+            return
+        path = selection[0]
+        self.session_search_status.set(f"Opening {os.path.basename(path)}...")
+
+        def load():
+            # Reading the samples and summarizing them for the first frame both scale with the session
+            import matplotlib.backends.backend_tkagg
+            import matplotlib.figure
+            from chamber_gui.samples import MinMaxPyramid
+            from chamber_gui.sessions import load_history
+            try:
+                samples, markers = load_history(path)
+            except (OSError, ValueError) as e:
+                self.root.after(0, self.log, f"Error opening session {path}: {str(e)}", events.ERROR)
+                return
+            pyramid = MinMaxPyramid(samples)
+            pyramid.sync()
+            self.root.after(0, self._show_session, path, samples, markers, pyramid)
+
+        load_thread = Thread(target=load)
+        load_thread.daemon = True
+        load_thread.start()
+
+    def _show_session(self, path, samples, markers, pyramid):
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        from matplotlib.figure import Figure
+        from matplotlib import style
+        from chamber_gui.plotting import HistoryPlot
+
+        self.session_search_status.set("")
+        window = tk.Toplevel(self.root)
+        window.title(f"Session {os.path.basename(path)}")
+        window.geometry("900x450")
+        window.configure(bg=self.bg_color)
+        # Styled locally so the main plot and other figures keep their rcParams
+        with style.context('dark_background'):
+            fig = Figure(figsize=(8, 4), dpi=80, facecolor=self.card_color)
+            plot = HistoryPlot(fig, self.color_map, self.min_temp, self.max_temp, self.card_color, self.text_color,
+                               gradient=self.budget.gradient, antialiased=self.budget.antialiased,
+                               pixel_decimation=self.budget.pixel_decimation)
+            # Built by the loader, so the first frame only reads the coarse levels
+            plot.pyramid = pyramid
+            first_time = samples.first('time')
+            plot.update(samples, markers, time.time() if first_time is None else first_time)
+            canvas = FigureCanvasTkAgg(fig, master=window)
+            canvas.draw()
+        canvas.get_tk_widget().pack(fill='both', expand=True, padx=10, pady=10)
+
+    def compare_sessions(self):
+        """Load the selected sessions off the Tk thread and overlay them in a comparison window"""
+        paths = self.session_tree.selection()
+        if len(paths) < 2:
+            self.session_search_status.set("Select two or more sessions to compare")
+            return
+        self.session_search_status.set(f"Loading {len(paths)} sessions...")
+
+        def load():
+            from chamber_gui.compare import SessionTrace
+            try:
+                traces = [SessionTrace(path) for path in paths]
+            except (OSError, ValueError, KeyError) as e:
+                self.root.after(0, self.log, f"Error loading sessions to compare: {str(e)}", events.ERROR)
+                return
+            self.root.after(0, self._show_comparison, traces)
+
+        load_thread = Thread(target=load)
+        load_thread.daemon = True
+        load_thread.start()
+
+    def _show_comparison(self, traces):
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
+        from matplotlib.figure import Figure
+        from matplotlib import style
+        from chamber_gui import compare
+
+        self.session_search_status.set("")
+        window = tk.Toplevel(self.root)
+        window.title(f"Compare {len(traces)} sessions")
+        window.geometry("1000x720")
+        window.configure(bg=self.bg_color)
+
+        options = ttk.Frame(window, style='Card.TFrame')
+        options.pack(fill='x', padx=10, pady=(10, 0))
+        ttk.Label(options, text="Align on:", style='Status.TLabel').pack(side='left')
+        alignment_var = tk.StringVar(value=compare.FIRST_ARRIVAL)
+        alignment_combobox = ttk.Combobox(options, textvariable=alignment_var, values=list(compare.ALIGNMENTS),
+                                          state='readonly', width=24)
+        alignment_combobox.pack(side='left', padx=5)
+        ttk.Label(options, text="Reference:", style='Status.TLabel').pack(side='left')
+        names = [f"{i + 1}: {trace.name}" for i, trace in enumerate(traces)]
+        reference_var = tk.StringVar(value=names[0])
+        reference_combobox = ttk.Combobox(options, textvariable=reference_var, values=names,
+                                          state='readonly', width=40)
+        reference_combobox.pack(side='left', padx=5)
+        status_var = tk.StringVar(value="")
+        ttk.Label(options, textvariable=status_var, style='Status.TLabel').pack(side='left', padx=5)
+
+        with style.context('dark_background'):
+            fig = Figure(figsize=(9, 5), dpi=80, facecolor=self.card_color)
+            overlay_ax = fig.add_subplot(211, facecolor=self.card_color)
+            difference_ax = fig.add_subplot(212, sharex=overlay_ax, facecolor=self.card_color)
+            overlay_ax.set_ylabel("°C", color=self.text_color)
+            difference_ax.set_ylabel("Δ °C", color=self.text_color)
+            difference_ax.set_xlabel("Seconds from alignment event", color=self.text_color)
+            overlay_lines = [overlay_ax.plot([], [], linewidth=1, label=name)[0] for name in names]
+            difference_lines = [difference_ax.plot([], [], linewidth=1, color=line.get_color())[0]
+                                for line in overlay_lines]
+            overlay_ax.legend(loc='upper right', fontsize=8)
+            canvas = FigureCanvasTkAgg(fig, master=window)
+            NavigationToolbar2Tk(canvas, window).update()
+        canvas.get_tk_widget().pack(fill='both', expand=True, padx=10, pady=5)
+
+        columns = ('set_point', 'start', 'duration', 'mean', 'rms', 'max_abs')
+        stats_tree = ttk.Treeview(window, columns=columns, height=8)
+        stats_tree.heading('#0', text="Session")
+        stats_tree.column('#0', width=280)
+        for column, heading in zip(columns, ("Set point °C", "Start s", "Duration s", "Mean Δ °C", "RMS Δ °C",
+                                             "Max |Δ| °C")):
+            stats_tree.heading(column, text=heading)
+            stats_tree.column(column, width=100, anchor='e')
+        stats_tree.pack(fill='x', padx=10, pady=(0, 10))
+
+        # Zooming only resamples the visible window; the flag keeps our own set_xlim from re-triggering
+        state = {'updating': False, 'pending': False}
+
+        def update(window_range=None):
+            state['pending'] = False
+            reference = names.index(reference_var.get())
+            start, end = window_range if window_range else (None, None)
+            started = time.perf_counter()
+            result = compare.compare(traces, reference, alignment_var.get(), start, end)
+            for row, (overlay_line, difference_line) in enumerate(zip(overlay_lines, difference_lines)):
+                overlay_line.set_data(result.grid, result.values[row])
+                difference_line.set_data(result.grid, result.differences[row])
+            state['updating'] = True
+            if window_range is None:
+                overlay_ax.set_xlim(result.grid[0], result.grid[-1] if len(result.grid) > 1 else result.grid[0] + 1)
+                for ax in (overlay_ax, difference_ax):
+                    ax.relim()
+                    ax.autoscale_view(scalex=False)
+            state['updating'] = False
+            canvas.draw_idle()
+
+            stats_tree.delete(*stats_tree.get_children())
+            segments = result.segments
+            for row, name in enumerate(names):
+                if row == reference:
+                    continue
+                parent = stats_tree.insert('', tk.END, text=name, open=True)
+                for i in range(len(segments['start'])):
+                    if segments['mean'][row, i] != segments['mean'][row, i]:
+                        continue
+                    stats_tree.insert(parent, tk.END, text=f"Segment {i}",
+                                      values=(f"{segments['set_point'][i]:.1f}", f"{segments['start'][i]:.0f}",
+                                              f"{segments['end'][i] - segments['start'][i]:.0f}",
+                                              f"{segments['mean'][row, i]:+.3f}", f"{segments['rms'][row, i]:.3f}",
+                                              f"{segments['max_abs'][row, i]:.3f}"))
+            status_var.set(f"{len(result.grid)} points in {(time.perf_counter() - started) * 1000:.1f} ms")
+
+        def on_xlim_changed(ax):
+            if state['updating'] or state['pending']:
+                return
+            state['pending'] = True
+            window.after_idle(update, ax.get_xlim())
+
+        overlay_ax.callbacks.connect('xlim_changed', on_xlim_changed)
+        alignment_combobox.bind('<<ComboboxSelected>>', lambda event: update())
+        reference_combobox.bind('<<ComboboxSelected>>', lambda event: update())
+        update()
+
+    def export_session_report(self):
+        """Write an HTML or PDF report of the selected session without blocking the GUI"""
+        selection = self.session_tree.selection()
+        if not selection:
+            self.session_search_status.set("Select a session first")
+            return
+        path = selection[0]
+        output = filedialog.asksaveasfilename(title="Export session report",
+                                              initialfile=os.path.basename(path),
+                                              defaultextension='.html',
+                                              filetypes=[("HTML", "*.html"), ("PDF", "*.pdf")])
+        if not output:
+            return
+        self.log(f"Writing report of session {os.path.basename(path)}", events.INFO)
+
+        def export():
+            # Plots render in worker processes, this thread only waits and writes the file
+            from chamber_gui import report
+            try:
+                report.export_report(path, output)
+            except (OSError, ValueError, KeyError, RuntimeError) as e:
+                self.root.after(0, self.log, f"Error writing report: {str(e)}", events.ERROR)
+                return
+            self.root.after(0, self.log, f"Report saved to {output}", events.INFO)
+
+        export_thread = Thread(target=export)
+        export_thread.daemon = True
+        export_thread.start()
+
+    def export_session_data(self):
+        """Stream the selected session, or the one being recorded, to a CSV or .npz file off the Tk thread"""
+        selection = self.session_tree.selection()
+        recorder = self.recorder
+        if selection:
+            path = selection[0]
+        elif recorder is not None:
+            path = recorder.path
+        else:
+            self.session_search_status.set("Select a session first")
+            return
+        output = filedialog.asksaveasfilename(title="Export session data",
+                                              initialfile=os.path.basename(path),
+                                              defaultextension='.csv',
+                                              filetypes=[("CSV", "*.csv"), ("Compressed columns", "*.npz")])
+        if not output:
+            return
+        step = simpledialog.askfloat("Export session data", "Resample every N seconds (Cancel for every sample):",
+                                     parent=self.root, minvalue=0.001)
+        if recorder is not None and recorder.path == path:
+            # Export what has been recorded up to now
+            recorder.flush()
+        self.log(f"Exporting session {os.path.basename(path)}", events.INFO)
+
+        def export_data():
+            from chamber_gui import export
+            try:
+                rows = export.export_session(path, output, step=step)
+            except (OSError, ValueError) as e:
+                self.root.after(0, self.log, f"Error exporting session: {str(e)}", events.ERROR)
+                return
+            self.root.after(0, self.log, f"Exported {rows} rows to {output}", events.INFO)
+
+        export_thread = Thread(target=export_data)
+        export_thread.daemon = True
+        export_thread.start()
+
+    def start_session(self):
+        """Start recording the run to a new session directory"""
+        from chamber_gui.sessions import SessionRecorder
+        ip_address = self.ip_var.get()
+        identity = self.session_metadata.get(ip_address, {})
+        try:
+            self.recorder = SessionRecorder(self.session_dir, ip_address, identity.get('id'),
+                                            identity.get('idn'), self.profile_entry.get().strip())
+        except OSError as e:
+            self.log(f"Error starting session recording: {str(e)}", events.ERROR)
+            return
+        self.recorder.add_event(events.RUN_STATE, state="started")
+        self.recorder.add_event(events.SETPOINT, temperature=self.target_temp)
+        self.log(f"Recording session to {self.recorder.path}", events.INFO)
+
+    def finish_session(self):
+        """Close the recording session and add it to the catalog"""
+        recorder, self.recorder = self.recorder, None
+        if recorder is None:
+            return
+        recorder.add_event(events.RUN_STATE, state="stopped")
+        import sqlite3
+        try:
+            meta = recorder.close()
+            # Without a catalog yet, its first sync picks the session up from disk
+            if self.catalog is not None:
+                self.catalog.add(meta)
+        except (OSError, sqlite3.Error) as e:
+            self.log(f"Error saving session {recorder.path}: {str(e)}", events.ERROR)
+            return
+        self.log(f"Session saved to {recorder.path}", events.INFO)
+        self.search_sessions()
+
+    def _on_recording_failed(self, recorder, error):
+        """Stop a session that can no longer be written"""
+        if recorder is not self.recorder:
+            return
+        self.log(f"Error recording session: {str(error)}", events.ERROR)
+        self.finish_session()
 
     def save_settings(self):
         """Save all settings from the settings tab"""
@@ -384,7 +1131,7 @@ class DarkThemeThermalChamber:
                     current_values.append(new_ip)
                     self.ip_combobox['values'] = current_values
                 self.ip_combobox.set(new_ip)
-                self.log_text.insert(tk.END, f"IP address updated to {new_ip}\n")
+                self.log(f"IP address updated to {new_ip}", events.SETTINGS, ip=new_ip)
 
             # Save port setting
             # new_port = int(self.port_entry.get())
@@ -403,12 +1150,21 @@ class DarkThemeThermalChamber:
             self.min_temp = new_min
             self.max_temp = new_max
             self.temp_range = self.max_temp - self.min_temp
+            if not self.color_map.matches(self.min_temp, self.max_temp):
+                self.color_map = TemperatureColorMap(self.min_temp, self.max_temp)
+                if self.history_plot is not None:
+                    self.history_plot.set_color_map(self.color_map)
 
             # Update plot limits
-            self.ax.set_ylim(self.min_temp - 5, self.max_temp + 5)
-            self.canvas.draw()
+            if self.renderer is not None:
+                self.renderer.set_temperature_range(self.min_temp, self.max_temp)
+                self.update_plot()
+            elif self.canvas is not None:
+                self.history_plot.set_temperature_range(self.min_temp, self.max_temp)
+                self.canvas.draw()
 
-            self.log_text.insert(tk.END, f"Temperature range updated: {self.min_temp} to {self.max_temp}°C\n")
+            self.log(f"Temperature range updated: {self.min_temp} to {self.max_temp}°C", events.SETTINGS,
+                     temperature_min=self.min_temp, temperature_max=self.max_temp)
 
             # Save ramp rate
             new_ramp_rate = float(self.ramp_rate.get())
@@ -416,21 +1172,14 @@ class DarkThemeThermalChamber:
                 raise ValueError("Ramp rate must be positive")
             # Here you would implement ramp rate functionality if needed
 
-            self.log_text.insert(tk.END, "All settings saved successfully\n")
-            self.log_text.see(tk.END)
+            self.log("All settings saved successfully", events.SETTINGS)
 
         except ValueError as e:
-            self.log_text.insert(tk.END, f"Error saving settings: {str(e)}\n")
-            self.log_text.see(tk.END)
+            self.log(f"Error saving settings: {str(e)}", events.ERROR)
 
     def get_temp_color(self, temp):
         """Get color for a specific temperature using HSV gradient"""
-        normalized = (temp - self.min_temp) / self.temp_range
-        hue = 0.66 * (1 - normalized)
-        saturation = 1.0
-        value = 0.7 + 0.3 * normalized
-        r, g, b = hsv_to_rgb(hue, saturation, value)
-        return f"#{int(r * 255):02x}{int(g * 255):02x}{int(b * 255):02x}"
+        return self.color_map.color(temp)
 
     def create_preset_button(self, parent, text, command, color):
         btn = Button(parent,
@@ -449,44 +1198,148 @@ class DarkThemeThermalChamber:
 
     def adjust_brightness(self, color_hex, factor):
         """Adjust color brightness by a factor"""
-        r = int(color_hex[1:3], 16)
-        g = int(color_hex[3:5], 16)
-        b = int(color_hex[5:7], 16)
-        r = min(255, int(r * factor))
-        g = min(255, int(g * factor))
-        b = min(255, int(b * factor))
-        return f"#{r:02x}{g:02x}{b:02x}"
+        return adjust_brightness(color_hex, factor)
 
     def connect_chamber(self):
         """Connect to the thermal chamber"""
+        ip_address = self.ip_var.get()
+        self.status_var.set(f"Connecting to {ip_address}...")
+        self.status_label.configure(background=self.get_temp_color(25))
+        self.connect_button.config(state='disabled')
+        self.ip_combobox.config(state='disabled')
+
+        # Populate the UI from the cache while fresh values load in the background
+        cached = self.metadata_cache.get(ip_address)
+        if cached is not None:
+            self.chamber_id.set(f"{cached['id']}")
+            if cached.get('temperature_set_point') is not None:
+                self.target_temp = cached['temperature_set_point']
+                self.target_var.set(f"{self.target_temp:.1f} °C")
+                self.custom_temp.set(self.target_temp)
+            self.log(f"Loaded cached metadata for chamber ID:{cached['idn']} at {ip_address}",
+                     events.CONNECTION, ip=ip_address)
+
+        connect_thread = Thread(target=self._connect_worker, args=(ip_address, cached))
+        connect_thread.daemon = True
+        connect_thread.start()
+
+    def _connect_worker(self, ip_address, cached):
+        """Open the chamber connection and query fresh values off the Tk thread"""
         try:
-            self.is_connected = True
-            ip_address = self.ip_var.get()
+            tcam = open_backend(ip_address, self.min_temp, self.max_temp, stats=self.chamber_stats)
+            # Static fields are queried once per session
+            identity = self.session_metadata.get(ip_address)
+            if identity is None:
+                identity = tcam.identity()
+                self.session_metadata[ip_address] = identity
+            set_point = tcam.read_status().set_point
+        except Exception as e:
+            self.root.after(0, self._on_connect_failed, e)
+            return
+        self.root.after(0, self._on_connected, ip_address, tcam, identity, set_point, cached)
+
+    def _on_connected(self, ip_address, tcam, identity, set_point, cached):
+        """Finish connecting once the chamber answered"""
+        if cached is not None and not self.metadata_cache.validate(ip_address, identity):
+            self.log(f"Cached metadata for {ip_address} was out of date, refreshed",
+                     events.CONNECTION, ip=ip_address)
+
+        self.tcam = tcam
+        # The callbacks name their supervisor so late ones from a disconnected link can be ignored
+        supervisor = ConnectionSupervisor(
+            lambda: open_backend(ip_address, self.min_temp, self.max_temp, stats=self.chamber_stats),
+            tcam,
+            on_offline=lambda error: self.root.after(0, self._on_link_lost, supervisor, error),
+            on_retry=lambda attempt: self.root.after(0, self._on_reconnect_attempt, attempt),
+            on_reconnected=lambda chamber, attempts, flushed: self.root.after(
+                0, self._on_reconnected, supervisor, chamber, attempts, flushed))
+        self.supervisor = supervisor
+        self.is_connected = True
+        if self.isolated_acquisition:
+            # Imported here, plain sessions never start the child process
+            from chamber_gui.acquisition import AcquisitionProcess
+            self.acquisition = AcquisitionProcess(ip_address, self.min_temp, self.max_temp)
+            self.acquisition.start()
+        self.status_var.set(f"Connected to {ip_address}")
+        self.disconnect_button.config(state='normal')
+        self.run_button.config(state='normal')
+
+        self.chamber_id.set(identity['id'])
+        self.target_temp = set_point
+        self.target_var.set(f"{self.target_temp:.1f} °C")
+        self.custom_temp.set(self.target_temp)
+
+        capabilities = tcam.capabilities()
+        self.metadata_cache.update(ip_address,
+                                   configured_min=capabilities.configured_min,
+                                   configured_max=capabilities.configured_max,
+                                   temperature_set_point=set_point,
+                                   **identity)
+        self.metadata_cache.save()
+        self.log(f"Connected to chamber ID:{identity['idn']} at {ip_address}",
+                 events.CONNECTION, ip=ip_address, idn=identity['idn'])
+
+    def _on_connect_failed(self, error):
+        """Restore the UI after a failed connection attempt"""
+        self.is_connected = False
+        self.status_var.set("Connection failed")
+        self.connect_button.config(state='normal')
+        self.ip_combobox.config(state='normal')
+        self.chamber_id.set("NO ID")
+        self.log(f"Connection error: {str(error)}", events.ERROR)
+
+    def _on_link_lost(self, supervisor, error):
+        """Report a dropped connection while the supervisor reconnects"""
+        if supervisor is not self.supervisor:
+            return
+        self.status_var.set("Connection lost, reconnecting...")
+        self.status_label.configure(background='red')
+        self.log(f"Connection lost: {str(error)}", events.ERROR)
+
+    def _on_reconnect_attempt(self, attempt):
+        """Show reconnect progress in the status bar"""
+        if self.supervisor is not None and not self.supervisor.online:
+            self.status_var.set(f"Reconnecting (attempt {attempt})...")
+
+    def _on_reconnected(self, supervisor, chamber, attempts, flushed):
+        """Resume normal operation after the supervisor restored the link"""
+        if supervisor is not self.supervisor or not self.is_connected:
+            # The operator disconnected while this link was being restored
+            chamber.close()
+            return
+        previous, self.tcam = self.tcam, chamber
+        if previous is not None and previous is not chamber:
+            try:
+                previous.close()
+            except Exception:
+                pass
+        ip_address = self.ip_var.get()
+        if self.is_running:
+            self.status_var.set(f"Running at {self.target_temp}°C")
+            self.status_label.configure(background=self.get_temp_color(self.target_temp))
+        else:
             self.status_var.set(f"Connected to {ip_address}")
             self.status_label.configure(background=self.get_temp_color(25))
-            self.connect_button.config(state='disabled')
-            self.disconnect_button.config(state='normal')
-            self.ip_combobox.config(state='disabled')
-            self.run_button.config(state='normal')
-
-            # Connect to chamber (simulated here)
-            self.tcam = ClimateChamber(ip_address, self.min_temp, self.max_temp)
-            self.chamber_id.set(f"{self.tcam.id}")
-            self.target_temp = self.tcam.temperature_set_point
-            self.target_var.set(f"{self.target_temp:.1f} °C")
-            self.custom_temp.set(self.target_temp)
-            self.log_text.insert(tk.END, f"Connected to chamber ID:{self.tcam.idn} at {ip_address}\n")
-            self.log_text.see(tk.END)
-        except Exception as e:
-            self.is_connected = False
-            self.status_var.set("Connection failed")
-            self.log_text.insert(tk.END, f"Connection error: {str(e)}\n")
-            self.log_text.see(tk.END)
+        self.log(f"Reconnected to {ip_address} after {attempts} attempt(s), "
+                 f"{flushed} queued command(s) sent", events.CONNECTION, attempts=attempts, flushed=flushed)
+
+    def _send_command(self, name, command, description):
+        """Send a command through the supervisor, logging if it was queued while offline"""
+        if self.supervisor.submit(name, command):
+            return
+        self.log(f"Chamber offline, {description} queued until reconnect", events.CONNECTION, command=name)
+
+    def _mirror_command(self, name, method, *args):
+        """Repeat a command on the acquisition process's own simulated chamber, if there is one"""
+        if self.acquisition is not None:
+            self.acquisition.send_command(name, method, *args)
 
     def disconnect_chamber(self):
         """Disconnect from the thermal chamber"""
         self.is_connected = False
         self.is_running = False
+        self.markers.stop_run(time.time(), self._history_total())
+        self.finish_session()
         self.status_var.set("Disconnected")
         self.status_label.configure(background=self.get_temp_color(25))
         self.connect_button.config(state='normal')
@@ -494,11 +1347,29 @@ class DarkThemeThermalChamber:
         self.ip_combobox.config(state='normal')
         self.run_button.config(state='disabled')
         self.stop_button.config(state='disabled')
-        # self.tcam.disconnect()
+        self.metadata_cache.update_state(self.ip_var.get(),
+                                         temperature_set_point=self.target_temp,
+                                         temperature_measured=self.current_temp,
+                                         is_running=False)
+        self.metadata_cache.save()
+        if self.supervisor is not None:
+            self.supervisor.close()
+            self.supervisor = None
+        self.stop_acquisition()
+        if self.tcam is not None:
+            self.tcam.close()
         self.tcam = None
         self.chamber_id.set("NO ID")
-        self.log_text.insert(tk.END, "Disconnected from chamber\n")
-        self.log_text.see(tk.END)
+        self.log("Disconnected from chamber", events.CONNECTION)
+
+    def stop_acquisition(self):
+        """Stop the acquisition process if one is running"""
+        acquisition, self.acquisition = self.acquisition, None
+        if acquisition is not None:
+            if acquisition.lost_samples:
+                self.log(f"Acquisition: {acquisition.lost_samples} samples lost to ring overrun",
+                         events.DIAGNOSTICS)
+            acquisition.stop()
 
     def on_temp_entry(self, event=None):
         """Handle temperature entry from keyboard"""
@@ -507,18 +1378,14 @@ class DarkThemeThermalChamber:
             if self.min_temp <= temp <= self.max_temp:
                 self.set_temp(temp)
                 self.custom_temp.set(temp)
-                self.log_text.insert(tk.END, f"Temperature set to {temp}°C\n")
-                self.log_text.see(tk.END)
             else:
                 self.status_var.set(f"Temperature must be between {self.min_temp} and {self.max_temp}")
                 self.status_label.configure(background=self.get_temp_color(25))
-                self.log_text.insert(tk.END, f"Invalid temperature: {temp}°C (out of range)\n")
-                self.log_text.see(tk.END)
+                self.log(f"Invalid temperature: {temp}°C (out of range)", events.ERROR)
         except ValueError:
             self.status_var.set("Invalid temperature value")
             self.status_label.configure(background=self.get_temp_color(25))
-            self.log_text.insert(tk.END, "Invalid temperature value entered\n")
-            self.log_text.see(tk.END)
+            self.log("Invalid temperature value entered", events.ERROR)
 
     def on_slider_move(self, value):
         """Update entry field when slider moves"""
@@ -526,32 +1393,287 @@ class DarkThemeThermalChamber:
         self.temp_entry.insert(0, f"{float(value):.1f}")
 
     def setup_plot(self):
-        """Configure the temperature plot"""
-        plt.style.use('dark_background')
-        self.fig = Figure(figsize=(8, 4), dpi=80, facecolor=self.card_color)
-        self.ax = self.fig.add_subplot(111)
-        self.ax.set_facecolor('#2E2E2E')
+        """Reserve the plot area and build the figure once the control UI is shown"""
+        # The sample history is created by the sampling thread, importing numpy here would delay the UI
+        self.samples = None
+        # The plot's time axis counts minutes from here
+        self.history_start = time.time()
+        # Set point changes and run intervals drawn over the history
+        self.markers = MarkerIndex()
+        # Visible window, following the newest samples until zoomed or panned
+        self.viewport = Viewport()
+        self.drag_x = None
+        self.fig = None
+        self.history_plot = None
+        self.canvas = None
+        self.renderer = None
+        self.frame_image = None
+
+        self.create_plot_navigation()
+        self.plot_placeholder = ttk.Label(self.plot_frame, text="Loading plot...", style='TLabel')
+        self.plot_placeholder.pack(fill='both', expand=True, padx=10, pady=10)
+
+        if self.render_process:
+            self._start_renderer()
+            return
 
-        # Customize plot appearance
-        self.ax.grid(True, linestyle='--', alpha=0.3, color='#555555')
-        self.ax.set_xlabel('Time (minutes)', color=self.text_color)
-        self.ax.set_ylabel('Temperature (°C)', color=self.text_color)
-        self.ax.set_title('Temperature Profile', color=self.text_color)
-        self.ax.set_ylim(self.min_temp - 5, self.max_temp + 5)
-        self.ax.tick_params(colors=self.text_color)
+        # Importing matplotlib takes most of the startup time, do it off the Tk thread
+        import_thread = Thread(target=self._import_plotting)
+        import_thread.daemon = True
+        import_thread.start()
 
-        for spine in self.ax.spines.values():
-            spine.set_edgecolor('#555555')
+    def _import_plotting(self):
+        """Import the matplotlib modules used by the plot in the background"""
+        import matplotlib.backends.backend_tkagg
+        import matplotlib.figure
+        import matplotlib.style
+        self.root.after(0, self._build_plot)
 
-        # Create initial empty data
-        self.x_data = []
-        self.y_data = []
-        self.line, = self.ax.plot([], [], color=self.get_temp_color(25), linewidth=2)
+    def _build_plot(self):
+        """Configure the temperature plot"""
+        if self.canvas is not None:
+            return
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        from matplotlib.figure import Figure
+        from matplotlib import style
+        from chamber_gui.plotting import HistoryPlot
+
+        style.use('dark_background')
+        self.fig = Figure(figsize=(8, 4), dpi=80, facecolor=self.card_color)
+        self.history_plot = HistoryPlot(self.fig, self.color_map, self.min_temp, self.max_temp,
+                                        self.card_color, self.text_color, gradient=self.budget.gradient,
+                                        antialiased=self.budget.antialiased,
+                                        pixel_decimation=self.budget.pixel_decimation)
+        self.history_plot.set_autoscale(self.plot_autoscale_var.get())
 
         # Create the canvas
+        self.plot_placeholder.destroy()
         self.canvas = FigureCanvasTkAgg(self.fig, master=self.plot_frame)
         self.canvas.draw()
         self.canvas.get_tk_widget().pack(fill='both', expand=True, padx=10, pady=10)
+        self._bind_plot_navigation(self.canvas.get_tk_widget())
+        self.mark_startup('plot_ready')
+
+    def create_plot_navigation(self):
+        """Window controls above the plot"""
+        nav_frame = ttk.Frame(self.plot_frame, style='Card.TFrame')
+        nav_frame.pack(fill='x', padx=10, pady=(10, 0))
+
+        ttk.Label(nav_frame, text="Show last:", style='Status.TLabel').pack(side='left')
+        self.plot_span_var = tk.StringVar(value="all")
+        span_combobox = ttk.Combobox(nav_frame,
+                                     textvariable=self.plot_span_var,
+                                     values=list(self.PLOT_SPANS),
+                                     state='readonly',
+                                     width=8)
+        span_combobox.pack(side='left', padx=5)
+        span_combobox.bind('<<ComboboxSelected>>', self.follow_live)
+
+        for text, command in (("◀", lambda: self.pan_plot(-0.5)),
+                              ("▶", lambda: self.pan_plot(0.5)),
+                              ("+", lambda: self.zoom_plot(0.5)),
+                              ("−", lambda: self.zoom_plot(2.0)),
+                              ("Live", self.follow_live)):
+            Button(nav_frame,
+                   text=text,
+                   command=command,
+                   bg=self.get_temp_color(25),
+                   fg='white',
+                   font=('Helvetica', 10, 'bold'),
+                   relief='flat',
+                   padx=8,
+                   activebackground=self.get_temp_color(40),
+                   borderwidth=0).pack(side='left', padx=2)
+
+        self.plot_view_var = tk.StringVar(value="Live")
+        ttk.Label(nav_frame, textvariable=self.plot_view_var, style='Status.TLabel').pack(side='left', padx=5)
+
+        self.plot_autoscale_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(nav_frame,
+                       text="Auto Y",
+                       variable=self.plot_autoscale_var,
+                       command=self.toggle_plot_autoscale,
+                       bg=self.card_color,
+                       fg=self.text_color,
+                       selectcolor=self.card_color,
+                       activebackground=self.card_color,
+                       activeforeground=self.text_color,
+                       highlightthickness=0).pack(side='left', padx=5)
+        ttk.Label(nav_frame, text="Wheel: zoom  Drag: pan  Double-click: live",
+                  style='Status.TLabel').pack(side='right')
+
+    def _bind_plot_navigation(self, widget):
+        """Mouse zoom and pan on the widget showing the plot"""
+        widget.bind('<MouseWheel>', self._on_plot_wheel, add='+')
+        widget.bind('<Button-4>', self._on_plot_wheel, add='+')
+        widget.bind('<Button-5>', self._on_plot_wheel, add='+')
+        widget.bind('<ButtonPress-1>', self._on_plot_press, add='+')
+        widget.bind('<B1-Motion>', self._on_plot_drag, add='+')
+        widget.bind('<Double-Button-1>', self.follow_live, add='+')
+
+    def _history_total(self):
+        """Number of samples ever added to the history, 0 before it exists"""
+        samples = self.samples
+        return 0 if samples is None else samples.total
+
+    def _history_bounds(self):
+        """Timestamps of the oldest and newest sample, or None without samples"""
+        if self.samples is None:
+            return None
+        first_time = self.samples.first('time')
+        if first_time is None:
+            return None
+        return first_time, self.samples.last('time')
+
+    def _plot_axes_extent(self):
+        """Pixel columns of the plot axes in the last frame, or None before the first one"""
+        if self.renderer is not None:
+            return self.renderer.axes_extent
+        if self.history_plot is not None:
+            return self.history_plot.axes_extent()
+        return None
+
+    def _plot_time_at(self, x):
+        """Timestamp under pixel column x of the plot widget"""
+        if self.renderer is not None:
+            extent, limits = self.renderer.axes_extent, self.renderer.time_limits
+        elif self.history_plot is not None:
+            extent, limits = self.history_plot.axes_extent(), self.history_plot.time_limits
+        else:
+            return None
+        if extent is None or limits is None:
+            return None
+        (x0, x1), (start, end) = extent, limits
+        return start + (x - x0) / max(x1 - x0, 1) * (end - start)
+
+    def _on_plot_wheel(self, event):
+        zoom_in = event.num == 4 or getattr(event, 'delta', 0) > 0
+        self.zoom_plot(0.8 if zoom_in else 1.25, self._plot_time_at(event.x))
+
+    def _on_plot_press(self, event):
+        self.drag_x = event.x
+
+    def _on_plot_drag(self, event):
+        bounds = self._history_bounds()
+        extent = self._plot_axes_extent()
+        if bounds is None or extent is None or self.drag_x is None:
+            return
+        start, end = self.viewport.limits(*bounds)
+        seconds = (self.drag_x - event.x) / max(extent[1] - extent[0], 1) * (end - start)
+        self.drag_x = event.x
+        self.viewport.pan(seconds, *bounds)
+        self._plot_view_changed()
+
+    def pan_plot(self, fraction):
+        """Move the plot window by a fraction of its width, negative being back in time"""
+        bounds = self._history_bounds()
+        if bounds is None:
+            return
+        start, end = self.viewport.limits(*bounds)
+        self.viewport.pan(fraction * (end - start), *bounds)
+        self._plot_view_changed()
+
+    def zoom_plot(self, factor, center=None):
+        """Scale the plot window by factor around timestamp center, the window middle by default"""
+        bounds = self._history_bounds()
+        if bounds is None:
+            return
+        start, end = self.viewport.limits(*bounds)
+        self.viewport.zoom(factor, (start + end) / 2 if center is None else center, *bounds)
+        self._plot_view_changed()
+
+    def follow_live(self, event=None):
+        """Show the newest samples over the selected span"""
+        self.viewport.follow(self.PLOT_SPANS[self.plot_span_var.get()])
+        self._plot_view_changed()
+
+    def toggle_plot_autoscale(self):
+        """Fit the temperature axis to the visible data or show the whole chamber range"""
+        enabled = self.plot_autoscale_var.get()
+        if self.renderer is not None:
+            self.renderer.set_autoscale(enabled)
+        elif self.history_plot is not None:
+            self.history_plot.set_autoscale(enabled)
+        self.update_plot()
+
+    def _plot_view_changed(self):
+        viewport = self.viewport
+        if viewport.follow_live:
+            self.plot_view_var.set("Live")
+        else:
+            self.plot_view_var.set(f"{time.strftime('%d.%m %H:%M', time.localtime(viewport.start))} - "
+                                   f"{time.strftime('%d.%m %H:%M', time.localtime(viewport.end))}")
+        self.update_plot()
+
+    def _start_renderer(self):
+        """Start the render process; the GUI itself then never imports matplotlib"""
+        from chamber_gui.render_worker import RenderProcess
+        self.renderer = RenderProcess(self.history_start, (self.min_temp, self.max_temp),
+                                      self.card_color, self.text_color, budget=self.budget)
+        self.renderer.set_autoscale(self.plot_autoscale_var.get())
+        self.renderer.start()
+        self.plot_placeholder.bind('<Configure>', lambda event: self.update_plot())
+        self._bind_plot_navigation(self.plot_placeholder)
+        self.root.after(self.FRAME_POLL_MS, self._poll_frames)
+        self.update_plot()
+
+    def _poll_frames(self):
+        """Display the newest frame the render process has finished"""
+        if self.renderer is None:
+            return
+        if not self.renderer.alive:
+            self._on_renderer_died()
+            return
+        pixels = self.renderer.poll()
+        if pixels is not None:
+            self.render_gate.record_frame(self.renderer.last_render_cpu)
+            if self.loop_monitor.enabled:
+                self.loop_monitor.stats.record('render (worker)', self.renderer.last_render_time)
+            self.show_frame(pixels)
+        self.root.after(self.FRAME_POLL_MS, self._poll_frames)
+
+    def _on_renderer_died(self):
+        """Draw the plot in-process after the render process exited unexpectedly"""
+        renderer, self.renderer = self.renderer, None
+        self.log(f"Render process exited with code {renderer.exitcode}, drawing the plot in-process",
+                 events.ERROR, exitcode=renderer.exitcode)
+        renderer.stop()
+        self.render_process = False
+        self.frame_image = None
+        import_thread = Thread(target=self._import_plotting)
+        import_thread.daemon = True
+        import_thread.start()
+
+    def show_frame(self, pixels):
+        """Blit an RGBA frame from the render process"""
+        from PIL import Image, ImageTk
+        height, width = pixels.shape[:2]
+        image = Image.frombuffer('RGBA', (width, height), pixels, 'raw', 'RGBA', 0, 1)
+        first_frame = self.frame_image is None
+        if not first_frame and (self.frame_image.width(), self.frame_image.height()) == (width, height):
+            self.frame_image.paste(image)
+            return
+        self.frame_image = ImageTk.PhotoImage(image)
+        # Anchored top left so widget coordinates are frame pixels
+        self.plot_placeholder.configure(image=self.frame_image, text='', anchor='nw')
+        if first_frame:
+            self.mark_startup('plot_ready')
+
+    def enable_startup_probe(self, path):
+        """Record when the control UI and the plot become ready, write them to path and exit"""
+        self.startup_probe = {'path': path, 'timings': {}}
+        self.root.after_idle(self.mark_startup, 'ui_ready')
+
+    def mark_startup(self, milestone):
+        """Timestamp a startup milestone when the startup probe is enabled"""
+        probe = self.startup_probe
+        if probe is None:
+            return
+        probe['timings'][milestone] = time.time()
+        if {'ui_ready', 'plot_ready'} <= probe['timings'].keys():
+            with open(probe['path'], 'w', encoding='utf-8') as f:
+                json.dump(probe['timings'], f)
+            self.root.after(0, self.on_closing)
 
     def set_temp(self, temp):
         """Set the target temperature"""
@@ -562,13 +1684,19 @@ class DarkThemeThermalChamber:
 
         self.target_temp = temp
         if self.is_connected:
-            self.tcam.temperature_set_point = self.target_temp
+            self._send_command('set_point',
+                               lambda tcam, temp=self.target_temp: tcam.write_set_point(temp),
+                               f"set point {self.target_temp:.1f} °C")
+            self._mirror_command('set_point', 'write_set_point', self.target_temp)
+            self.markers.add_set_point(time.time(), self.target_temp, self._history_total())
+            if self.recorder is not None:
+                self.recorder.add_event(events.SETPOINT, temperature=self.target_temp)
+            self.metadata_cache.update_state(self.ip_var.get(), temperature_set_point=self.target_temp)
             # print(self.target_temp)
 
         self.target_var.set(f"{self.target_temp:.1f} °C")
         self.custom_temp.set(self.target_temp)
-        self.log_text.insert(tk.END, f"Temperature set to {self.target_temp:.1f} °C\n")
-        self.log_text.see(tk.END)
+        self.log(f"Temperature set to {self.target_temp:.1f} °C", events.SETPOINT, temperature=self.target_temp)
         self.temp_entry.delete(0, tk.END)
         self.temp_entry.insert(0, f"{self.target_temp:.1f}")
 
@@ -590,17 +1718,24 @@ class DarkThemeThermalChamber:
             return
 
         # start chamber real device
-        self.tcam.temperature_set_point = self.target_temp
-        self.tcam.start()
+        def start(tcam, temp=self.target_temp):
+            tcam.write_set_point(temp)
+            tcam.start()
+
+        self._send_command('run_state', start, "start")
+        self._mirror_command('set_point', 'write_set_point', self.target_temp)
+        self._mirror_command('run_state', 'start')
         self.is_running = True
+        self.markers.start_run(time.time(), self._history_total())
+        self.start_session()
 
         self.status_var.set(f"Running at {self.target_temp}°C")
         self.status_label.configure(background=self.get_temp_color(self.target_temp))
         self.run_button.config(state='disabled')
         self.stop_button.config(state='normal')
 
-        self.log_text.insert(tk.END, f"Chamber started at {self.target_temp}°C\n")
-        self.log_text.see(tk.END)
+        self.log(f"Chamber started at {self.target_temp}°C",
+                 events.RUN_STATE, state="started", temperature=self.target_temp)
 
 
     def stop_chamber(self):
@@ -608,99 +1743,166 @@ class DarkThemeThermalChamber:
         if not self.is_running:
             return None
 
-        self.tcam.stop()
+        self._send_command('run_state', lambda tcam: tcam.stop(), "stop")
+        self._mirror_command('run_state', 'stop')
         self.is_running = False
+        self.markers.stop_run(time.time(), self._history_total())
+        self.finish_session()
         self.status_var.set("Connected (Idle)" if self.is_connected else "Disconnected")
         self.status_label.configure(background=self.get_temp_color(25))
         self.run_button.config(state='normal')
         self.stop_button.config(state='disabled')
-        self.tcam.stop()
-        self.log_text.insert(tk.END, "Chamber stopped\n")
-        self.log_text.see(tk.END)
+        self.log("Chamber stopped", events.RUN_STATE, state="stopped")
 
     def read_temperature(self):
-        """Simulate temperature changes"""
-        start_time = time.time()
+        """Sample the chamber temperature and schedule plot updates"""
+        from chamber_gui.samples import SampleStore
+        self.samples = SampleStore()
         while self.running:
-            # Add new data point every second
-            elapsed_minutes = (time.time() - start_time) / 60
-            self.x_data.append(elapsed_minutes)
+            if self.collect_samples():
+                # Update display
+                self.temp_var.set(f"{self.current_temp:.1f} °C")
 
-            # Simulate temperature change toward target
-            if self.is_connected:
-                self.current_temp = round(self.tcam.temperature_measured, 2)
-
-            else:
-                # Slowly drift toward room temperature
-                self.current_temp = 20
-            # print(self.current_temp, self.is_running, self.is_connected, )
-            self.y_data.append(self.current_temp)
-
-            # Keep only the last 100 points
-            if len(self.x_data) > 10000:
-                self.x_data = self.x_data[-10000:]
-                self.y_data = self.y_data[-10000:]
-
-            # Update display
-            self.temp_var.set(f"{self.current_temp:.1f} °C")
-
-            # Update the plot on the main thread
-            self.root.after(0, self.update_plot)
+                # Update the plot on the main thread
+                self.root.after(0, self.update_plot)
 
             time.sleep(0.5)
 
-    def simulate_temperature(self):
-        """Simulate temperature changes"""
-        start_time = time.time()
-        while self.running:
-            # Add new data point every second
-            elapsed_minutes = (time.time() - start_time) / 60
-            self.x_data.append(elapsed_minutes)
-
-            # Simulate temperature change toward target
-            if self.is_running and self.is_connected:
-                diff = self.target_temp - self.current_temp
-                step = diff * 0.05 + random.uniform(-0.1, 0.1)
-                self.current_temp += step
-            else:
-                # Slowly drift toward room temperature
-                self.current_temp += (25 - self.current_temp) * 0.01 + random.uniform(-0.05, 0.05)
-
-            self.y_data.append(self.current_temp)
-
-            # Keep only the last 100 points
-            if len(self.x_data) > 100:
-                self.x_data = self.x_data[-100:]
-                self.y_data = self.y_data[-100:]
-
-            # Update display
-            self.temp_var.set(f"{self.current_temp:.1f} °C")
-
-            # Update the plot on the main thread
-            self.root.after(0, self.update_plot)
-
-            time.sleep(0.5)
+    def collect_samples(self, now=None):
+        """Append the newest samples to the history, returning False if none were added
+
+        now replaces the clock for every row added, chamber readings included,
+        so benchmarks can feed a simulated run faster than real time.
+        """
+        from chamber_gui.samples import COLUMN_NAMES, gap_row, row_from_status
+        clock_given = now is not None
+        now = time.time() if now is None else now
+        supervisor = self.supervisor
+        acquisition = self.acquisition
+
+        if acquisition is not None:
+            # The acquisition process owns sampling, just pick up what it published
+            rows = acquisition.read_new()
+            measured = rows[:, COLUMN_NAMES.index('measured')]
+            valid = measured[measured == measured]
+            if len(valid):
+                self.current_temp = float(valid[-1])
+        elif self.is_connected and supervisor is not None:
+            if not supervisor.online:
+                # Samples are skipped while reconnecting, the gap marker is already in the history
+                return False
+            try:
+                status = supervisor.chamber.read_status()
+                if clock_given:
+                    status = status._replace(timestamp=now)
+                rows = [row_from_status(status)]
+                self.current_temp = round(status.measured, 2)
+                self.in_gap = False
+            except Exception as e:
+                supervisor.report_failure(e)
+                if self.in_gap:
+                    return False
+                # NaN breaks the plotted lines so the gap is visible in the history
+                rows = [gap_row(now)]
+                self.in_gap = True
+        else:
+            # Slowly drift toward room temperature
+            self.current_temp = 20
+            rows = [(now, math.nan, self.current_temp, math.nan, 0)]
+        # print(self.current_temp, self.is_running, self.is_connected, )
+        self.samples.extend(rows)
+        if self.renderer is not None:
+            self.renderer.publish(rows)
+        recorder = self.recorder
+        if recorder is not None:
+            try:
+                recorder.append(rows)
+            except OSError as e:
+                self.root.after(0, self._on_recording_failed, recorder, e)
+        return len(rows) > 0
+
+    def update_plot_visibility(self, event=None):
+        """Pause redraws while the plot cannot be seen, catching up once it can"""
+        if event is not None and event.type in (tk.EventType.Map, tk.EventType.Unmap):
+            # Child widgets report their own map events through the root's binding
+            if event.widget is not self.root:
+                return
+            self.window_mapped = event.type == tk.EventType.Map
+        visible = self.window_mapped and self.notebook.select() == str(self.control_tab)
+        resumed = self.render_gate.set_visible(visible)
+        if resumed is None:
+            return
+        hidden_seconds, skipped, cpu_saved = resumed
+        if skipped:
+            self.log(f"Plot hidden for {hidden_seconds:.0f} s: {skipped} redraws skipped, "
+                     f"about {cpu_saved:.1f} s CPU saved ({self.render_gate.total_saved:.1f} s this session)",
+                     events.DIAGNOSTICS, skipped=skipped, cpu_saved=round(cpu_saved, 3))
+        if self.render_gate.stale:
+            self.update_plot()
+
+    def _throttled_update(self):
+        self.throttled_frame = None
+        self.update_plot()
 
     def update_plot(self):
         """Update the temperature plot"""
-        self.line.set_data(self.x_data, self.y_data)
-        self.line.set_color(self.get_temp_color(self.current_temp))
-
-        # Adjust plot limits
-        if len(self.x_data) > 0:
-            self.ax.set_xlim(0, max(self.x_data) + 0.5)
+        delay = self.render_gate.throttle_delay()
+        if delay:
+            # Over the frame rate cap, draw the newest data once the interval has passed
+            if self.throttled_frame is None:
+                self.throttled_frame = self.root.after(int(delay * 1000) + 1, self._throttled_update)
+            return
+        # Samples keep accumulating in the store while the plot is hidden
+        if not self.render_gate.should_render():
+            return
+        if self.renderer is not None:
+            # Trimmed here as HistoryPlot.update does in-process, so the snapshots sent stay bounded
+            first_time = None if self.samples is None else self.samples.first('time')
+            if first_time is not None:
+                self.markers.trim_before(first_time)
+            # Dropped in favour of the next one if the render process is still busy
+            self.renderer.request(max(self.plot_placeholder.winfo_width(), 1),
+                                  max(self.plot_placeholder.winfo_height(), 1), self.markers, self.viewport)
+            return
+        if self.canvas is None or self.samples is None:
+            return
+        started_cpu = time.process_time()
+        self.history_plot.update(self.samples, self.markers, self.history_start, self.viewport)
 
         # Redraw the plot
         self.canvas.draw()
+        self.render_gate.record_frame(time.process_time() - started_cpu)
 
     def on_closing(self):
         """Handle application shutdown"""
         self.running = False
+        self.stop_acquisition()
+        self.finish_session()
+        if self.catalog is not None:
+            self.catalog.close()
+        if self.renderer is not None:
+            self.renderer.stop()
+            self.renderer = None
+        self.metadata_cache.save()
+        self.log_view.close()
         self.root.destroy()
 
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    parser = argparse.ArgumentParser(description="VotschTechnik climate chamber GUI")
+    parser.add_argument('--isolated-acquisition', action='store_true',
+                        help="sample the chamber in a separate process, over a second connection to it")
+    parser.add_argument('--render-process', action='store_true',
+                        help="render the plot in a separate process")
+    parser.add_argument('--budget', choices=sorted(render_budget.BUDGETS), default=render_budget.DEFAULT_BUDGET,
+                        help="rendering budget, 'low' for small kiosk PCs")
+    args = parser.parse_args()
+
     root = tk.Tk()
-    app = DarkThemeThermalChamber(root)
+    app = DarkThemeThermalChamber(root, isolated_acquisition=args.isolated_acquisition,
+                                  render_process=args.render_process, budget=args.budget)
+    if os.environ.get(STARTUP_PROBE_ENV):
+        app.enable_startup_probe(os.environ[STARTUP_PROBE_ENV])
     root.protocol("WM_DELETE_WINDOW", app.on_closing)
     root.mainloop()
\ No newline at end of file
@@ -0,0 +1,231 @@
+"""Benchmarks for the GUI render and acquisition hot paths
+
+Drives DarkThemeThermalChamber headless (Agg, withdrawn Tk root) against the
+simulated backend. It reports:
+
+* update_plot frame time versus history length
+* log widget insert cost versus widget size
+* get_temp_color calls per second
+* sample throughput versus number of chambers
+* memory growth per simulated hour of running
+
+A Tk display is still needed (Xvfb works). Results are printed and can be
+written as JSON for comparison between commits:
+
+    python benchmarks/bench_hotpaths.py --output bench.json
+"""
+import argparse
+import gc
+import importlib.util
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+import matplotlib
+matplotlib.use('Agg')
+import numpy as np
+import tkinter as tk
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from chamber_gui.backends import open_backend
+
+SCRIPT = os.path.join(REPO_ROOT, 'VotschTechnikClimateChamber-GUI-2.py')
+SAMPLE_PERIOD_S = 0.5
+
+
+def load_gui_module():
+    """Import the GUI script, whose file name is not a valid module name"""
+    spec = importlib.util.spec_from_file_location('votsch_gui_app', SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def make_app(gui, master, cache_dir, latency=0.0, budget='full'):
+    """Create a GUI instance connected to a simulated chamber, with its own sampler stopped
+
+    Its cache, log, sessions and catalog are kept in cache_dir, never in the
+    operator's ~/.votsch_gui.
+    """
+    app = gui.DarkThemeThermalChamber(master, budget=budget, data_dir=cache_dir)
+    # Time every frame; a budget's frame rate cap only spaces them out
+    app.render_gate.min_interval = 0.0
+    app.running = False
+    app.simulation_thread.join()
+    app._build_plot()
+
+    backend = open_backend('simulator', app.min_temp, app.max_temp, latency=latency, time_scale=60.0)
+    app._on_connected('simulator', backend, backend.identity(), backend.read_status().set_point, None)
+    return app
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def bench_frame_time(app, sizes, frames):
+    """Time update_plot with histories of various lengths"""
+    results = []
+    for size in sizes:
+        app.samples.clear()
+        index = np.arange(size)
+        rows = np.column_stack((app.history_start + index * SAMPLE_PERIOD_S,
+                                np.full(size, 25.0),
+                                20 + (index % 200) * 0.1,
+                                np.full(size, 45.0),
+                                np.ones(size)))
+        app.samples.extend(rows)
+        app.update_plot()
+        times = []
+        for frame in range(frames):
+            # One new sample per frame, as in a live run
+            app.samples.append(app.history_start + (size + frame) * SAMPLE_PERIOD_S, 25.0, 20.0, 45.0, 1)
+            start = time.perf_counter()
+            app.update_plot()
+            times.append(time.perf_counter() - start)
+        results.append({'points': size,
+                        'median_ms': statistics.median(times) * 1e3,
+                        'p95_ms': percentile(times, 0.95) * 1e3})
+        print(f"frame time  {size:>8d} points  median {results[-1]['median_ms']:8.2f} ms  "
+              f"p95 {results[-1]['p95_ms']:8.2f} ms")
+    app.samples.clear()
+    app.update_plot()
+    return results
+
+
+def bench_log_insert(app, sizes, batch=100):
+    """Time logging a batch of lines after many lines have already been logged"""
+    results = []
+    for size in sizes:
+        for i in range(size):
+            app.log(f"Temperature set to {i % 100:.1f} °C")
+        app.log_view.flush()
+        start = time.perf_counter()
+        for i in range(batch):
+            app.log(f"Temperature set to {i:.1f} °C")
+        app.log_view.flush()
+        app.root.update_idletasks()
+        per_line = (time.perf_counter() - start) / batch
+        results.append({'lines': size, 'per_insert_us': per_line * 1e6})
+        print(f"log insert  {size:>8d} lines   {per_line * 1e6:8.1f} us per line")
+    return results
+
+
+def bench_temp_color(app, calls):
+    """Measure get_temp_color throughput over the whole temperature range"""
+    temps = [app.min_temp + (app.max_temp - app.min_temp) * i / 997 for i in range(997)]
+    start = time.perf_counter()
+    for i in range(calls):
+        app.get_temp_color(temps[i % 997])
+    elapsed = time.perf_counter() - start
+    print(f"get_temp_color       {calls / elapsed:12.0f} calls/s")
+    return {'calls_per_s': calls / elapsed}
+
+
+def bench_throughput(gui, root, cache_dir, chamber_counts, duration, latency):
+    """Run collect_samples for several chambers in parallel and count samples per second"""
+    results = []
+    for count in chamber_counts:
+        windows = [tk.Toplevel(root) for _ in range(count)]
+        for window in windows:
+            window.withdraw()
+        apps = [make_app(gui, window, cache_dir, latency) for window in windows]
+        counters = [0] * count
+        stop = threading.Event()
+
+        def sample(index, app):
+            while not stop.is_set():
+                if app.collect_samples():
+                    counters[index] += 1
+
+        threads = [threading.Thread(target=sample, args=(i, app)) for i, app in enumerate(apps)]
+        for thread in threads:
+            thread.start()
+        time.sleep(duration)
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+        total = sum(counters)
+        results.append({'chambers': count, 'samples_per_s': total / duration,
+                        'per_chamber_per_s': total / duration / count})
+        print(f"throughput  {count:>3d} chambers  {total / duration:10.0f} samples/s "
+              f"({total / duration / count:.0f} per chamber)")
+        for app, window in zip(apps, windows):
+            app.disconnect_chamber()
+            window.destroy()
+    return results
+
+
+def bench_memory(app, hours, draw_every):
+    """Feed a simulated run through the sampling and plot path and measure Python heap growth"""
+    samples = int(hours * 3600 / SAMPLE_PERIOD_S)
+    start_time = time.time()
+    app.samples.clear()
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    for i in range(samples):
+        app.collect_samples(now=start_time + i * SAMPLE_PERIOD_S)
+        if i % draw_every == 0:
+            app.update_plot()
+        if i % 120 == 0:
+            app.log(f"Temperature set to {app.current_temp:.1f} °C")
+            app.log_view.flush()
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    growth = (current - baseline) / hours
+    print(f"memory      {growth / 1024:10.1f} KiB per simulated hour (peak {peak / 1024:.0f} KiB)")
+    return {'hours': hours, 'samples': samples, 'growth_bytes_per_hour': growth, 'peak_bytes': peak}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GUI hot path benchmarks")
+    parser.add_argument('--budget', default='full', help="rendering budget the GUI is created with")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000, 1000000])
+    parser.add_argument('--frames', type=int, default=20)
+    parser.add_argument('--log-sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--color-calls', type=int, default=200000)
+    parser.add_argument('--chambers', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--duration', type=float, default=3.0, help="seconds per throughput run")
+    parser.add_argument('--latency', type=float, default=0.002, help="simulated chamber latency in seconds")
+    parser.add_argument('--hours', type=float, default=1.0, help="simulated hours for the memory run")
+    parser.add_argument('--draw-every', type=int, default=20, help="redraw every N samples in the memory run")
+    parser.add_argument('--output', help="write results as JSON to this file")
+    args = parser.parse_args()
+
+    gui = load_gui_module()
+    root = tk.Tk()
+    root.withdraw()
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        app = make_app(gui, root, cache_dir, budget=args.budget)
+        results = {
+            'meta': {'python': sys.version.split()[0], 'platform': platform.platform(), 'budget': args.budget,
+                     'matplotlib': matplotlib.__version__, 'timestamp': time.time()},
+            'frame_time': bench_frame_time(app, args.sizes, args.frames),
+            'log_insert': bench_log_insert(app, args.log_sizes),
+            'get_temp_color': bench_temp_color(app, args.color_calls),
+            'memory': bench_memory(app, args.hours, args.draw_every),
+        }
+        results['throughput'] = bench_throughput(gui, root, cache_dir, args.chambers, args.duration, args.latency)
+        app.disconnect_chamber()
+    root.destroy()
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
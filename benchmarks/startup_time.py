@@ -0,0 +1,78 @@
+"""Measure GUI cold start time for the source script and the frozen executable
+
+The GUI is launched with VT_GUI_STARTUP_PROBE pointing at a temporary file.
+It records when the control UI first goes idle and when the plot is ready,
+then exits. Times are measured from just before the process is spawned.
+
+    python benchmarks/startup_time.py --runs 5
+    python benchmarks/startup_time.py --exe dist/VotschTechnikClimateChamber-GUI-2.exe --output startup.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPT = os.path.join(REPO_ROOT, 'VotschTechnikClimateChamber-GUI-2.py')
+PROBE_ENV = 'VT_GUI_STARTUP_PROBE'
+
+
+def measure_once(command, timeout):
+    """Launch the GUI once and return seconds until UI ready and plot ready"""
+    fd, probe_path = tempfile.mkstemp(suffix='.json')
+    os.close(fd)
+    os.remove(probe_path)
+    env = dict(os.environ, **{PROBE_ENV: probe_path})
+    try:
+        launched = time.time()
+        subprocess.run(command, env=env, cwd=REPO_ROOT, timeout=timeout, check=True,
+                       stdout=subprocess.DEVNULL)
+        with open(probe_path, 'r', encoding='utf-8') as f:
+            timings = json.load(f)
+    finally:
+        if os.path.exists(probe_path):
+            os.remove(probe_path)
+    return {milestone: stamp - launched for milestone, stamp in timings.items()}
+
+
+def measure(command, runs, timeout):
+    """Run several launches and summarize each milestone"""
+    samples = [measure_once(command, timeout) for _ in range(runs)]
+    summary = {}
+    for milestone in samples[0]:
+        values = [sample[milestone] for sample in samples]
+        summary[milestone] = {'median_s': statistics.median(values),
+                              'min_s': min(values),
+                              'max_s': max(values),
+                              'runs': values}
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GUI startup time benchmark")
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--exe', help="frozen executable built from VotschTechnikClimateChamber-GUI-2.spec")
+    parser.add_argument('--timeout', type=float, default=120.0)
+    parser.add_argument('--output', help="write results as JSON to this file")
+    args = parser.parse_args()
+
+    results = {'python': sys.version.split()[0], 'platform': sys.platform,
+               'source': measure([sys.executable, SCRIPT], args.runs, args.timeout)}
+    if args.exe:
+        results['frozen'] = measure([os.path.abspath(args.exe)], args.runs, args.timeout)
+
+    for build in ('source', 'frozen'):
+        for milestone, stats in results.get(build, {}).items():
+            print(f"{build:7s} {milestone:11s} median {stats['median_s']:.3f} s "
+                  f"(min {stats['min_s']:.3f}, max {stats['max_s']:.3f})")
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1 @@
+"""Support modules for the VotschTechnik climate chamber GUI"""
@@ -0,0 +1,7 @@
+"""Entry point for python -m chamber_gui"""
+import sys
+
+from chamber_gui.cli import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+"""Chamber sampling in a separate process, publishing into a shared sample ring"""
+import multiprocessing
+import queue
+import time
+from collections import OrderedDict
+
+from chamber_gui.backends import is_simulated, open_backend
+from chamber_gui.sample_ring import SharedSampleRing
+from chamber_gui.samples import gap_row, row_from_status
+from chamber_gui.supervisor import backoff_delay
+
+
+def _apply_commands(chamber, commands, state):
+    """Record mirrored commands in state and run them on chamber"""
+    while True:
+        try:
+            name, method, args = commands.get_nowait()
+        except queue.Empty:
+            return
+        # Keyed like the supervisor's queue, so a newer set point replaces an older one
+        state.pop(name, None)
+        state[name] = (method, args)
+        getattr(chamber, method)(*args)
+
+
+def _acquisition_main(ring_name, ip_address, temperature_min, temperature_max, period, stop_event, commands):
+    """Child process loop: sample the chamber on a fixed schedule and write rows to the ring"""
+    ring = SharedSampleRing.attach(ring_name)
+    chamber = None
+    attempts = 0
+    in_gap = False
+    # Last mirrored command of each name, replayed onto a newly opened chamber
+    state = OrderedDict()
+    next_sample = time.monotonic()
+    try:
+        while not stop_event.is_set():
+            try:
+                if chamber is None:
+                    chamber = open_backend(ip_address, temperature_min, temperature_max)
+                    attempts = 0
+                    for method, args in state.values():
+                        getattr(chamber, method)(*args)
+                if commands is not None:
+                    _apply_commands(chamber, commands, state)
+                status = chamber.read_status()
+            except Exception:
+                chamber = None
+                if not in_gap:
+                    ring.append(gap_row(time.time()))
+                    in_gap = True
+                stop_event.wait(backoff_delay(attempts))
+                attempts += 1
+                next_sample = time.monotonic()
+                continue
+
+            in_gap = False
+            ring.append(row_from_status(status))
+
+            # Schedule against absolute deadlines so slow reads do not accumulate drift
+            next_sample += period
+            delay = next_sample - time.monotonic()
+            if delay < 0:
+                next_sample = time.monotonic()
+                delay = 0
+            stop_event.wait(delay)
+    finally:
+        ring.close()
+
+
+class AcquisitionProcess:
+    """Owns the acquisition child process and the ring it writes into
+
+    The child opens its own backend connection next to the GUI's, so a real
+    chamber must accept two connections; commands the GUI sends then reach
+    the chamber being sampled directly. A simulated chamber only exists in
+    the process that opened it, so for simulated addresses the GUI mirrors
+    its commands to the child's simulator with send_command().
+    """
+
+    def __init__(self, ip_address, temperature_min, temperature_max, period=0.5, capacity=65536):
+        self.ring = SharedSampleRing.create(capacity)
+        # Spawned so the GUI's threads and Tk state are never forked
+        context = multiprocessing.get_context("spawn")
+        self._stop_event = context.Event()
+        self._commands = context.Queue() if is_simulated(ip_address) else None
+        self._process = context.Process(
+            target=_acquisition_main,
+            args=(self.ring.name, ip_address, temperature_min, temperature_max, period, self._stop_event,
+                  self._commands),
+            daemon=True)
+        self.last_seq = 0
+        self.lost_samples = 0
+
+    def start(self):
+        self._process.start()
+
+    def send_command(self, name, method, *args):
+        """Call method(*args) on a simulated chamber in the child, replacing its last command called name"""
+        if self._commands is not None:
+            self._commands.put((name, method, args))
+
+    def read_new(self):
+        """Copy out rows written since the last call as an array with one column per sample field
+
+        The rows are kept by the sample store, the renderer and the session
+        recorder long after the writer has reused their ring slots, so views
+        onto the ring would not do. copy_since makes the one copy and drops
+        any rows the writer lapped while it was copying.
+        """
+        self.last_seq, rows, lost = self.ring.copy_since(self.last_seq)
+        self.lost_samples += lost
+        return rows
+
+    def stop(self, timeout=2.0):
+        """Stop the child and release the shared block"""
+        self._stop_event.set()
+        self._process.join(timeout)
+        if self._process.is_alive():
+            self._process.terminate()
+            self._process.join()
+        if self._commands is not None:
+            self._commands.close()
+        self.ring.close()
@@ -0,0 +1,185 @@
+"""Thermal KPIs of recorded sessions, computed per set point segment with vectorized NumPy
+
+A segment runs from one set point change to the next. Every KPI is a
+reduction over the samples of each segment, done for all segments at once
+with ufunc.reduceat on the segment start indices, so the cost is a few
+passes over the arrays whatever the number of segments.
+"""
+import numpy as np
+
+from chamber_gui import events
+from chamber_gui.sessions import read_events, read_samples
+
+# Band around the set point that counts as reached, in °C
+DEFAULT_TOLERANCE = 1.0
+# Final share of a segment averaged for the steady-state error
+STEADY_FRACTION = 0.1
+
+KPI_NAMES = ("start", "end", "set_point", "initial", "rise_time", "overshoot", "arrival_time", "settling_time",
+             "steady_state_error", "ramp_rate", "time_in_tolerance", "soak_in_tolerance")
+
+
+def _fill_forward(values):
+    """Copy of values with every NaN replaced by the last valid value before it"""
+    valid = values == values
+    last_valid = np.maximum.accumulate(np.where(valid, np.arange(len(values)), 0))
+    # Leading NaNs map to the first value, which is NaN itself
+    return values[last_valid]
+
+
+def set_point_segments(set_point):
+    """Start index of every run of equal set point, and the index one past each run's end
+
+    Gap rows (NaN set point) belong to the segment they interrupt.
+    """
+    set_point = _fill_forward(np.asarray(set_point, dtype=np.float64))
+    if not len(set_point):
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    previous, current = set_point[:-1], set_point[1:]
+    same = (current == previous) | ((current != current) & (previous != previous))
+    starts = np.concatenate(([0], np.flatnonzero(~same) + 1))
+    ends = np.append(starts[1:], len(set_point))
+    return starts, ends
+
+
+def event_segments(times, event_times):
+    """Start and end indices of the segments begun by set point events at event_times
+
+    An event takes effect at the first sample at or after it; of several
+    events before the same sample only the last one counts. Returns the
+    indices of the events kept as well.
+    """
+    starts = np.searchsorted(times, np.asarray(event_times, dtype=np.float64), side="left")
+    kept = np.flatnonzero(np.append(starts[1:] != starts[:-1], True) & (starts < len(times)))
+    starts = starts[kept]
+    ends = np.append(starts[1:], len(times))
+    return starts, ends, kept
+
+
+def _empty_kpis():
+    return {name: np.empty(0) for name in KPI_NAMES}
+
+
+def segment_kpis(times, set_point, measured, tolerance=DEFAULT_TOLERANCE, set_point_events=None):
+    """KPIs of every set point segment as a dict of equally long arrays, keyed by KPI_NAMES
+
+    Segments come from set_point_events, (timestamp, value) pairs, when
+    given and from changes in the set_point column otherwise. Samples before
+    the first set point are ignored.
+
+    start and end are the segment's timestamps and initial the temperature
+    it started from. rise_time is the seconds from 10 % to 90 % of the step
+    and ramp_rate the achieved rate over that stretch in °C/min. overshoot
+    is how far (°C) the temperature went past the set point in the
+    direction of the step. arrival_time and settling_time are the seconds
+    until it first entered the tolerance band and until it entered it for
+    good (NaN if it never did; gap readings count neither way), and steady_state_error is the mean error
+    over the final STEADY_FRACTION of the segment. time_in_tolerance is the
+    seconds spent inside the band and soak_in_tolerance the share of the
+    time after first reaching the band spent inside it. Segments that start
+    within the tolerance are holds, with NaN rise_time, ramp_rate and
+    overshoot.
+    """
+    times = np.asarray(times, dtype=np.float64)
+    measured = np.asarray(measured, dtype=np.float64)
+    if set_point_events is not None:
+        set_point_events = np.asarray(set_point_events, dtype=np.float64).reshape(-1, 2)
+        starts, ends, kept = event_segments(times, set_point_events[:, 0])
+        target = np.full(len(times), np.nan)
+        if len(starts):
+            target[starts[0]:] = np.repeat(set_point_events[kept, 1], ends - starts)
+    else:
+        starts, ends = set_point_segments(set_point)
+        target = _fill_forward(np.asarray(set_point, dtype=np.float64))
+        # Only the leading segment can lack a set point
+        if len(starts) and target[0] != target[0]:
+            starts, ends = starts[1:], ends[1:]
+    if not len(starts):
+        return _empty_kpis()
+
+    # Work on the samples from the first segment on, so segment starts index from 0
+    first = starts[0]
+    all_measured = measured
+    times, measured, target = times[first:], measured[first:], target[first:]
+    starts, ends = starts - first, ends - first
+    count = len(times)
+    index = np.arange(count)
+    lengths = ends - starts
+    segment = np.repeat(np.arange(len(starts)), lengths)
+    target_of = target[starts]
+
+    # Temperature each segment starts from: the last valid reading before it, else its first one
+    initial = _fill_forward(all_measured)[starts + first]
+    first_valid = np.minimum.reduceat(np.where(measured == measured, index, count), starts)
+    missing = initial != initial
+    initial[missing] = measured[np.minimum(first_valid, count - 1)][missing]
+
+    step = target_of - initial
+    direction = np.where(np.abs(step) > tolerance, np.sign(step), 0.0)
+    # NaN for holds, so every step-relative KPI comes out NaN for them
+    signed = np.where(direction != 0, direction, np.nan)
+    error = measured - target
+    with np.errstate(invalid="ignore"):
+        within = np.abs(error) <= tolerance
+
+    overshoot = np.maximum(np.fmax.reduceat(signed[segment] * error, starts), 0.0)
+
+    # Settled from the sample after the last one outside the band, if the segment ends inside it; gaps are no reading
+    last_outside = np.maximum.reduceat(np.where(within | (error != error), -1, index), starts)
+    settle_index = np.minimum.reduceat(np.where(within & (index > last_outside[segment]), index, count), starts)
+    settled = settle_index < ends
+    settling_time = np.where(settled, times[np.minimum(settle_index, count - 1)] - times[starts], np.nan)
+
+    # Each sample stands for the time until the next one
+    durations = np.append(np.diff(times), 0.0)
+    in_band = np.where(within, durations, 0.0)
+    time_in_tolerance = np.add.reduceat(in_band, starts)
+
+    # Soak: from the first sample inside the band to the end of the segment
+    arrival = np.minimum.reduceat(np.where(within, index, count), starts)
+    arrived = arrival < ends
+    arrival_time = np.where(arrived, times[np.minimum(arrival, count - 1)] - times[starts], np.nan)
+    after_arrival = index >= np.where(arrived, arrival, ends)[segment]
+    soak_time = np.add.reduceat(np.where(after_arrival, durations, 0.0), starts)
+    soak_inside = np.add.reduceat(np.where(after_arrival, in_band, 0.0), starts)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        soak_in_tolerance = np.where(arrived & (soak_time > 0), soak_inside / soak_time, np.nan)
+
+    # Mean error over the tail of each segment, skipping gaps
+    tail_start = ends - np.ceil(STEADY_FRACTION * lengths).astype(np.int64)
+    in_tail = (index >= tail_start[segment]) & (error == error)
+    tail_count = np.add.reduceat(in_tail.astype(np.int64), starts)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        steady_state_error = np.add.reduceat(np.where(in_tail, error, 0.0), starts) / tail_count
+
+    # 10 % and 90 % of the step, as the first sample that got that far
+    with np.errstate(invalid="ignore", divide="ignore"):
+        progress = signed[segment] * (measured - initial[segment]) / np.abs(step)[segment]
+    first_10 = np.minimum.reduceat(np.where(progress >= 0.1, index, count), starts)
+    first_90 = np.minimum.reduceat(np.where(progress >= 0.9, index, count), starts)
+    rose = (first_90 < ends) & (direction != 0) & (first_90 > first_10)
+    rise_time = np.where(rose, times[np.minimum(first_90, count - 1)] - times[np.minimum(first_10, count - 1)],
+                         np.nan)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        ramp_rate = 0.8 * step * 60 / rise_time
+
+    end = np.append(times[starts[1:]], times[-1])
+    return {"start": times[starts], "end": end, "set_point": target_of, "initial": initial,
+            "rise_time": rise_time, "overshoot": overshoot, "arrival_time": arrival_time,
+            "settling_time": settling_time,
+            "steady_state_error": steady_state_error, "ramp_rate": ramp_rate,
+            "time_in_tolerance": time_in_tolerance, "soak_in_tolerance": soak_in_tolerance}
+
+
+def recorded_set_points(event_records):
+    """(timestamp, value) of the set point changes among a session's event records, or None if there are none"""
+    set_points = [(record["time"], record["temperature"]) for record in event_records
+                  if record.get("kind") == events.SETPOINT and record.get("temperature") is not None]
+    return set_points or None
+
+
+def session_kpis(path, tolerance=DEFAULT_TOLERANCE):
+    """segment_kpis of the session at path, segmented by its recorded set point events"""
+    records = read_samples(path)
+    return segment_kpis(records["time"], records["set_point"], records["measured"], tolerance,
+                        set_point_events=recorded_set_points(read_events(path)))
@@ -0,0 +1,233 @@
+"""Chamber backend interface with a Vötsch driver and an in-process simulator"""
+import abc
+import math
+import random
+import threading
+import time
+from collections import namedtuple
+
+ChamberStatus = namedtuple("ChamberStatus", "timestamp measured set_point humidity running alarm",
+                           defaults=(None,))
+ChamberStatus.__doc__ = """Live values of a chamber; humidity and alarm are None when the backend cannot report them"""
+ChamberCapabilities = namedtuple("ChamberCapabilities", "configured_min configured_max humidity")
+ChamberCapabilities.__doc__ = """Temperature limits the backend was opened with and whether it reports humidity
+
+The Vötsch driver has no query for the chamber's own limits, so these are
+the limits configured in the GUI and handed to the driver, not values read
+from the chamber.
+"""
+
+SIMULATOR_PREFIX = "sim"
+
+
+class ChamberBackend(abc.ABC):
+    """Everything the GUI needs from a chamber
+
+    read_status() returns all live values in one call so callers never issue a
+    separate query per field. When stats is set (see instrumentation), backends
+    time the individual driver queries behind their calls through it.
+    """
+
+    stats = None
+
+    def __init__(self, address, temperature_min, temperature_max):
+        self.address = address
+        self.temperature_min = temperature_min
+        self.temperature_max = temperature_max
+
+    @abc.abstractmethod
+    def connect(self):
+        """Open the connection, raising on failure"""
+
+    def close(self):
+        """Release the connection"""
+
+    @abc.abstractmethod
+    def identity(self):
+        """Return a dict with the static 'id' and 'idn' strings"""
+
+    @abc.abstractmethod
+    def capabilities(self):
+        """Return the ChamberCapabilities of this chamber"""
+
+    @abc.abstractmethod
+    def read_status(self):
+        """Return a ChamberStatus snapshot"""
+
+    @abc.abstractmethod
+    def write_set_point(self, temperature):
+        """Change the temperature set point"""
+
+    @abc.abstractmethod
+    def start(self):
+        """Start running towards the set point"""
+
+    @abc.abstractmethod
+    def stop(self):
+        """Stop the chamber"""
+
+
+class VotschBackend(ChamberBackend):
+    """Backend talking to a real chamber through VotschTechnikClimateChamber
+
+    read_status() costs one driver query, the measured temperature. The set
+    point is read at connect and remembered when written; it is read back
+    only every SET_POINT_REFRESH snapshots to catch changes made on the
+    chamber's own panel. The driver has no alarm query, so alarm is None.
+    """
+
+    SET_POINT_REFRESH = 60
+
+    def __init__(self, address, temperature_min, temperature_max):
+        super().__init__(address, temperature_min, temperature_max)
+        self._chamber = None
+        self._running = False
+        self._set_point = None
+        self._reads = 0
+
+    def connect(self):
+        # Imported here so simulated sessions do not need the driver installed
+        from VotschTechnikClimateChamber.ClimateChamber import ClimateChamber
+        self._chamber = ClimateChamber(self.address, self.temperature_min, self.temperature_max)
+        self._set_point = self._query('temperature_set_point (get)', 'temperature_set_point')
+        self._reads = 0
+
+    def close(self):
+        self._chamber = None
+
+    def identity(self):
+        return {"id": f"{self._chamber.id}", "idn": f"{self._chamber.idn}"}
+
+    def capabilities(self):
+        return ChamberCapabilities(self.temperature_min, self.temperature_max, humidity=False)
+
+    def _query(self, command, attribute):
+        """Read a driver property, timing it when instrumented"""
+        if self.stats is None:
+            return getattr(self._chamber, attribute)
+        return self.stats.call(command, getattr, self._chamber, attribute)
+
+    def read_status(self):
+        measured = self._query('temperature_measured', 'temperature_measured')
+        self._reads += 1
+        if self._reads >= self.SET_POINT_REFRESH:
+            self._reads = 0
+            self._set_point = self._query('temperature_set_point (get)', 'temperature_set_point')
+        return ChamberStatus(time.time(), measured, self._set_point, None, self._running)
+
+    def write_set_point(self, temperature):
+        self._chamber.temperature_set_point = temperature
+        self._set_point = temperature
+
+    def start(self):
+        self._chamber.start()
+        self._running = True
+
+    def stop(self):
+        self._chamber.stop()
+        self._running = False
+
+
+class SimulatedBackend(ChamberBackend):
+    """In-process chamber model for development and performance tests
+
+    The chamber follows a first-order response towards the set point while
+    running and drifts back to ambient when stopped. It reports an alarm
+    while the measured temperature is outside the configured limits.
+    latency and latency_jitter add a delay (seconds) to every call,
+    failure_rate makes calls raise ConnectionError at random, and time_scale
+    speeds up the simulated physics.
+    """
+
+    def __init__(self, address, temperature_min, temperature_max, latency=0.0, latency_jitter=0.0,
+                 failure_rate=0.0, time_scale=1.0, time_constant=120.0, ambient=22.0, noise=0.05):
+        super().__init__(address, temperature_min, temperature_max)
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.failure_rate = failure_rate
+        self.time_scale = time_scale
+        self.time_constant = time_constant
+        self.ambient = ambient
+        self.noise = noise
+
+        self._lock = threading.Lock()
+        self._measured = ambient
+        self._humidity = 45.0
+        self._set_point = ambient
+        self._running = False
+        self._last_update = time.monotonic()
+
+    def _call(self):
+        """Apply the configured latency and failure injection"""
+        delay = self.latency + random.uniform(0, self.latency_jitter) if self.latency_jitter else self.latency
+        if delay > 0:
+            time.sleep(delay)
+        if self.failure_rate and random.random() < self.failure_rate:
+            raise ConnectionError(f"Simulated failure talking to {self.address}")
+
+    def _advance(self):
+        """Integrate the thermal model up to now; caller holds the lock"""
+        now = time.monotonic()
+        dt = (now - self._last_update) * self.time_scale
+        self._last_update = now
+        target = self._set_point if self._running else self.ambient
+        self._measured += (target - self._measured) * (1 - math.exp(-dt / self.time_constant))
+        self._humidity += (45.0 - self._humidity) * (1 - math.exp(-dt / self.time_constant))
+
+    def connect(self):
+        self._call()
+
+    def identity(self):
+        self._call()
+        return {"id": f"SIM-{self.address}", "idn": f"Simulated chamber {self.address}"}
+
+    def capabilities(self):
+        return ChamberCapabilities(self.temperature_min, self.temperature_max, humidity=True)
+
+    def read_status(self):
+        self._call()
+        with self._lock:
+            self._advance()
+            measured = self._measured + random.gauss(0, self.noise) if self.noise else self._measured
+            alarm = not self.temperature_min <= measured <= self.temperature_max
+            return ChamberStatus(time.time(), measured, self._set_point, self._humidity, self._running, alarm)
+
+    def write_set_point(self, temperature):
+        self._call()
+        with self._lock:
+            self._advance()
+            self._set_point = temperature
+
+    def start(self):
+        self._call()
+        with self._lock:
+            self._advance()
+            self._running = True
+
+    def stop(self):
+        self._call()
+        with self._lock:
+            self._advance()
+            self._running = False
+
+
+def is_simulated(address):
+    """True for addresses create_backend opens a SimulatedBackend for"""
+    return address.lower().startswith(SIMULATOR_PREFIX)
+
+
+def create_backend(address, temperature_min, temperature_max, **options):
+    """Pick the backend for an address; addresses starting with 'sim' are simulated"""
+    if is_simulated(address):
+        return SimulatedBackend(address, temperature_min, temperature_max, **options)
+    return VotschBackend(address, temperature_min, temperature_max)
+
+
+def open_backend(address, temperature_min, temperature_max, stats=None, **options):
+    """Create and connect the backend for an address, timing its calls into stats if given"""
+    backend = create_backend(address, temperature_min, temperature_max, **options)
+    if stats is not None:
+        from chamber_gui.instrumentation import InstrumentedBackend
+        backend = InstrumentedBackend(backend, stats)
+    backend.connect()
+    return backend
@@ -0,0 +1,105 @@
+"""Running minimum and maximum over a sliding time window, and axis limits with hysteresis"""
+from collections import deque
+
+import numpy as np
+
+
+class SlidingBounds:
+    """Minimum and maximum of the values pushed since a moving cutoff time
+
+    Two monotonic deques of (time, value): values increase from front to
+    back in the minimum deque and decrease in the maximum deque, so the
+    extremes are always at the front. A new value evicts every entry at the
+    back it makes irrelevant and expire() drops entries older than the window
+    from the front, so each sample costs O(1) amortized. NaN values are
+    ignored.
+    """
+
+    def __init__(self):
+        self._min = deque()
+        self._max = deque()
+
+    @property
+    def minimum(self):
+        return self._min[0][1] if self._min else None
+
+    @property
+    def maximum(self):
+        return self._max[0][1] if self._max else None
+
+    def push(self, time, value):
+        if value != value:
+            return
+        while self._min and self._min[-1][1] >= value:
+            self._min.pop()
+        self._min.append((time, value))
+        while self._max and self._max[-1][1] <= value:
+            self._max.pop()
+        self._max.append((time, value))
+
+    def extend(self, times, values):
+        """Push a batch of samples in time order, vectorized over the batch"""
+        times = np.asarray(times, dtype=np.float64)
+        values = np.asarray(values, dtype=np.float64)
+        valid = ~np.isnan(values)
+        if not valid.any():
+            return
+        times, values = times[valid], values[valid]
+        self._merge(self._min, times, values, 1.0)
+        self._merge(self._max, times, values, -1.0)
+
+    @staticmethod
+    def _merge(entries, times, values, sign):
+        """Append the batch's own monotonic staircase after evicting what it dominates
+
+        With sign -1 the comparisons are mirrored, turning the minimum logic
+        into the maximum one.
+        """
+        signed = values * sign
+        # Lowest signed value from each position to the end of the batch
+        suffix = np.minimum.accumulate(signed[::-1])[::-1]
+        keep = signed < np.append(suffix[1:], np.inf)
+        lowest = suffix[0]
+        while entries and entries[-1][1] * sign >= lowest:
+            entries.pop()
+        entries.extend(zip(times[keep].tolist(), values[keep].tolist()))
+
+    def expire(self, before):
+        """Forget samples older than before"""
+        for entries in (self._min, self._max):
+            while entries and entries[0][0] < before:
+                entries.popleft()
+
+    def clear(self):
+        self._min.clear()
+        self._max.clear()
+
+
+class HysteresisLimits:
+    """Axis limits that follow data bounds but only move when the data leaves them
+
+    New limits are the data range padded by margin (a fraction of the range,
+    at least min_padding). They are recomputed only when the data crosses the
+    current limits or shrinks to less than shrink of the axis span, so small
+    changes in the data never rescale the axis.
+    """
+
+    def __init__(self, margin=0.1, shrink=0.5, min_padding=1.0):
+        self.margin = margin
+        self.shrink = shrink
+        self.min_padding = min_padding
+        self.limits = None
+
+    def update(self, low, high):
+        """New (low, high) limits if the axis has to move, otherwise None"""
+        if self.limits is not None:
+            current_low, current_high = self.limits
+            inside = current_low <= low and high <= current_high
+            if inside and (high - low) >= self.shrink * (current_high - current_low - 2 * self.min_padding):
+                return None
+        padding = max(self.min_padding, self.margin * (high - low))
+        self.limits = (low - padding, high + padding)
+        return self.limits
+
+    def reset(self):
+        self.limits = None
@@ -0,0 +1,26 @@
+"""Rendering budgets trading plot detail for CPU time on slow machines"""
+from collections import namedtuple
+
+RenderBudget = namedtuple("RenderBudget", "name max_fps antialiased gradient pixel_decimation log_flush_ms")
+RenderBudget.__doc__ = """How much CPU the GUI may spend drawing
+
+max_fps caps plot redraws (None for no cap), antialiased and gradient
+switch the smoothed, temperature-colored history line, pixel_decimation
+reduces every line to the axes width in pixels and log_flush_ms is how
+often the log widget is refreshed. Acquisition is never throttled.
+"""
+
+BUDGETS = {
+    "full": RenderBudget("full", max_fps=None, antialiased=True, gradient=True, pixel_decimation=False,
+                         log_flush_ms=100),
+    "low": RenderBudget("low", max_fps=0.5, antialiased=False, gradient=False, pixel_decimation=True,
+                        log_flush_ms=1000),
+}
+DEFAULT_BUDGET = "full"
+
+
+def describe(budget):
+    """Short text for the status bar"""
+    if budget.max_fps is None:
+        return f"Budget: {budget.name}"
+    return f"Budget: {budget.name} ({budget.max_fps:g} fps)"
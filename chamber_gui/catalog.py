@@ -0,0 +1,146 @@
+"""SQLite index of recorded session metadata, searchable without opening any session"""
+import os
+import sqlite3
+import threading
+from collections import namedtuple
+
+from chamber_gui.sessions import DEFAULT_SESSION_DIR, META_FILE, list_sessions, load_meta
+
+CATALOG_VERSION = 3
+DEFAULT_CATALOG_PATH = os.path.join(DEFAULT_SESSION_DIR, "catalog.sqlite3")
+
+FIELDS = ("path", "chamber_ip", "chamber_id", "idn", "profile", "start", "end", "samples",
+          "min_temp", "max_temp", "min_set_point", "max_set_point", "alarm_count", "gap_count")
+SessionInfo = namedtuple("SessionInfo", FIELDS)
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS sessions (
+    {FIELDS[0]} TEXT PRIMARY KEY,
+    {", ".join(FIELDS[1:])},
+    meta_mtime REAL
+);
+CREATE INDEX IF NOT EXISTS sessions_start ON sessions (start);
+CREATE INDEX IF NOT EXISTS sessions_chamber_ip ON sessions (chamber_ip, start);
+CREATE INDEX IF NOT EXISTS sessions_chamber_id ON sessions (chamber_id, start);
+CREATE INDEX IF NOT EXISTS sessions_min_temp ON sessions (min_temp);
+CREATE INDEX IF NOT EXISTS sessions_max_temp ON sessions (max_temp);
+CREATE INDEX IF NOT EXISTS sessions_profile ON sessions (profile);
+CREATE INDEX IF NOT EXISTS sessions_alarm_count ON sessions (alarm_count);
+"""
+
+
+def _escape_like(text):
+    """Make text match literally inside a LIKE pattern using ESCAPE '\\'"""
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+class SessionCatalog:
+    """One row of metadata per recorded session in an indexed SQLite table
+
+    Sessions are added as they close, and sync() picks up sessions recorded
+    elsewhere or before the catalog existed by comparing meta.json
+    modification times, so only new or changed sessions are read. The table
+    is only an index over the session directories: a catalog from another
+    version is dropped and rebuilt by the next sync().
+    """
+
+    def __init__(self, path=DEFAULT_CATALOG_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Queried from the Tk thread, filled from a background sync
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._db:
+            if self._db.execute("PRAGMA user_version").fetchone()[0] != CATALOG_VERSION:
+                self._db.execute("DROP TABLE IF EXISTS sessions")
+                self._db.execute(f"PRAGMA user_version = {CATALOG_VERSION}")
+            self._db.executescript(_SCHEMA)
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+    def _insert(self, meta, meta_mtime):
+        self._db.execute(f"INSERT OR REPLACE INTO sessions ({', '.join(FIELDS)}, meta_mtime) "
+                         f"VALUES ({', '.join('?' * (len(FIELDS) + 1))})",
+                         [meta.get(field) for field in FIELDS] + [meta_mtime])
+
+    def add(self, meta):
+        """Index a session from its metadata, which must include its path"""
+        try:
+            meta_mtime = os.path.getmtime(os.path.join(meta["path"], META_FILE))
+        except OSError:
+            meta_mtime = None
+        with self._lock, self._db:
+            self._insert(meta, meta_mtime)
+
+    def sync(self, directory=DEFAULT_SESSION_DIR):
+        """Index new or changed sessions under directory and forget deleted ones; returns the number read"""
+        with self._lock:
+            known = dict(self._db.execute("SELECT path, meta_mtime FROM sessions"))
+        updates = []
+        present = set()
+        for path in list_sessions(directory):
+            present.add(path)
+            try:
+                meta_mtime = os.path.getmtime(os.path.join(path, META_FILE))
+                if known.get(path) == meta_mtime:
+                    continue
+                updates.append((load_meta(path), meta_mtime))
+            except (OSError, ValueError):
+                continue
+        prefix = os.path.join(directory, "")
+        removed = [path for path in known if path.startswith(prefix) and path not in present]
+        with self._lock, self._db:
+            for meta, meta_mtime in updates:
+                self._insert(meta, meta_mtime)
+            self._db.executemany("DELETE FROM sessions WHERE path = ?", [(path,) for path in removed])
+        return len(updates)
+
+    def query(self, chamber=None, start=None, end=None, below=None, above=None, profile=None, alarms=False,
+              limit=1000):
+        """Sessions matching every given filter, newest first
+
+        chamber matches the end of the chamber IP or ID, so ".21" finds
+        192.168.0.21, start and end bound the session start time, below and
+        above select sessions whose measured temperature reached at most below
+        or at least above, profile matches a part of the profile name and
+        alarms keeps only sessions with at least one alarm.
+        """
+        clauses, params = [], []
+        if chamber:
+            clauses.append("(chamber_ip LIKE ? ESCAPE '\\' OR chamber_id LIKE ? ESCAPE '\\')")
+            params += [f"%{_escape_like(chamber)}"] * 2
+        if start is not None:
+            clauses.append("start >= ?")
+            params.append(start)
+        if end is not None:
+            clauses.append("start <= ?")
+            params.append(end)
+        if below is not None:
+            clauses.append("min_temp <= ?")
+            params.append(below)
+        if above is not None:
+            clauses.append("max_temp >= ?")
+            params.append(above)
+        if profile:
+            clauses.append("profile LIKE ?")
+            params.append(f"%{profile}%")
+        if alarms:
+            clauses.append("alarm_count > 0")
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            rows = self._db.execute(f"SELECT {', '.join(FIELDS)} FROM sessions {where} "
+                                    f"ORDER BY start DESC LIMIT ?", params + [limit]).fetchall()
+        return [SessionInfo(*row) for row in rows]
+
+    def chambers(self):
+        """Chamber IPs with at least one session"""
+        with self._lock:
+            return [row[0] for row in self._db.execute(
+                "SELECT DISTINCT chamber_ip FROM sessions WHERE chamber_ip IS NOT NULL ORDER BY chamber_ip")]
+
+    def close(self):
+        with self._lock:
+            self._db.close()
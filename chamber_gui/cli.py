@@ -0,0 +1,193 @@
+"""Command-line tools for recorded sessions; never imports Tk, and matplotlib only to draw reports
+
+    python -m chamber_gui summarize ~/.votsch_gui/sessions -o summary.csv
+    python -m chamber_gui summarize campaign/ --workers 8 --tolerance 0.5 -o summary.json
+    python -m chamber_gui report campaign/ -o reports/ --format pdf
+    python -m chamber_gui export SESSION -o run.csv --columns time,measured --step 10 --start 3600
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from chamber_gui import analysis, export, report
+from chamber_gui.samples import COLUMN_NAMES
+from chamber_gui.sessions import DEFAULT_SESSION_DIR, META_FILE, list_sessions, load_meta
+
+SUMMARY_FIELDS = ("session", "chamber_ip", "chamber_id", "profile", "segment", "start", "duration_s", "set_point",
+                  "initial", "rise_time_s", "overshoot", "settling_time_s", "steady_state_error",
+                  "ramp_rate_per_min", "time_in_tolerance_s", "time_in_tolerance_pct", "soak_in_tolerance_pct")
+
+
+def _number(value, digits=3):
+    """Rounded float, or None for NaN so it shows up empty in CSV and null in JSON"""
+    value = float(value)
+    return None if value != value else round(value, digits)
+
+
+def summarize_session(path, tolerance=analysis.DEFAULT_TOLERANCE):
+    """Summary rows of the session at path, one per set point segment"""
+    meta = load_meta(path)
+    kpis = analysis.session_kpis(path, tolerance)
+    rows = []
+    for i in range(len(kpis["start"])):
+        duration = kpis["end"][i] - kpis["start"][i]
+        rows.append({"session": os.path.basename(path),
+                     "chamber_ip": meta.get("chamber_ip"),
+                     "chamber_id": meta.get("chamber_id"),
+                     "profile": meta.get("profile"),
+                     "segment": i,
+                     "start": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(kpis["start"][i])),
+                     "duration_s": _number(duration, 1),
+                     "set_point": _number(kpis["set_point"][i], 2),
+                     "initial": _number(kpis["initial"][i], 2),
+                     "rise_time_s": _number(kpis["rise_time"][i], 1),
+                     "overshoot": _number(kpis["overshoot"][i]),
+                     "settling_time_s": _number(kpis["settling_time"][i], 1),
+                     "steady_state_error": _number(kpis["steady_state_error"][i]),
+                     "ramp_rate_per_min": _number(kpis["ramp_rate"][i]),
+                     "time_in_tolerance_s": _number(kpis["time_in_tolerance"][i], 1),
+                     "time_in_tolerance_pct": _number(100 * kpis["time_in_tolerance"][i] / duration
+                                                      if duration > 0 else float("nan"), 1),
+                     "soak_in_tolerance_pct": _number(100 * kpis["soak_in_tolerance"][i], 1)})
+    return rows
+
+
+def summarize(paths, tolerance=analysis.DEFAULT_TOLERANCE, workers=None):
+    """Summarize sessions in a process pool, one task per session
+
+    Yields (path, rows, error) in the order of paths; a session that cannot
+    be read has rows None and the exception as error.
+    """
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [(path, pool.submit(summarize_session, path, tolerance)) for path in paths]
+        for path, future in futures:
+            try:
+                yield path, future.result(), None
+            except (OSError, ValueError, KeyError) as e:
+                yield path, None, e
+
+
+def write_summary(rows, output):
+    """Write summary rows as CSV, or as JSON if output ends in .json; output is a path or a text stream"""
+    if isinstance(output, str):
+        with open(output, "w", newline="", encoding="utf-8") as f:
+            if output.lower().endswith(".json"):
+                json.dump({"exported": time.time(), "segments": rows}, f, indent=2)
+            else:
+                _write_csv(rows, f)
+        return
+    _write_csv(rows, output)
+
+
+def _write_csv(rows, stream):
+    writer = csv.DictWriter(stream, fieldnames=SUMMARY_FIELDS)
+    writer.writeheader()
+    writer.writerows(rows)
+
+
+def _summarize_command(args):
+    paths = list_sessions(args.directory)
+    if not paths:
+        print(f"No sessions found in {args.directory}", file=sys.stderr)
+        return 1
+    started = time.perf_counter()
+    rows = []
+    failed = 0
+    for path, session_rows, error in summarize(paths, args.tolerance, args.workers):
+        if error is not None:
+            failed += 1
+            print(f"{os.path.basename(path)}: {error}", file=sys.stderr)
+            continue
+        rows.extend(session_rows)
+    write_summary(rows, args.output or sys.stdout)
+    print(f"Summarized {len(paths) - failed} of {len(paths)} sessions ({len(rows)} segments) "
+          f"in {time.perf_counter() - started:.2f} s", file=sys.stderr)
+    return 1 if failed else 0
+
+
+def _session_paths(paths):
+    """Session directories given directly or as directories holding sessions"""
+    sessions = []
+    for path in paths:
+        if os.path.isfile(os.path.join(path, META_FILE)):
+            sessions.append(path)
+        else:
+            sessions.extend(list_sessions(path))
+    return sessions
+
+
+def _report_command(args):
+    paths = _session_paths(args.sessions)
+    if not paths:
+        print("No sessions found", file=sys.stderr)
+        return 1
+    started = time.perf_counter()
+    failed = 0
+    for path, output, error in report.export_reports(paths, args.output, args.format, args.tolerance, args.workers):
+        if error is not None:
+            failed += 1
+            print(f"{os.path.basename(path)}: {error}", file=sys.stderr)
+        else:
+            print(output)
+    print(f"Wrote {len(paths) - failed} of {len(paths)} reports in {time.perf_counter() - started:.2f} s",
+          file=sys.stderr)
+    return 1 if failed else 0
+
+
+def _export_command(args):
+    try:
+        meta = load_meta(args.session)
+        columns = [name.strip() for name in args.columns.split(",") if name.strip()]
+        # --start and --end count from the session start
+        start = None if args.start is None else meta["start"] + args.start
+        end = None if args.end is None else meta["start"] + args.end
+        started = time.perf_counter()
+        rows = export.export_session(args.session, args.output, args.format, columns, start, end, args.step)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"{os.path.basename(os.path.normpath(args.session))}: {e}", file=sys.stderr)
+        return 1
+    print(f"Exported {rows} rows to {args.output} in {time.perf_counter() - started:.2f} s", file=sys.stderr)
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m chamber_gui",
+                                     description="Post-process recorded climate chamber sessions")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    summarize_parser = commands.add_parser("summarize", help="KPI summary table of every session in a directory")
+    summarize_parser.add_argument("directory", nargs="?", default=DEFAULT_SESSION_DIR,
+                                  help="directory holding session folders (default: %(default)s)")
+    summarize_parser.add_argument("-o", "--output", help="write to this .csv or .json file instead of stdout")
+    summarize_parser.add_argument("--workers", type=int, help="worker processes (default: one per CPU)")
+    summarize_parser.add_argument("--tolerance", type=float, default=analysis.DEFAULT_TOLERANCE,
+                                  help="band around the set point counted as reached, in °C (default: %(default)s)")
+    summarize_parser.set_defaults(handler=_summarize_command)
+
+    report_parser = commands.add_parser("report", help="HTML or PDF test report of each session")
+    report_parser.add_argument("sessions", nargs="+",
+                               help="session folders, or directories holding session folders")
+    report_parser.add_argument("-o", "--output", default=".", help="directory for the reports (default: %(default)s)")
+    report_parser.add_argument("--format", choices=report.FORMATS, default="html")
+    report_parser.add_argument("--workers", type=int, help="plot rendering processes (default: one per CPU)")
+    report_parser.add_argument("--tolerance", type=float, default=analysis.DEFAULT_TOLERANCE,
+                               help="band around the set point counted as reached, in °C (default: %(default)s)")
+    report_parser.set_defaults(handler=_report_command)
+
+    export_parser = commands.add_parser("export", help="samples of one session as CSV or compressed .npz columns")
+    export_parser.add_argument("session", help="session folder, which may still be recording")
+    export_parser.add_argument("-o", "--output", required=True, help="output .csv or .npz file")
+    export_parser.add_argument("--format", choices=export.FORMATS, help="default: from the output's extension")
+    export_parser.add_argument("--columns", default=",".join(COLUMN_NAMES),
+                               help="comma-separated columns (default: %(default)s)")
+    export_parser.add_argument("--start", type=float, help="seconds from the session start to begin at")
+    export_parser.add_argument("--end", type=float, help="seconds from the session start to stop at")
+    export_parser.add_argument("--step", type=float, help="resample onto a uniform grid of this many seconds")
+    export_parser.set_defaults(handler=_export_command)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
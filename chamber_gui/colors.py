@@ -0,0 +1,59 @@
+"""Temperature to color mapping backed by a precomputed lookup table"""
+from colorsys import hsv_to_rgb
+from functools import lru_cache
+
+
+class TemperatureColorMap:
+    """Blue-to-red HSV gradient over min_temp..max_temp, quantized to resolution °C
+
+    The table is built once per temperature range, so lookups are an index
+    computation. Temperatures outside the range get the end colors.
+    """
+
+    def __init__(self, min_temp, max_temp, resolution=0.1):
+        self.min_temp = min_temp
+        self.max_temp = max_temp
+        self.resolution = resolution
+        self.size = int(round((max_temp - min_temp) / resolution)) + 1
+        self.rgb = [self._gradient(i / (self.size - 1)) for i in range(self.size)]
+        self.hex = [f"#{int(r * 255):02x}{int(g * 255):02x}{int(b * 255):02x}" for r, g, b in self.rgb]
+        self._rgb_array = None
+
+    @staticmethod
+    def _gradient(normalized):
+        hue = 0.66 * (1 - normalized)
+        saturation = 1.0
+        value = 0.7 + 0.3 * normalized
+        return hsv_to_rgb(hue, saturation, value)
+
+    def matches(self, min_temp, max_temp):
+        return self.min_temp == min_temp and self.max_temp == max_temp
+
+    def index(self, temp):
+        if temp != temp:
+            return 0
+        index = int(round((temp - self.min_temp) / self.resolution))
+        return 0 if index < 0 else self.size - 1 if index >= self.size else index
+
+    def color(self, temp):
+        """Hex color string for a temperature"""
+        return self.hex[self.index(temp)]
+
+    def colors(self, temps):
+        """RGB colors (n x 3 float array) for an array of temperatures"""
+        import numpy as np
+        if self._rgb_array is None:
+            self._rgb_array = np.array(self.rgb, dtype=np.float64)
+        temps = np.asarray(temps, dtype=np.float64)
+        indexes = np.rint((temps - self.min_temp) / self.resolution)
+        indexes = np.nan_to_num(indexes, nan=0.0)
+        return self._rgb_array[np.clip(indexes, 0, self.size - 1).astype(np.intp)]
+
+
+@lru_cache(maxsize=1024)
+def adjust_brightness(color_hex, factor):
+    """Scale a hex color's brightness by factor, clipping at white"""
+    r = min(255, int(int(color_hex[1:3], 16) * factor))
+    g = min(255, int(int(color_hex[3:5], 16) * factor))
+    b = min(255, int(int(color_hex[5:7], 16) * factor))
+    return f"#{r:02x}{g:02x}{b:02x}"
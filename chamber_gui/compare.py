@@ -0,0 +1,126 @@
+"""Overlay sessions aligned on an event and measure how far they deviate from a reference"""
+import time
+from collections import namedtuple
+
+import numpy as np
+
+from chamber_gui import analysis, events
+from chamber_gui.samples import decimate_minmax
+from chamber_gui.sessions import load_meta, read_events, read_samples
+
+# Events a comparison can be aligned on
+SESSION_START = "session start"
+RUN_START = "run start"
+FIRST_SET_POINT = "first set point change"
+FIRST_ARRIVAL = "first arrival at set point"
+ALIGNMENTS = (SESSION_START, RUN_START, FIRST_SET_POINT, FIRST_ARRIVAL)
+
+# Points of the common grid, about one per pixel column of a wide plot
+GRID_POINTS = 4000
+
+Comparison = namedtuple("Comparison", "grid values differences segments")
+Comparison.__doc__ = """Traces resampled onto a common aligned grid
+
+grid holds seconds from the alignment event, values and differences one
+row per trace (differences against the reference, NaN where either has no
+data), and segments the reference's set point segments with the
+deviation statistics of every trace in them.
+"""
+
+
+class SessionTrace:
+    """Measured temperature of one session, read through the session's memory map
+
+    Resampling first selects the rows of the requested window by binary
+    search. A window holding many more samples than grid points is reduced
+    with decimate_minmax, as the history plot does, so the overlay keeps
+    every peak and the interpolation runs on about two points per grid point
+    however long the session is.
+    """
+
+    def __init__(self, path, tolerance=analysis.DEFAULT_TOLERANCE):
+        self.path = path
+        self.meta = load_meta(path)
+        records = read_samples(path)
+        self.times = np.asarray(records["time"], dtype=np.float64)
+        self.measured = np.asarray(records["measured"], dtype=np.float64)
+        self.events = read_events(path)
+        self.kpis = analysis.segment_kpis(self.times, records["set_point"], self.measured, tolerance,
+                                          set_point_events=analysis.recorded_set_points(self.events))
+
+    @property
+    def name(self):
+        """Chamber, profile and start time, for legends"""
+        start = self.meta.get("start")
+        parts = (self.meta.get("chamber_id") or self.meta.get("chamber_ip"), self.meta.get("profile"),
+                 time.strftime("%Y-%m-%d %H:%M", time.localtime(start)) if start else None)
+        return " ".join(part for part in parts if part)
+
+    def anchor(self, alignment):
+        """Timestamp of the alignment event, falling back to the session start if it never happened"""
+        start = self.times[0] if len(self.times) else self.meta.get("start", 0.0)
+        if alignment == RUN_START:
+            for record in self.events:
+                if record.get("kind") == events.RUN_STATE and record.get("state") == "started":
+                    return record["time"]
+        elif alignment == FIRST_SET_POINT:
+            # The first segment is the set point the run started with, the profile begins at the next one
+            if len(self.kpis["start"]) > 1:
+                return self.kpis["start"][1]
+        elif alignment == FIRST_ARRIVAL:
+            arrived = np.flatnonzero((self.kpis["arrival_time"] == self.kpis["arrival_time"]) &
+                                     (self.kpis["rise_time"] == self.kpis["rise_time"]))
+            if len(arrived):
+                i = arrived[0]
+                return self.kpis["start"][i] + self.kpis["arrival_time"][i]
+        return start
+
+    def resample(self, grid):
+        """Measured temperature at the sorted timestamps grid, NaN outside the session"""
+        if len(self.times) < 2 or len(grid) == 0:
+            return np.full(len(grid), np.nan)
+        # One row on each side of the window so the edge grid points interpolate too
+        low, high = np.searchsorted(self.times, [grid[0], grid[-1]])
+        low, high = max(low - 1, 0), high + 1
+        times, values = decimate_minmax(self.times[low:high], self.measured[low:high], 2 * len(grid))
+        return np.interp(grid, times, values, left=np.nan, right=np.nan)
+
+
+def compare(traces, reference=0, alignment=SESSION_START, start=None, end=None, points=GRID_POINTS):
+    """Align traces on alignment and resample them between start and end seconds from it
+
+    start and end default to the extent of the reference trace. Deviation
+    statistics (mean, RMS and largest absolute difference against the
+    reference) are computed per set point segment of the reference.
+    """
+    anchors = np.array([trace.anchor(alignment) for trace in traces], dtype=np.float64)
+    base = traces[reference]
+    if start is None:
+        start = base.times[0] - anchors[reference] if len(base.times) else 0.0
+    if end is None:
+        end = base.times[-1] - anchors[reference] if len(base.times) else 0.0
+    grid = np.linspace(start, end, points) if end > start else np.array([start], dtype=np.float64)
+    values = np.vstack([trace.resample(grid + anchor) for trace, anchor in zip(traces, anchors)])
+    differences = values - values[reference]
+
+    # Reference segments in aligned seconds; grid points fall into the segment whose start precedes them
+    segment_starts = base.kpis["start"] - anchors[reference]
+    segment_ends = base.kpis["end"] - anchors[reference]
+    count = len(segment_starts)
+    segment = np.searchsorted(segment_starts, grid, side="right") - 1
+    inside = (segment >= 0) & (grid < segment_ends[np.maximum(segment, 0)]) if count else np.zeros(len(grid), bool)
+    stats = {name: np.full((len(traces), count), np.nan) for name in ("mean", "rms", "max_abs")}
+    for row, difference in enumerate(differences):
+        valid = inside & (difference == difference)
+        which = segment[valid]
+        n = np.bincount(which, minlength=count)
+        total = np.bincount(which, weights=difference[valid], minlength=count)
+        squares = np.bincount(which, weights=difference[valid] ** 2, minlength=count)
+        largest = np.zeros(count)
+        np.maximum.at(largest, which, np.abs(difference[valid]))
+        has = n > 0
+        stats["mean"][row, has] = total[has] / n[has]
+        stats["rms"][row, has] = np.sqrt(squares[has] / n[has])
+        stats["max_abs"][row, has] = largest[has]
+    segments = dict(stats, start=segment_starts, end=segment_ends, set_point=base.kpis["set_point"])
+    return Comparison(grid, values, differences, segments)
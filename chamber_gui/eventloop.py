@@ -0,0 +1,192 @@
+"""Tk event-loop lag monitoring, callback timing, render gating and a sampling profiler"""
+import collections
+import os
+import sys
+import threading
+import time
+
+from chamber_gui.instrumentation import CommandStats
+
+LAG_KEY = "after lag"
+
+
+class LoopLagMonitor:
+    """Measure how late Tk runs after() callbacks and how long named callbacks take
+
+    While enabled, a probe is scheduled every interval_ms and the difference
+    between its scheduled and actual run time is recorded under "after lag".
+    Callbacks wrapped with wrap() are timed under their name. When disabled the
+    probe is not scheduled and wrapped callbacks cost a single flag check.
+    """
+
+    def __init__(self, root, interval_ms=100):
+        self.root = root
+        self.interval_ms = interval_ms
+        self.stats = CommandStats()
+        self.enabled = False
+        self._probe_id = None
+        self._scheduled_at = None
+
+    def wrap(self, name, callback):
+        """Return callback, timed under name while the monitor is enabled"""
+        def timed(*args, **kwargs):
+            if not self.enabled:
+                return callback(*args, **kwargs)
+            return self.stats.call(name, callback, *args, **kwargs)
+        timed.__name__ = getattr(callback, '__name__', name)
+        timed.__doc__ = callback.__doc__
+        return timed
+
+    def start(self):
+        if self.enabled:
+            return
+        self.enabled = True
+        self._schedule()
+
+    def stop(self):
+        self.enabled = False
+        if self._probe_id is not None:
+            self.root.after_cancel(self._probe_id)
+            self._probe_id = None
+
+    def _schedule(self):
+        self._scheduled_at = time.perf_counter() + self.interval_ms / 1000
+        self._probe_id = self.root.after(self.interval_ms, self._probe)
+
+    def _probe(self):
+        self.stats.record(LAG_KEY, max(0.0, time.perf_counter() - self._scheduled_at))
+        if self.enabled:
+            self._schedule()
+
+
+class RenderGate:
+    """Skip redraws while the plot is not visible and estimate the CPU time this saves
+
+    Callers report the CPU cost of each frame they do render; a skipped frame
+    is assumed to cost the running average of those. With max_fps set, frames
+    closer together than 1 / max_fps are held back (see throttle_delay).
+    """
+
+    def __init__(self, smoothing=0.1, max_fps=None):
+        self.smoothing = smoothing
+        self.min_interval = 1.0 / max_fps if max_fps else 0.0
+        self._last_frame = None
+        self.visible = True
+        # Set when a frame was skipped, so the plot needs one catch-up redraw
+        self.stale = False
+        self.frame_cost = None
+        self.skipped = 0
+        self.hidden_since = None
+        self.total_skipped = 0
+        self.total_saved = 0.0
+
+    def record_frame(self, cpu_seconds):
+        if self.frame_cost is None:
+            self.frame_cost = cpu_seconds
+        else:
+            self.frame_cost += self.smoothing * (cpu_seconds - self.frame_cost)
+
+    def throttle_delay(self):
+        """Seconds until the frame rate cap allows the next frame, 0 if it may be drawn now"""
+        if not self.min_interval or self._last_frame is None:
+            return 0.0
+        return max(0.0, self._last_frame + self.min_interval - time.monotonic())
+
+    def should_render(self):
+        """True if a frame should be drawn now, otherwise count it as skipped"""
+        if self.visible:
+            self.stale = False
+            self._last_frame = time.monotonic()
+            return True
+        self.skipped += 1
+        self.stale = True
+        return False
+
+    def set_visible(self, visible):
+        """Update visibility; on becoming visible return (hidden_seconds, skipped, cpu_saved)"""
+        if visible == self.visible:
+            return None
+        self.visible = visible
+        if not visible:
+            self.hidden_since = time.monotonic()
+            self.skipped = 0
+            return None
+        saved = self.skipped * (self.frame_cost or 0.0)
+        self.total_skipped += self.skipped
+        self.total_saved += saved
+        return time.monotonic() - self.hidden_since, self.skipped, saved
+
+
+class SamplingProfiler:
+    """Periodically sample the stack of one thread and summarize where it spends time
+
+    Sampling runs in a background thread using sys._current_frames(), so the
+    profiled thread is not instrumented and nothing runs when no profile is active.
+    """
+
+    def __init__(self, thread_id=None, interval=0.005):
+        self.thread_id = threading.main_thread().ident if thread_id is None else thread_id
+        self.interval = interval
+        self._thread = None
+        self._stop = threading.Event()
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, duration, report_path, on_done=None):
+        """Profile for duration seconds, then write the report to report_path"""
+        if self.running:
+            return False
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(duration, report_path, on_done))
+        self._thread.daemon = True
+        self._thread.start()
+        return True
+
+    def stop(self):
+        """End the current profile early, the report is still written"""
+        self._stop.set()
+
+    def _run(self, duration, report_path, on_done):
+        self_counts = collections.Counter()
+        total_counts = collections.Counter()
+        samples = 0
+        deadline = time.perf_counter() + duration
+        while not self._stop.is_set() and time.perf_counter() < deadline:
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                samples += 1
+                self_counts[self._describe(frame)] += 1
+                seen = set()
+                while frame is not None:
+                    location = self._describe(frame)
+                    if location not in seen:
+                        seen.add(location)
+                        total_counts[location] += 1
+                    frame = frame.f_back
+            time.sleep(self.interval)
+
+        error = None
+        try:
+            with open(report_path, 'w', encoding='utf-8') as f:
+                f.write(self._format(samples, self_counts, total_counts))
+        except OSError as e:
+            error = e
+        if on_done:
+            on_done(report_path, samples, error)
+
+    @staticmethod
+    def _describe(frame):
+        code = frame.f_code
+        return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+    def _format(self, samples, self_counts, total_counts, limit=40):
+        lines = [f"Sampling profile: {samples} samples every {self.interval * 1000:.1f} ms", ""]
+        for title, counts in (("Self time", self_counts), ("Total time (including callees)", total_counts)):
+            lines.append(title)
+            lines.append(f"{'samples':>8} {'%':>6}  function")
+            for location, count in counts.most_common(limit):
+                lines.append(f"{count:8d} {100 * count / max(samples, 1):6.1f}  {location}")
+            lines.append("")
+        return "\n".join(lines)
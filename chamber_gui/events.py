@@ -0,0 +1,143 @@
+"""Structured event records with indexes by time, kind and word"""
+import bisect
+import re
+import threading
+import time
+from collections import namedtuple
+
+EventRecord = namedtuple("EventRecord", "timestamp chamber kind message payload")
+
+# Event kinds used by the GUI
+INFO = "info"
+CONNECTION = "connection"
+SETPOINT = "setpoint"
+RUN_STATE = "run"
+SETTINGS = "settings"
+ERROR = "error"
+DIAGNOSTICS = "diagnostics"
+KINDS = (INFO, CONNECTION, SETPOINT, RUN_STATE, SETTINGS, ERROR, DIAGNOSTICS)
+
+_WORD = re.compile(r"[\w.+-]+")
+
+
+def _words(text):
+    return set(_WORD.findall(text.lower()))
+
+
+class EventStore:
+    """Append-only event store kept in parallel columns
+
+    Rows are numbered in insertion order and timestamps never decrease, so a
+    time range maps to a row range by binary search. Each kind and each word
+    of the message and payload keeps a posting list of row numbers, and a
+    query walks the shortest list that applies, newest first, until it has
+    enough matches.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.timestamps = []
+        self.chambers = []
+        self.kinds = []
+        self.messages = []
+        self.payloads = []
+        self._by_kind = {}
+        self._by_word = {}
+        self._vocabulary = []
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def append(self, kind, message, chamber=None, timestamp=None, **payload):
+        """Store an event and return its row number"""
+        timestamp = time.time() if timestamp is None else timestamp
+        words = _words(message)
+        for key, value in payload.items():
+            words.update(_words(f"{key} {value}"))
+        if chamber:
+            words.update(_words(chamber))
+        with self._lock:
+            if self.timestamps and timestamp < self.timestamps[-1]:
+                # Keep the time column sorted if the wall clock steps back
+                timestamp = self.timestamps[-1]
+            row = len(self.timestamps)
+            self.timestamps.append(timestamp)
+            self.chambers.append(chamber)
+            self.kinds.append(kind)
+            self.messages.append(message)
+            self.payloads.append(payload)
+            self._by_kind.setdefault(kind, []).append(row)
+            for word in words:
+                postings = self._by_word.get(word)
+                if postings is None:
+                    self._by_word[word] = [row]
+                    bisect.insort(self._vocabulary, word)
+                else:
+                    postings.append(row)
+        return row
+
+    def record(self, row):
+        return EventRecord(self.timestamps[row], self.chambers[row], self.kinds[row],
+                           self.messages[row], self.payloads[row])
+
+    def _prefix_lists(self, prefix):
+        """Posting lists of every word starting with prefix"""
+        start = bisect.bisect_left(self._vocabulary, prefix)
+        lists = []
+        for word in self._vocabulary[start:]:
+            if not word.startswith(prefix):
+                break
+            lists.append(self._by_word[word])
+        return lists
+
+    @staticmethod
+    def _contains(lists, row):
+        """True if row is in any of the sorted posting lists"""
+        for rows in lists:
+            i = bisect.bisect_left(rows, row)
+            if i < len(rows) and rows[i] == row:
+                return True
+        return False
+
+    def query(self, kinds=None, text=None, start=None, end=None, chamber=None, limit=1000):
+        """Return up to limit matching records, newest first
+
+        kinds is a collection of kinds, text is a whitespace separated list of
+        word prefixes that must all appear, start/end bound the timestamp.
+        """
+        with self._lock:
+            low = 0 if start is None else bisect.bisect_left(self.timestamps, start)
+            high = len(self.timestamps) if end is None else bisect.bisect_right(self.timestamps, end)
+            if low >= high:
+                return []
+
+            # Each condition is a union of sorted posting lists; kinds are checked per row directly
+            kinds = set(kinds) if kinds else None
+            word_conditions = [self._prefix_lists(prefix) for prefix in sorted(_words(text))] if text else []
+            conditions = list(word_conditions)
+            if kinds:
+                conditions.append([self._by_kind.get(kind, []) for kind in kinds])
+
+            # Walk the most selective condition and check the others per row
+            others = []
+            if conditions:
+                shortest = min(conditions, key=lambda lists: sum(len(rows) for rows in lists))
+                others = [lists for lists in word_conditions if lists is not shortest]
+                walk = shortest[0] if len(shortest) == 1 else sorted(set().union(*shortest))
+                first = bisect.bisect_left(walk, low)
+                last = bisect.bisect_left(walk, high)
+                rows = (walk[i] for i in range(last - 1, first - 1, -1))
+            else:
+                rows = iter(range(high - 1, low - 1, -1))
+
+            results = []
+            for row in rows:
+                if kinds is not None and self.kinds[row] not in kinds:
+                    continue
+                if chamber is not None and self.chambers[row] != chamber:
+                    continue
+                if all(self._contains(lists, row) for lists in others):
+                    results.append(self.record(row))
+                    if len(results) >= limit:
+                        break
+            return results
@@ -0,0 +1,150 @@
+"""Streaming CSV and compressed columnar exports of recorded sessions
+
+Samples are read from the memory-mapped samples.bin a chunk of records at
+a time, so memory stays bounded by the chunk size however long the
+session is. The record count is taken once when an export starts: a
+session that is still recording exports the samples written so far.
+"""
+import os
+import zipfile
+
+import numpy as np
+
+from chamber_gui.samples import COLUMN_NAMES
+from chamber_gui.sessions import SAMPLE_DTYPE, read_samples
+
+FORMATS = ("csv", "npz")
+# Records read per chunk, about 2.5 MB of samples.bin
+CHUNK_RECORDS = 1 << 16
+
+_CSV_FORMATS = {"time": "%.3f", "status": "%d"}
+
+
+def _format_of(output, fmt):
+    if fmt is None:
+        fmt = "npz" if str(output).lower().endswith(".npz") else "csv"
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format {fmt!r}, expected one of {', '.join(FORMATS)}")
+    return fmt
+
+
+def _check_columns(columns):
+    columns = tuple(columns)
+    unknown = [name for name in columns if name not in COLUMN_NAMES]
+    if unknown or not columns:
+        raise ValueError(f"Unknown columns {', '.join(unknown) or '(none)'}, expected some of "
+                         f"{', '.join(COLUMN_NAMES)}")
+    return columns
+
+
+class SessionExport:
+    """Selected columns of a session between start and end, optionally resampled every step seconds
+
+    start and end are timestamps and default to the whole session. With a
+    step, rows are placed on the uniform grid start, start + step, ...
+    within the recorded data: status holds the last sample at or before each
+    grid point and every other column is interpolated linearly, so a gap
+    (NaN) row makes the grid points next to it NaN as well.
+    """
+
+    def __init__(self, path, columns=COLUMN_NAMES, start=None, end=None, step=None, chunk=CHUNK_RECORDS):
+        if step is not None and not step > 0:
+            raise ValueError("Resampling step must be a positive number of seconds")
+        self.columns = _check_columns(columns)
+        self.step = step
+        self.chunk = max(int(chunk), 2)
+        self._records = read_samples(path)
+        # Binary search on the memory map only touches a few pages
+        times = self._records["time"]
+        self._low = 0 if start is None else int(np.searchsorted(times, start, side="left"))
+        self._high = len(times) if end is None else int(np.searchsorted(times, end, side="right"))
+        self._high = max(self._high, self._low)
+        if step is None or self._high == self._low:
+            self.rows = self._high - self._low
+            self._grid_start = None
+        else:
+            first, last = float(times[self._low]), float(times[self._high - 1])
+            self._grid_start = first if start is None else max(float(start), first)
+            self.rows = int(np.floor((last - self._grid_start) / step)) + 1 if last >= self._grid_start else 0
+
+    def dtype(self, name):
+        """Little-endian dtype of an exported column"""
+        return SAMPLE_DTYPE[name]
+
+    def chunks(self, columns=None):
+        """Yield dicts of column arrays, together self.rows rows long"""
+        columns = self.columns if columns is None else _check_columns(columns)
+        if self.step is None:
+            for low in range(self._low, self._high, self.chunk):
+                records = self._records[low:min(low + self.chunk, self._high)]
+                yield {name: np.array(records[name]) for name in columns}
+            return
+
+        emitted = 0
+        for low in range(self._low, self._high, self.chunk):
+            # Overlap one record with the previous chunk so grid points between chunks interpolate too
+            records = self._records[low - 1 if low > self._low else low:min(low + self.chunk, self._high)]
+            times = np.asarray(records["time"], dtype=np.float64)
+            count = min(int(np.floor((times[-1] - self._grid_start) / self.step)) + 1, self.rows) - emitted
+            if count <= 0:
+                continue
+            grid = self._grid_start + self.step * np.arange(emitted, emitted + count)
+            emitted += count
+            chunk = {}
+            for name in columns:
+                if name == "time":
+                    chunk[name] = grid
+                elif name == "status":
+                    held = np.maximum(np.searchsorted(times, grid, side="right") - 1, 0)
+                    chunk[name] = np.asarray(records["status"])[held]
+                else:
+                    chunk[name] = np.interp(grid, times, np.asarray(records[name], dtype=np.float64))
+            yield chunk
+
+    def write_csv(self, stream):
+        """Write a header line and the rows as CSV to a text stream"""
+        stream.write(",".join(self.columns) + "\n")
+        formats = [_CSV_FORMATS.get(name, "%.6g") for name in self.columns]
+        for chunk in self.chunks():
+            np.savetxt(stream, np.column_stack([chunk[name] for name in self.columns]), fmt=formats, delimiter=",")
+
+    def write_npz(self, stream):
+        """Write the columns as a compressed .npz archive that np.load reads, one pass per column
+
+        Each column is a .npy member streamed into the archive chunk by
+        chunk; its header can be written up front because the row count is
+        known before reading.
+        """
+        with zipfile.ZipFile(stream, "w", zipfile.ZIP_DEFLATED) as archive:
+            for name in self.columns:
+                dtype = self.dtype(name)
+                with archive.open(name + ".npy", "w", force_zip64=True) as member:
+                    np.lib.format.write_array_header_1_0(member, {"descr": np.lib.format.dtype_to_descr(dtype),
+                                                                  "fortran_order": False, "shape": (self.rows,)})
+                    for chunk in self.chunks((name,)):
+                        member.write(np.ascontiguousarray(chunk[name], dtype=dtype).tobytes())
+
+
+def export_session(path, output, fmt=None, columns=COLUMN_NAMES, start=None, end=None, step=None,
+                   chunk=CHUNK_RECORDS):
+    """Export the session at path to the file output and return the number of rows written
+
+    fmt is "csv" or "npz" and defaults to the output's extension. The file
+    is written under a temporary name and renamed when complete.
+    """
+    fmt = _format_of(output, fmt)
+    export = SessionExport(path, columns, start, end, step, chunk)
+    tmp_path = output + ".tmp"
+    try:
+        if fmt == "csv":
+            with open(tmp_path, "w", newline="", encoding="utf-8") as f:
+                export.write_csv(f)
+        else:
+            with open(tmp_path, "wb") as f:
+                export.write_npz(f)
+        os.replace(tmp_path, output)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return export.rows
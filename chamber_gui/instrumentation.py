@@ -0,0 +1,178 @@
+"""Per-command latency histograms for chamber I/O"""
+import csv
+import json
+import socket
+import threading
+import time
+
+from chamber_gui.backends import ChamberBackend
+
+PERCENTILES = (50, 95, 99)
+
+
+class LatencyHistogram:
+    """Log-linear histogram of latencies in the spirit of HdrHistogram
+
+    Values are recorded in microseconds. Below 2**sub_bucket_bits they are kept
+    exactly; above that every power of two is split into 2**(sub_bucket_bits - 1)
+    buckets, so the relative error stays under 2**-(sub_bucket_bits - 1).
+    Recording is O(1) and memory only grows with the number of distinct buckets.
+    """
+
+    def __init__(self, sub_bucket_bits=6):
+        self.sub_bucket_bits = sub_bucket_bits
+        self._sub_count = 1 << sub_bucket_bits
+        self._half = self._sub_count >> 1
+        self._counts = {}
+        self.count = 0
+        self.total_us = 0
+        self.min_us = None
+        self.max_us = None
+
+    def _index(self, value):
+        if value < self._sub_count:
+            return value
+        shift = value.bit_length() - self.sub_bucket_bits
+        return self._sub_count + (shift - 1) * self._half + (value >> shift) - self._half
+
+    def _bucket_value(self, index):
+        """Midpoint of the value range covered by a bucket"""
+        if index < self._sub_count:
+            return index
+        shift, offset = divmod(index - self._sub_count, self._half)
+        shift += 1
+        low = (offset + self._half) << shift
+        return low + ((1 << shift) - 1) / 2
+
+    def record(self, seconds):
+        value = max(0, int(seconds * 1e6))
+        index = self._index(value)
+        self._counts[index] = self._counts.get(index, 0) + 1
+        self.count += 1
+        self.total_us += value
+        self.min_us = value if self.min_us is None else min(self.min_us, value)
+        self.max_us = value if self.max_us is None else max(self.max_us, value)
+
+    def percentile(self, percent):
+        """Latency in microseconds below which percent of the samples fall"""
+        if not self.count:
+            return None
+        threshold = self.count * percent / 100
+        seen = 0
+        for index in sorted(self._counts):
+            seen += self._counts[index]
+            if seen >= threshold:
+                return max(self.min_us, min(self._bucket_value(index), self.max_us))
+        return self.max_us
+
+    def buckets(self):
+        """List of (bucket value in microseconds, count) pairs"""
+        return [(self._bucket_value(index), self._counts[index]) for index in sorted(self._counts)]
+
+
+class CommandStats:
+    """Latency histograms plus timeout and error counters per chamber command"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self._timeouts = {}
+        self._errors = {}
+
+    def record(self, command, seconds, error=None):
+        with self._lock:
+            histogram = self._histograms.get(command)
+            if histogram is None:
+                histogram = self._histograms[command] = LatencyHistogram()
+                self._timeouts[command] = 0
+                self._errors[command] = 0
+            histogram.record(seconds)
+            if isinstance(error, (socket.timeout, TimeoutError)):
+                self._timeouts[command] += 1
+            elif error is not None:
+                self._errors[command] += 1
+
+    def call(self, command, function, *args, **kwargs):
+        """Run function(*args, **kwargs), recording its latency under command"""
+        start = time.perf_counter()
+        try:
+            result = function(*args, **kwargs)
+        except Exception as e:
+            self.record(command, time.perf_counter() - start, e)
+            raise
+        self.record(command, time.perf_counter() - start)
+        return result
+
+    def summary(self):
+        """One dict per command with counts and p50/p95/p99/max latencies in milliseconds"""
+        rows = []
+        with self._lock:
+            for command in sorted(self._histograms):
+                histogram = self._histograms[command]
+                row = {'command': command, 'count': histogram.count,
+                       'timeouts': self._timeouts[command], 'errors': self._errors[command],
+                       'mean_ms': histogram.total_us / histogram.count / 1e3,
+                       'max_ms': histogram.max_us / 1e3}
+                for percent in PERCENTILES:
+                    row[f'p{percent}_ms'] = histogram.percentile(percent) / 1e3
+                rows.append(row)
+        return rows
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._timeouts.clear()
+            self._errors.clear()
+
+    def export(self, path):
+        """Write the statistics to path, as CSV if it ends in .csv and JSON otherwise"""
+        rows = self.summary()
+        if path.lower().endswith('.csv'):
+            fields = ['command', 'count', 'timeouts', 'errors', 'mean_ms'] + \
+                     [f'p{percent}_ms' for percent in PERCENTILES] + ['max_ms']
+            with open(path, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.DictWriter(f, fieldnames=fields)
+                writer.writeheader()
+                writer.writerows(rows)
+            return
+        with self._lock:
+            buckets = {command: histogram.buckets() for command, histogram in self._histograms.items()}
+        for row in rows:
+            row['histogram_us'] = buckets[row['command']]
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'exported': time.time(), 'commands': rows}, f, indent=2)
+
+
+class InstrumentedBackend(ChamberBackend):
+    """Wraps a backend so every call is timed into a CommandStats"""
+
+    def __init__(self, backend, stats):
+        super().__init__(backend.address, backend.temperature_min, backend.temperature_max)
+        self.backend = backend
+        self.stats = stats
+        # Lets backends that issue several driver queries per call time them individually
+        backend.stats = stats
+
+    def connect(self):
+        return self.stats.call('connect', self.backend.connect)
+
+    def close(self):
+        return self.backend.close()
+
+    def identity(self):
+        return self.stats.call('identity', self.backend.identity)
+
+    def capabilities(self):
+        return self.backend.capabilities()
+
+    def read_status(self):
+        return self.stats.call('read_status', self.backend.read_status)
+
+    def write_set_point(self, temperature):
+        return self.stats.call('temperature_set_point (set)', self.backend.write_set_point, temperature)
+
+    def start(self):
+        return self.stats.call('start', self.backend.start)
+
+    def stop(self):
+        return self.stats.call('stop', self.backend.stop)
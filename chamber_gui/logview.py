@@ -0,0 +1,86 @@
+"""Bounded log buffer with batched Tk rendering and a rotating log file"""
+import logging
+import logging.handlers
+import os
+import queue
+import time
+import tkinter as tk
+from collections import deque
+
+DEFAULT_LOG_PATH = os.path.join(os.path.expanduser("~"), ".votsch_gui", "logs", "chamber_gui.log")
+
+
+class BatchedLogView:
+    """Keep recent log records in a ring and show them in a Text widget
+
+    append() only queues the line; the widget is updated by one insert per
+    flush, at most every flush_interval_ms, and trimmed to max_lines so inserts
+    stay cheap on multi-day runs. The full history goes to a rotating file
+    written by a background thread. append() must be called on the Tk thread.
+    """
+
+    def __init__(self, root, text_widget, max_records=10000, max_lines=2000, flush_interval_ms=100,
+                 log_path=DEFAULT_LOG_PATH, max_bytes=5 * 1024 * 1024, backup_count=5):
+        self.root = root
+        self.text = text_widget
+        self.records = deque(maxlen=max_records)
+        self.max_lines = max_lines
+        self.flush_interval_ms = flush_interval_ms
+        self._pending = []
+        self._flush_id = None
+        self._lines = int(self.text.index('end-1c').split('.')[0]) - 1
+
+        self._logger = logging.getLogger("votsch_gui.log_view.%d" % id(self))
+        self._logger.setLevel(logging.INFO)
+        self._logger.propagate = False
+        self._listener = None
+        if log_path:
+            try:
+                os.makedirs(os.path.dirname(log_path), exist_ok=True)
+                file_handler = logging.handlers.RotatingFileHandler(
+                    log_path, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8')
+            except OSError:
+                file_handler = None
+            if file_handler is not None:
+                file_handler.setFormatter(logging.Formatter('%(asctime)s %(message)s'))
+                log_queue = queue.SimpleQueue()
+                self._logger.addHandler(logging.handlers.QueueHandler(log_queue))
+                self._listener = logging.handlers.QueueListener(log_queue, file_handler)
+                self._listener.start()
+
+    def append(self, message):
+        """Record a line and schedule it for display"""
+        self.records.append((time.time(), message))
+        self._pending.append(message)
+        if self._listener is not None:
+            self._logger.info(message)
+        if self._flush_id is None:
+            self._flush_id = self.root.after(self.flush_interval_ms, self.flush)
+
+    def flush(self):
+        """Write pending lines to the widget in one insert and drop the oldest lines"""
+        self._flush_id = None
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        # Lines older than the widget limit would be trimmed straight away
+        pending = pending[-self.max_lines:]
+        text = "\n".join(pending) + "\n"
+        self.text.insert(tk.END, text)
+        # A record can span several lines, e.g. a multi-line error message
+        self._lines += text.count("\n")
+        excess = self._lines - self.max_lines
+        if excess > 0:
+            self.text.delete('1.0', f'{excess + 1}.0')
+            self._lines -= excess
+        self.text.see(tk.END)
+
+    def close(self):
+        """Flush outstanding lines and stop the file writer"""
+        if self._flush_id is not None:
+            self.root.after_cancel(self._flush_id)
+            self._flush_id = None
+        self.flush()
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
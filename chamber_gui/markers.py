@@ -0,0 +1,159 @@
+"""Set point changes and run intervals indexed on the sample time axis"""
+import bisect
+import threading
+from collections import namedtuple
+
+SetPointMarker = namedtuple("SetPointMarker", "timestamp value sample")
+RunInterval = namedtuple("RunInterval", "start end start_sample end_sample")
+
+
+class MarkerIndex:
+    """Sorted set point markers and run intervals
+
+    Both are appended in time order, so the markers in a visible time range
+    are found by binary search on the timestamp columns. Run intervals never
+    overlap, which keeps their end times sorted as well; the open interval of
+    a running chamber has end None and counts as ending in the future.
+    """
+
+    _COLUMNS = ("set_point_times", "set_point_values", "set_point_samples",
+                "run_starts", "run_ends", "run_start_samples", "run_end_samples")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # Bumped on every change so a plot can skip redrawing unchanged markers
+        self.version = 0
+        self.set_point_times = []
+        self.set_point_values = []
+        self.set_point_samples = []
+        self.run_starts = []
+        self.run_ends = []
+        self.run_start_samples = []
+        self.run_end_samples = []
+
+    def _timestamp(self, column, timestamp):
+        """Clamp timestamp so the column stays sorted if the wall clock steps back"""
+        if column and timestamp < column[-1]:
+            return column[-1]
+        return timestamp
+
+    @property
+    def running(self):
+        return bool(self.run_ends) and self.run_ends[-1] is None
+
+    def add_set_point(self, timestamp, value, sample=None):
+        """Mark a set point change at timestamp, sample being the store index it precedes"""
+        with self._lock:
+            self.set_point_times.append(self._timestamp(self.set_point_times, timestamp))
+            self.set_point_values.append(value)
+            self.set_point_samples.append(sample)
+            self.version += 1
+
+    def start_run(self, timestamp, sample=None):
+        """Open a run interval, ignored if one is already open"""
+        with self._lock:
+            if self.running:
+                return
+            self.run_starts.append(self._timestamp(self.run_starts, timestamp))
+            self.run_ends.append(None)
+            self.run_start_samples.append(sample)
+            self.run_end_samples.append(None)
+            self.version += 1
+
+    def stop_run(self, timestamp, sample=None):
+        """Close the open run interval, ignored if there is none"""
+        with self._lock:
+            if not self.running:
+                return
+            self.run_ends[-1] = max(timestamp, self.run_starts[-1])
+            self.run_end_samples[-1] = sample
+            self.version += 1
+
+    def _set_point_range(self, start, end):
+        low = bisect.bisect_left(self.set_point_times, start)
+        high = bisect.bisect_right(self.set_point_times, end)
+        return low, high
+
+    def _run_range(self, start, end):
+        # Only the last interval can be open, every closed end is sorted
+        closed = len(self.run_ends) - 1 if self.running else len(self.run_ends)
+        low = bisect.bisect_left(self.run_ends, start, 0, closed)
+        high = bisect.bisect_right(self.run_starts, end)
+        return low, high
+
+    def set_points_between(self, start, end):
+        """Set point markers with start <= timestamp <= end"""
+        with self._lock:
+            low, high = self._set_point_range(start, end)
+            return [SetPointMarker(*marker) for marker in zip(self.set_point_times[low:high],
+                                                              self.set_point_values[low:high],
+                                                              self.set_point_samples[low:high])]
+
+    def set_point_columns(self, start, end):
+        """Timestamps and values of the set point markers with start <= timestamp <= end"""
+        with self._lock:
+            low, high = self._set_point_range(start, end)
+            return self.set_point_times[low:high], self.set_point_values[low:high]
+
+    def set_point_at(self, timestamp):
+        """The set point marker in effect at timestamp, or None"""
+        with self._lock:
+            i = bisect.bisect_right(self.set_point_times, timestamp) - 1
+            if i < 0:
+                return None
+            return SetPointMarker(self.set_point_times[i], self.set_point_values[i], self.set_point_samples[i])
+
+    def runs_between(self, start, end):
+        """Run intervals overlapping [start, end]"""
+        with self._lock:
+            low, high = self._run_range(start, end)
+            return [RunInterval(*interval) for interval in zip(self.run_starts[low:high],
+                                                               self.run_ends[low:high],
+                                                               self.run_start_samples[low:high],
+                                                               self.run_end_samples[low:high])]
+
+    def run_columns(self, start, end):
+        """Start and end timestamps of the run intervals overlapping [start, end]
+
+        The end of an open interval is reported as end.
+        """
+        with self._lock:
+            low, high = self._run_range(start, end)
+            ends = self.run_ends[low:high]
+            if ends and ends[-1] is None:
+                ends[-1] = end
+            return self.run_starts[low:high], ends
+
+    def trim_before(self, timestamp):
+        """Forget markers and closed runs that end before timestamp"""
+        with self._lock:
+            # Keep the last set point before timestamp, it is still in effect
+            drop = max(0, bisect.bisect_left(self.set_point_times, timestamp) - 1)
+            closed = len(self.run_ends) - 1 if self.running else len(self.run_ends)
+            drop_runs = bisect.bisect_left(self.run_ends, timestamp, 0, closed)
+            if not drop and not drop_runs:
+                return
+            for column in (self.set_point_times, self.set_point_values, self.set_point_samples):
+                del column[:drop]
+            for column in (self.run_starts, self.run_ends, self.run_start_samples, self.run_end_samples):
+                del column[:drop_runs]
+            self.version += 1
+
+    def snapshot(self):
+        """Copy of every column, picklable for another process"""
+        with self._lock:
+            return self.version, {name: list(getattr(self, name)) for name in self._COLUMNS}
+
+    def restore(self, snapshot):
+        """Replace the contents with a snapshot() of another index"""
+        version, columns = snapshot
+        with self._lock:
+            for name in self._COLUMNS:
+                setattr(self, name, list(columns[name]))
+            self.version = version
+
+    def clear(self):
+        with self._lock:
+            for name in self._COLUMNS:
+                getattr(self, name).clear()
+            self.version += 1
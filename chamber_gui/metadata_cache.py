@@ -0,0 +1,101 @@
+"""On-disk cache of chamber metadata keyed by chamber IP address"""
+import json
+import os
+import threading
+import time
+
+CACHE_VERSION = 2
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".votsch_gui", "chamber_cache.json")
+
+# Fields that never change while a chamber stays at the same address
+STATIC_FIELDS = ("id", "idn")
+# Limits configured in the GUI when the chamber was last connected, the driver cannot report its own
+LIMIT_FIELDS = ("configured_min", "configured_max")
+STATE_FIELDS = ("temperature_set_point", "temperature_measured", "is_running")
+
+
+class ChamberMetadataCache:
+    """Small JSON cache holding identity, limits and last known state per chamber"""
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_age=30 * 24 * 3600):
+        self.path = path
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._entries = self._load()
+
+    def _load(self):
+        """Read the cache file, dropping it if it is unreadable or from another version"""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get("version") != CACHE_VERSION:
+            return {}
+        entries = data.get("chambers", {})
+        return {ip: entry for ip, entry in entries.items() if self._is_valid(entry)}
+
+    @staticmethod
+    def _is_valid(entry):
+        """Check that an entry has the expected shape"""
+        if not isinstance(entry, dict):
+            return False
+        if not all(isinstance(entry.get(field), str) and entry.get(field) for field in STATIC_FIELDS):
+            return False
+        limits = [entry.get(field) for field in LIMIT_FIELDS]
+        if not all(isinstance(value, (int, float)) for value in limits) or limits[0] >= limits[1]:
+            return False
+        return isinstance(entry.get("updated"), (int, float))
+
+    def get(self, ip):
+        """Return a copy of the cached entry for ip, or None if missing or stale"""
+        with self._lock:
+            entry = self._entries.get(ip)
+            if entry is None:
+                return None
+            if time.time() - entry["updated"] > self.max_age:
+                del self._entries[ip]
+                return None
+            return dict(entry)
+
+    def validate(self, ip, identity):
+        """Compare fresh identity fields with the cache, dropping the entry on mismatch"""
+        with self._lock:
+            entry = self._entries.get(ip)
+            if entry is None:
+                return False
+            if all(entry.get(field) == identity.get(field) for field in STATIC_FIELDS):
+                return True
+            del self._entries[ip]
+            return False
+
+    def update(self, ip, **fields):
+        """Merge fields into the entry for ip"""
+        with self._lock:
+            entry = self._entries.setdefault(ip, {})
+            entry.update(fields)
+            entry["updated"] = time.time()
+
+    def update_state(self, ip, **state):
+        """Record last known state for an already cached chamber"""
+        with self._lock:
+            entry = self._entries.get(ip)
+            if entry is None:
+                return
+            entry.update({key: value for key, value in state.items() if key in STATE_FIELDS})
+            entry["updated"] = time.time()
+
+    def save(self):
+        """Write the cache atomically so a crash never leaves a truncated file"""
+        with self._lock:
+            data = {"version": CACHE_VERSION,
+                    "chambers": {ip: entry for ip, entry in self._entries.items() if self._is_valid(entry)}}
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            # The cache only speeds up reconnects, losing it is harmless
+            pass
@@ -0,0 +1,323 @@
+"""Temperature history plot: gradient line, set point, humidity and event markers"""
+import numpy as np
+from matplotlib.collections import LineCollection, PolyCollection
+from matplotlib.lines import Line2D
+from matplotlib.patches import Patch
+
+from chamber_gui.bounds import HysteresisLimits, SlidingBounds
+from chamber_gui.samples import MinMaxPyramid
+
+
+class GradientLine:
+    """Line colored per segment by temperature, rebuilt from each frame's points
+
+    The plot hands it a series already reduced to about one point per pixel
+    column (see MinMaxPyramid.fetch), so rebuilding every segment costs the
+    same whatever the length of the history and no per-sample state is kept.
+    """
+
+    def __init__(self, ax, color_map, linewidth=2, antialiased=True):
+        self.color_map = color_map
+        self.collection = LineCollection([], linewidths=linewidth, antialiaseds=antialiased, capstyle='round')
+        ax.add_collection(self.collection, autolim=False)
+        # Mid-segment temperatures, kept to recolor without rebuilding
+        self._mid = np.empty(0)
+
+    def set_data(self, x, y):
+        """Replace all data"""
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        if len(x) < 2:
+            self.clear()
+            return
+        points = np.column_stack((x, y))
+        self.collection.set_segments(np.stack((points[:-1], points[1:]), axis=1))
+        self._mid = (y[:-1] + y[1:]) / 2
+        self.collection.set_color(self.color_map.colors(self._mid))
+
+    def clear(self):
+        self.collection.set_segments([])
+        self._mid = np.empty(0)
+
+    def set_color_map(self, color_map):
+        """Recolor the line with a new color map"""
+        self.color_map = color_map
+        if len(self._mid):
+            self.collection.set_color(self.color_map.colors(self._mid))
+
+
+class EventMarkers:
+    """Set point lines and shaded run intervals for the visible part of a MarkerIndex
+
+    Markers are drawn as one line collection and one polygon collection
+    spanning the full axes height. The visible range is split into
+    max_markers slots (about one per pixel column); set point lines sharing
+    a slot collapse into one and runs separated by less than a slot merge,
+    so thousands of cycles draw no slower than a screenful. Set point lines
+    are labelled with their value when no more than max_labels are shown.
+    """
+
+    def __init__(self, ax, set_point_color='#FFD166', run_color='#4CAF50', max_markers=400,
+                 max_labels=20, antialiased=True):
+        self.ax = ax
+        self.max_markers = max_markers
+        self.max_labels = max_labels
+        transform = ax.get_xaxis_transform()
+        self.run_regions = PolyCollection([], facecolors=run_color, edgecolors='none', alpha=0.12,
+                                          antialiaseds=antialiased, transform=transform, zorder=0)
+        self.set_point_lines = LineCollection([], colors=set_point_color, linewidths=1, alpha=0.5,
+                                              antialiaseds=antialiased, transform=transform, zorder=1)
+        ax.add_collection(self.run_regions, autolim=False)
+        ax.add_collection(self.set_point_lines, autolim=False)
+        self.labels = []
+        self.label_color = set_point_color
+        self._drawn = None
+
+    def _label(self, i):
+        """Reuse the text artists between frames"""
+        while len(self.labels) <= i:
+            self.labels.append(self.ax.text(0, 0.98, '', transform=self.ax.get_xaxis_transform(),
+                                            color=self.label_color, fontsize=7, rotation=90,
+                                            ha='right', va='top', clip_on=True))
+        return self.labels[i]
+
+    def update(self, index, origin, start, end, scale=60):
+        """Show the markers between timestamps start and end
+
+        The x axis counts (timestamp - origin) / scale, minutes by default.
+        """
+        key = (index.version, origin, start, end)
+        if key == self._drawn:
+            return
+        self._drawn = key
+
+        times, values = index.set_point_columns(start, end)
+        run_starts, run_ends = index.run_columns(start, end)
+        slot = max(end - start, 1e-9) / self.max_markers
+
+        # Keep the last set point of every slot
+        times = np.array(times, dtype=np.float64)
+        values = np.array(values, dtype=np.float64)
+        if len(times):
+            slots = ((times - start) // slot).astype(np.int64)
+            keep = np.append(slots[1:] != slots[:-1], True)
+            times, values = times[keep], values[keep]
+        x = (times - origin) / scale
+        segments = np.empty((len(x), 2, 2))
+        segments[:, :, 0] = x[:, None]
+        segments[:, 0, 1] = 0
+        segments[:, 1, 1] = 1
+        self.set_point_lines.set_segments(segments)
+
+        # Merge runs whose gap is shorter than a slot
+        run_starts = np.clip(np.array(run_starts, dtype=np.float64), start, end)
+        run_ends = np.clip(np.array(run_ends, dtype=np.float64), start, end)
+        if len(run_starts):
+            split = np.flatnonzero(run_starts[1:] - run_ends[:-1] >= slot) + 1
+            run_starts = run_starts[np.append(0, split)]
+            run_ends = run_ends[np.append(split - 1, len(run_ends) - 1)]
+        x0 = (run_starts - origin) / scale
+        x1 = (run_ends - origin) / scale
+        verts = np.empty((len(x0), 4, 2))
+        verts[:, :, 0] = np.column_stack((x0, x1, x1, x0))
+        verts[:, :, 1] = (0, 0, 1, 1)
+        self.run_regions.set_verts(verts)
+
+        # Label the lines only when they are too sparse to overlap
+        shown = 0 if len(x) > self.max_labels else len(x)
+        for i in range(shown):
+            label = self._label(i)
+            label.set_x(x[i])
+            label.set_text(f"{values[i]:.1f} °C")
+            label.set_visible(True)
+        for label in self.labels[shown:]:
+            label.set_visible(False)
+
+    def clear(self):
+        self.set_point_lines.set_segments([])
+        self.run_regions.set_verts([])
+        for label in self.labels:
+            label.set_visible(False)
+        self._drawn = None
+
+
+class HistoryPlot:
+    """The temperature history axes of a figure, fed from a SampleStore and a MarkerIndex
+
+    Used both by the Tk canvas and by the render worker process. The x axis
+    counts minutes from origin and shows the window of a Viewport. Every line
+    is fetched for that window from a min/max pyramid over the store, so a
+    frame costs about the same whether it shows ten minutes or a week. With
+    gradient off the measured history is a plain line; with pixel_decimation
+    every line is reduced to the axes width in pixels. With autoscale the
+    temperature axis follows the visible temperatures, rescaling only when
+    they leave the hysteresis margins; a live window keeps its bounds in
+    sliding trackers fed with the new rows only.
+    """
+
+    # Most points handed to the plain lines per frame
+    MAX_LINE_POINTS = 2000
+
+    def __init__(self, fig, color_map, min_temp, max_temp, card_color='#1E1E1E', text_color='#FFFFFF',
+                 gradient=True, antialiased=True, pixel_decimation=False):
+        self.fig = fig
+        self.pixel_decimation = pixel_decimation
+        self.ax = fig.add_subplot(111)
+        self.ax.set_facecolor('#2E2E2E')
+
+        # Customize plot appearance
+        self.ax.grid(True, linestyle='--', alpha=0.3, color='#555555')
+        self.ax.set_xlabel('Time (minutes)', color=text_color)
+        self.ax.set_ylabel('Temperature (°C)', color=text_color)
+        self.ax.set_title('Temperature Profile', color=text_color)
+        self.ax.tick_params(colors=text_color)
+        for spine in self.ax.spines.values():
+            spine.set_edgecolor('#555555')
+
+        # Measured history colored per segment by temperature, set point as a step line
+        self.gradient_line = None
+        self.measured_line = None
+        if gradient:
+            self.gradient_line = GradientLine(self.ax, color_map, antialiased=antialiased)
+        else:
+            self.measured_line, = self.ax.plot([], [], color=color_map.color(25), linewidth=2,
+                                               antialiased=antialiased)
+        self.set_point_line, = self.ax.plot([], [], color='#BBBBBB', linestyle='--', linewidth=1,
+                                            drawstyle='steps-post', antialiased=antialiased, label='Set point')
+        self.event_markers = EventMarkers(self.ax, antialiased=antialiased,
+                                          max_markers=self._max_points() if pixel_decimation else 400)
+
+        # Humidity on a secondary axis
+        self.humidity_ax = self.ax.twinx()
+        self.humidity_ax.set_ylim(0, 100)
+        self.humidity_ax.set_ylabel('Humidity (%)', color='#66B2FF')
+        self.humidity_ax.tick_params(colors='#66B2FF')
+        for spine in self.humidity_ax.spines.values():
+            spine.set_edgecolor('#555555')
+        self.humidity_line, = self.humidity_ax.plot([], [], color='#66B2FF', linewidth=1, alpha=0.8,
+                                                    antialiased=antialiased, label='Humidity')
+
+        measured_proxy = Line2D([], [], color=color_map.color(25), linewidth=2, label='Measured')
+        running_proxy = Patch(facecolor='#4CAF50', alpha=0.3, label='Running')
+        self.ax.legend(handles=[measured_proxy, self.set_point_line, self.humidity_line, running_proxy],
+                       loc='upper left', fontsize=8, facecolor=card_color, edgecolor='#555555',
+                       labelcolor=text_color)
+
+        self.autoscale = False
+        self.y_limits = HysteresisLimits()
+        # Running bounds of the live window, per temperature column
+        self.live_bounds = {name: SlidingBounds() for name in ('measured', 'set_point')}
+        self._bounds_row = None
+        self._bounds_span = None
+        self.set_temperature_range(min_temp, max_temp)
+        self.pyramid = None
+        # Timestamps at the left and right edge of the axes as last drawn
+        self.time_limits = None
+        self._xlim = None
+
+    def set_temperature_range(self, min_temp, max_temp):
+        self.temperature_range = (min_temp, max_temp)
+        if not self.autoscale:
+            self.ax.set_ylim(min_temp - 5, max_temp + 5)
+
+    def set_autoscale(self, enabled):
+        """Fit the temperature axis to the visible data, or go back to the chamber range"""
+        self.autoscale = enabled
+        self.y_limits.reset()
+        if not enabled:
+            self.set_temperature_range(*self.temperature_range)
+
+    def set_color_map(self, color_map):
+        if self.gradient_line is not None:
+            self.gradient_line.set_color_map(color_map)
+
+    def axes_extent(self):
+        """Left and right pixel column of the axes, counted from the left of the figure"""
+        return self.ax.bbox.x0, self.ax.bbox.x1
+
+    def _max_points(self):
+        """Points per plain line: the axes width in pixels when decimating to pixels"""
+        if self.pixel_decimation:
+            # Min/max decimation emits two points per bucket
+            return max(2, 2 * int(self.ax.bbox.width))
+        return self.MAX_LINE_POINTS
+
+    def _live_bounds(self, samples, start, span):
+        """(low, high) of the temperatures since start; the trackers only see rows added since the last frame"""
+        if span != self._bounds_span or self._bounds_row is None or self._bounds_row < samples.offset:
+            for bounds in self.live_bounds.values():
+                bounds.clear()
+            self._bounds_span = span
+            self._bounds_row = samples.index_of_time(start)
+        times, measured, set_point = samples.columns('time', 'measured', 'set_point', start=self._bounds_row)
+        self._bounds_row += len(times)
+        lows, highs = [], []
+        for name, values in (('measured', measured), ('set_point', set_point)):
+            bounds = self.live_bounds[name]
+            bounds.extend(times, values)
+            bounds.expire(start)
+            if bounds.minimum is not None:
+                lows.append(bounds.minimum)
+                highs.append(bounds.maximum)
+        if not lows:
+            return None
+        return min(lows), max(highs)
+
+    def _autoscale(self, bounds):
+        if bounds is None:
+            return
+        limits = self.y_limits.update(*bounds)
+        if limits is not None:
+            self.ax.set_ylim(*limits)
+
+    def update(self, samples, markers, origin, viewport=None):
+        """Bring the artists up to date with samples and markers for the viewport's window"""
+        first_time = samples.first('time')
+        if first_time is None:
+            return
+        last_time = samples.last('time')
+        start, end = (first_time, last_time) if viewport is None else viewport.limits(first_time, last_time)
+        markers.trim_before(first_time)
+
+        # Rows of the window plus one on each side so lines run to the edges
+        if self.pyramid is None or self.pyramid.store is not samples:
+            self.pyramid = MinMaxPyramid(samples)
+        first_row = max(samples.offset, samples.index_of_time(start) - 1)
+        last_row = min(samples.total, samples.index_of_time(end) + 1)
+        max_points = self._max_points()
+
+        def fetch(name):
+            times, values = self.pyramid.fetch(name, first_row, last_row, max_points)
+            return (times - origin) / 60, values
+
+        measured = fetch('measured')
+        set_point = fetch('set_point')
+        if self.gradient_line is not None:
+            self.gradient_line.set_data(*measured)
+        else:
+            self.measured_line.set_data(*measured)
+        self.set_point_line.set_data(*set_point)
+        self.humidity_line.set_data(*fetch('humidity'))
+
+        if self.autoscale:
+            if viewport is None or viewport.follow_live:
+                self._autoscale(self._live_bounds(samples, start, None if viewport is None else viewport.span))
+            else:
+                # A fixed window does not slide, its fetched min/max points already bound it
+                values = np.concatenate((measured[1], set_point[1]))
+                if np.isfinite(values).any():
+                    self._autoscale((np.nanmin(values), np.nanmax(values)))
+
+        if self.pixel_decimation:
+            self.event_markers.max_markers = max(1, int(self.ax.bbox.width))
+        self.event_markers.update(markers, origin, max(start, first_time), min(end, last_time))
+
+        # Only touch the axis limits when they move; a live window leaves some room on the right
+        left = (start - origin) / 60
+        right = (end - origin) / 60 + (0.5 if viewport is None or viewport.follow_live else 0)
+        if right <= left:
+            right = left + 0.5
+        if (left, right) != self._xlim:
+            self.ax.set_xlim(left, right)
+            self._xlim = (left, right)
+            self.time_limits = (origin + left * 60, origin + right * 60)
@@ -0,0 +1,214 @@
+"""History plot rendering in a worker process, handing frames back through shared memory"""
+import copy
+import multiprocessing
+import queue
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from chamber_gui.budget import BUDGETS, DEFAULT_BUDGET
+from chamber_gui.markers import MarkerIndex
+from chamber_gui.sample_ring import SharedSampleRing, attach_shared_memory
+from chamber_gui.samples import SampleStore
+
+
+def _render_main(ring_name, frame_name, max_width, max_height, options, requests, frames):
+    """Child process loop: render the newest request into the frame block and report it"""
+    import matplotlib
+    matplotlib.use('Agg')
+    from matplotlib import style
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    from chamber_gui.colors import TemperatureColorMap
+    from chamber_gui.plotting import HistoryPlot
+
+    ring = SharedSampleRing.attach(ring_name)
+    frame_block = attach_shared_memory(frame_name)
+    frame = np.ndarray((max_height * max_width * 4,), dtype=np.uint8, buffer=frame_block.buf)
+
+    style.use('dark_background')
+    dpi = options['dpi']
+    fig = Figure(figsize=(max_width / dpi, max_height / dpi), dpi=dpi, facecolor=options['card_color'])
+    canvas = FigureCanvasAgg(fig)
+    min_temp, max_temp = options['temperature_range']
+    budget = options['budget']
+    plot = HistoryPlot(fig, TemperatureColorMap(min_temp, max_temp), min_temp, max_temp,
+                       options['card_color'], options['text_color'], gradient=budget.gradient,
+                       antialiased=budget.antialiased, pixel_decimation=budget.pixel_decimation)
+    samples = SampleStore()
+    markers = MarkerIndex()
+    seq = 0
+    size = None
+    try:
+        while True:
+            request = requests.get()
+            # Only the newest request is worth rendering
+            while request is not None:
+                try:
+                    request = requests.get_nowait()
+                except queue.Empty:
+                    break
+            if request is None:
+                break
+
+            started = time.perf_counter()
+            started_cpu = time.process_time()
+            seq, rows, _ = ring.copy_since(seq)
+            samples.extend(rows)
+            if request.get('markers') is not None:
+                markers.restore(request['markers'])
+            if request.get('temperature_range') is not None:
+                min_temp, max_temp = request['temperature_range']
+                plot.set_color_map(TemperatureColorMap(min_temp, max_temp))
+                plot.set_temperature_range(min_temp, max_temp)
+            if request.get('autoscale') is not None:
+                plot.set_autoscale(request['autoscale'])
+            width = min(max(request['width'], 1), max_width)
+            height = min(max(request['height'], 1), max_height)
+            if (width, height) != size:
+                fig.set_size_inches(width / dpi, height / dpi)
+                size = (width, height)
+
+            plot.update(samples, markers, request['origin'], request['viewport'])
+            canvas.draw()
+            pixels = np.asarray(canvas.buffer_rgba())
+            height, width = pixels.shape[:2]
+            frame[:pixels.size] = pixels.reshape(-1)
+            frames.put((request['frame'], width, height, time.perf_counter() - started,
+                        time.process_time() - started_cpu, plot.axes_extent(), plot.time_limits))
+    finally:
+        del frame
+        frame_block.close()
+        ring.close()
+
+
+class RenderProcess:
+    """Owns the render child process, the sample ring it reads and the frame block it fills
+
+    The GUI publishes samples into the ring and asks for frames with
+    request(). At most one frame is in flight: a request made while the
+    worker is busy is only remembered, and sent once the current frame has
+    been collected, so the worker always renders the newest state and the
+    GUI only ever displays finished frames.
+    """
+
+    def __init__(self, origin, temperature_range, card_color='#1E1E1E', text_color='#FFFFFF', dpi=80,
+                 max_width=2560, max_height=1600, capacity=65536, budget=BUDGETS[DEFAULT_BUDGET]):
+        self.origin = origin
+        self.max_width = max_width
+        self.max_height = max_height
+        self.ring = SharedSampleRing.create(capacity)
+        self.frame_block = shared_memory.SharedMemory(create=True, size=max_width * max_height * 4)
+        # Spawned so the GUI's threads and Tk state are never forked
+        context = multiprocessing.get_context('spawn')
+        self._requests = context.Queue()
+        self._frames = context.Queue()
+        options = {'dpi': dpi, 'card_color': card_color, 'text_color': text_color,
+                   'temperature_range': temperature_range, 'budget': budget}
+        self._process = context.Process(
+            target=_render_main,
+            args=(self.ring.name, self.frame_block.name, max_width, max_height, options,
+                  self._requests, self._frames),
+            daemon=True)
+        self._frame_id = 0
+        self._in_flight = False
+        self._pending = None
+        self._markers_version = None
+        self._temperature_range = None
+        self._autoscale = None
+        self.frames_rendered = 0
+        self.frames_dropped = 0
+        self.last_render_time = None
+        self.last_render_cpu = None
+        # Axes pixel columns and the timestamps at its edges in the last frame, for mapping clicks
+        self.axes_extent = None
+        self.time_limits = None
+
+    def start(self):
+        self._process.start()
+
+    @property
+    def alive(self):
+        """False once the worker has exited, after which no frame will ever arrive"""
+        return self._process.is_alive()
+
+    @property
+    def exitcode(self):
+        return self._process.exitcode
+
+    def publish(self, rows):
+        """Make sample rows available to the worker (single writer only)"""
+        if len(rows):
+            self.ring.extend(rows)
+
+    def set_temperature_range(self, min_temp, max_temp):
+        """Recolor and rescale the plot with the next frame"""
+        self._temperature_range = (min_temp, max_temp)
+
+    def set_autoscale(self, enabled):
+        """Fit the temperature axis to the visible data from the next frame on"""
+        self._autoscale = enabled
+
+    def request(self, width, height, markers, viewport=None):
+        """Ask for a frame of width x height pixels; returns False if it had to wait"""
+        if self._pending is not None:
+            # Replaced by a newer request before the worker got to it
+            self.frames_dropped += 1
+        self._pending = (width, height, markers, viewport)
+        if self._in_flight:
+            return False
+        self._send()
+        return True
+
+    def _send(self):
+        width, height, markers, viewport = self._pending
+        self._pending = None
+        # The queue pickles in a background thread, so hand it a copy the GUI will not change
+        request = {'frame': self._frame_id, 'width': width, 'height': height, 'origin': self.origin,
+                   'viewport': copy.copy(viewport)}
+        if markers.version != self._markers_version:
+            request['markers'] = markers.snapshot()
+            self._markers_version = markers.version
+        if self._temperature_range is not None:
+            request['temperature_range'], self._temperature_range = self._temperature_range, None
+        if self._autoscale is not None:
+            request['autoscale'], self._autoscale = self._autoscale, None
+        self._frame_id += 1
+        self._in_flight = True
+        self._requests.put(request)
+
+    def poll(self):
+        """Return the newest finished frame as an RGBA array of shape (height, width, 4), or None
+
+        Check alive when this keeps returning None: a worker that crashed
+        leaves its frame in flight forever.
+        """
+        if not self._in_flight:
+            return None
+        try:
+            _, width, height, render_time, render_cpu, self.axes_extent, self.time_limits = \
+                self._frames.get_nowait()
+        except queue.Empty:
+            return None
+        self._in_flight = False
+        self.frames_rendered += 1
+        self.last_render_time = render_time
+        self.last_render_cpu = render_cpu
+        # Copy out before the next request lets the worker overwrite the block
+        pixels = np.ndarray((height, width, 4), dtype=np.uint8, buffer=self.frame_block.buf).copy()
+        if self._pending is not None:
+            self._send()
+        return pixels
+
+    def stop(self, timeout=2.0):
+        """Stop the child and release the shared blocks"""
+        self._requests.put(None)
+        self._process.join(timeout)
+        if self._process.is_alive():
+            self._process.terminate()
+            self._process.join()
+        self.ring.close()
+        self.frame_block.close()
+        self.frame_block.unlink()
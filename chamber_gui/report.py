@@ -0,0 +1,304 @@
+"""Self-contained HTML or PDF test reports of recorded sessions
+
+A report holds the session metadata, an overview plot, the KPI table, one
+plot per set point segment and the event log. The plots are rendered with
+Agg in a process pool, all of them in parallel; assembling the document
+afterwards only embeds the finished images, so the calling process never
+draws a plot itself.
+"""
+import base64
+import html
+import io
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from chamber_gui import analysis
+from chamber_gui.samples import decimate_minmax
+from chamber_gui.sessions import load_meta, read_events, read_samples
+
+FORMATS = ("html", "pdf")
+# Points per plotted line, enough for a page-wide figure
+PLOT_POINTS = 3000
+PLOT_SIZE = (10.0, 3.2)
+PLOT_DPI = 110
+PAGE_SIZE = (8.27, 11.69)
+EVENTS_PER_PAGE = 55
+
+MEASURED_COLOR = "#D9534F"
+SET_POINT_COLOR = "#555555"
+BAND_COLOR = "#5CB85C"
+
+
+def _time_text(timestamp):
+    return "-" if timestamp is None else time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(timestamp))
+
+
+def _number_text(value, digits=2, unit=""):
+    if value is None or value != value:
+        return "-"
+    return f"{value:.{digits}f}{unit}"
+
+
+def render_plot(path, start, end, title, tolerance=None, boundaries=(), size=PLOT_SIZE, dpi=PLOT_DPI):
+    """PNG bytes of the measured temperature and set point of a session between start and end
+
+    Runs in the worker processes. tolerance draws the band around the set
+    point, boundaries marks timestamps such as segment starts.
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    records = read_samples(path)
+    times = records["time"]
+    # The sample at end already belongs to the next segment
+    low, high = np.searchsorted(times, [start, end])
+    minutes = (np.asarray(times[low:high], dtype=np.float64) - start) / 60
+
+    fig = Figure(figsize=size, dpi=dpi, facecolor="white")
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot(111)
+    set_point = np.asarray(records["set_point"][low:high], dtype=np.float64)
+    if tolerance is not None:
+        band_x, band_y = decimate_minmax(minutes, set_point, PLOT_POINTS)
+        ax.fill_between(band_x, band_y - tolerance, band_y + tolerance, color=BAND_COLOR, alpha=0.2,
+                        linewidth=0, step="post", label=f"±{tolerance:g} °C")
+    ax.plot(*decimate_minmax(minutes, set_point, PLOT_POINTS), color=SET_POINT_COLOR, linestyle="--",
+            linewidth=1, drawstyle="steps-post", label="Set point")
+    ax.plot(*decimate_minmax(minutes, records["measured"][low:high], PLOT_POINTS), color=MEASURED_COLOR,
+            linewidth=1.2, label="Measured")
+    for boundary in boundaries:
+        ax.axvline((boundary - start) / 60, color="#999999", linewidth=0.6, linestyle=":")
+    ax.set_xlim(0, max((end - start) / 60, 1e-3))
+    ax.set_title(title, fontsize=10)
+    ax.set_xlabel("Time (minutes)", fontsize=9)
+    ax.set_ylabel("Temperature (°C)", fontsize=9)
+    ax.tick_params(labelsize=8)
+    ax.grid(True, linestyle="--", alpha=0.4)
+    ax.legend(loc="best", fontsize=8)
+    fig.tight_layout()
+
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png")
+    return buffer.getvalue()
+
+
+def _plot_jobs(meta, kpis, tolerance):
+    """(title, args) of every plot of a report: the overview, then one per segment"""
+    path = meta["path"]
+    end = meta.get("end") or (kpis["end"][-1] if len(kpis["end"]) else meta["start"])
+    jobs = [("Overview", (path, meta["start"], end, "Whole session", None, tuple(kpis["start"][1:])))]
+    for i in range(len(kpis["start"])):
+        title = f"Segment {i + 1}: {_number_text(kpis['set_point'][i], 1, ' °C')}"
+        jobs.append((title, (path, kpis["start"][i], kpis["end"][i], title, tolerance)))
+    return jobs
+
+
+def prepare(path, pool, tolerance=analysis.DEFAULT_TOLERANCE):
+    """Start rendering the plots of the session at path on pool; pass the result to write()"""
+    meta = load_meta(path)
+    kpis = analysis.session_kpis(path, tolerance)
+    plots = [(title, pool.submit(render_plot, *args)) for title, args in _plot_jobs(meta, kpis, tolerance)]
+    return {"meta": meta, "kpis": kpis, "events": read_events(path), "tolerance": tolerance, "plots": plots}
+
+
+KPI_HEADERS = ("#", "Start", "Duration (min)", "Set point (°C)", "Initial (°C)", "Rise time (s)", "Overshoot (°C)",
+               "Settling (s)", "Steady-state error (°C)", "Ramp rate (°C/min)", "Soak in tolerance (%)")
+
+
+def _kpi_rows(kpis):
+    """Formatted KPI table, one row per segment"""
+    rows = []
+    for i in range(len(kpis["start"])):
+        soak = kpis["soak_in_tolerance"][i]
+        rows.append((str(i + 1),
+                     _time_text(kpis["start"][i]),
+                     _number_text((kpis["end"][i] - kpis["start"][i]) / 60, 1),
+                     _number_text(kpis["set_point"][i], 1),
+                     _number_text(kpis["initial"][i], 1),
+                     _number_text(kpis["rise_time"][i], 0),
+                     _number_text(kpis["overshoot"][i], 2),
+                     _number_text(kpis["settling_time"][i], 0),
+                     _number_text(kpis["steady_state_error"][i], 3),
+                     _number_text(kpis["ramp_rate"][i], 2),
+                     _number_text(soak * 100 if soak == soak else soak, 1)))
+    return rows
+
+
+def _meta_rows(meta, tolerance):
+    return (("Chamber", f"{meta.get('chamber_id') or '-'} ({meta.get('chamber_ip') or '-'})"),
+            ("Identification", meta.get("idn") or "-"),
+            ("Profile", meta.get("profile") or "-"),
+            ("Start", _time_text(meta.get("start"))),
+            ("End", _time_text(meta.get("end"))),
+            ("Samples", str(meta.get("samples", 0))),
+            ("Measured range", f"{_number_text(meta.get('min_temp'), 1)} to {_number_text(meta.get('max_temp'), 1)} °C"),
+            ("Alarms", str(meta.get("alarm_count", 0))),
+            ("Data gaps", str(meta.get("gap_count", 0))),
+            ("Tolerance", f"±{tolerance:g} °C"))
+
+
+def _event_rows(records):
+    rows = []
+    for record in records:
+        details = ", ".join(f"{key}={value}" for key, value in record.items() if key not in ("time", "kind"))
+        rows.append((_time_text(record.get("time")), str(record.get("kind", "")), details))
+    return rows
+
+
+def _table_html(headers, rows):
+    head = "".join(f"<th>{html.escape(header)}</th>" for header in headers)
+    body = "".join("<tr>" + "".join(f"<td>{html.escape(cell)}</td>" for cell in row) + "</tr>" for row in rows)
+    return f"<table><thead><tr>{head}</tr></thead><tbody>{body}</tbody></table>"
+
+
+_STYLE = """
+body { font-family: Helvetica, Arial, sans-serif; margin: 2em; color: #222; }
+h1 { font-size: 1.6em; } h2 { font-size: 1.25em; margin-top: 1.6em; border-bottom: 1px solid #ccc; }
+table { border-collapse: collapse; font-size: 0.85em; margin: 0.5em 0; }
+th, td { border: 1px solid #ccc; padding: 3px 8px; text-align: left; }
+th { background: #f0f0f0; }
+img { max-width: 100%; }
+"""
+
+
+def _write_html(report, plots, output):
+    meta = report["meta"]
+    title = f"Climate chamber test report - {os.path.basename(meta['path'])}"
+    parts = [f"<!DOCTYPE html><html><head><meta charset='utf-8'><title>{html.escape(title)}</title>"
+             f"<style>{_STYLE}</style></head><body>",
+             f"<h1>{html.escape(title)}</h1>",
+             "<table>" + "".join(f"<tr><th>{html.escape(name)}</th><td>{html.escape(value)}</td></tr>"
+                                 for name, value in _meta_rows(meta, report["tolerance"])) + "</table>"]
+    images = [(plot_title, base64.b64encode(png).decode("ascii")) for plot_title, png in plots]
+    kpi_rows = _kpi_rows(report["kpis"])
+    parts.append(f"<img alt='Overview' src='data:image/png;base64,{images[0][1]}'>")
+    parts.append("<h2>Key performance indicators</h2>")
+    parts.append(_table_html(KPI_HEADERS, kpi_rows))
+    for (plot_title, data), row in zip(images[1:], kpi_rows):
+        parts.append(f"<h2>{html.escape(plot_title)}</h2>")
+        parts.append(f"<img alt='{html.escape(plot_title)}' src='data:image/png;base64,{data}'>")
+        parts.append(_table_html(KPI_HEADERS[1:], [row[1:]]))
+    parts.append("<h2>Event log</h2>")
+    parts.append(_table_html(("Time", "Kind", "Details"), _event_rows(report["events"])))
+    parts.append(f"<p><small>Generated {html.escape(_time_text(time.time()))}</small></p></body></html>")
+    with open(output, "w", encoding="utf-8") as f:
+        f.write("\n".join(parts))
+
+
+def _write_pdf(report, plots, output):
+    from matplotlib.backends.backend_pdf import PdfPages
+    from matplotlib.figure import Figure
+    from matplotlib.image import imread
+
+    def table(fig, rect, headers, rows, font_size=7):
+        ax = fig.add_axes(rect)
+        ax.axis("off")
+        if rows:
+            cells = ax.table(cellText=[list(row) for row in rows], colLabels=list(headers) if headers else None,
+                             loc="upper center", cellLoc="left")
+            cells.auto_set_font_size(False)
+            cells.set_fontsize(font_size)
+        return ax
+
+    def image(fig, rect, png):
+        ax = fig.add_axes(rect)
+        ax.axis("off")
+        ax.imshow(imread(io.BytesIO(png), format="png"))
+
+    meta = report["meta"]
+    kpi_rows = _kpi_rows(report["kpis"])
+    with PdfPages(output) as pdf:
+        fig = Figure(figsize=PAGE_SIZE, facecolor="white")
+        fig.text(0.08, 0.95, f"Climate chamber test report - {os.path.basename(meta['path'])}", fontsize=13)
+        table(fig, (0.08, 0.62, 0.84, 0.3), None, _meta_rows(meta, report["tolerance"]), font_size=9)
+        image(fig, (0.05, 0.42, 0.9, 0.34), plots[0][1])
+        pdf.savefig(fig)
+
+        # KPI table, 30 segments per page
+        for first in range(0, max(len(kpi_rows), 1), 30):
+            fig = Figure(figsize=PAGE_SIZE, facecolor="white")
+            fig.text(0.05, 0.95, "Key performance indicators", fontsize=12)
+            table(fig, (0.02, 0.05, 0.96, 0.88), KPI_HEADERS, kpi_rows[first:first + 30], font_size=5)
+            pdf.savefig(fig)
+
+        # Three segment plots per page, each with its KPI row
+        segment_plots = plots[1:]
+        for first in range(0, len(segment_plots), 3):
+            fig = Figure(figsize=PAGE_SIZE, facecolor="white")
+            for slot, (plot_title, png) in enumerate(segment_plots[first:first + 3]):
+                top = 0.96 - slot * 0.32
+                image(fig, (0.05, top - 0.24, 0.9, 0.24), png)
+                table(fig, (0.03, top - 0.3, 0.94, 0.05), KPI_HEADERS[1:], [kpi_rows[first + slot][1:]], font_size=5)
+            pdf.savefig(fig)
+
+        event_rows = _event_rows(report["events"])
+        for first in range(0, max(len(event_rows), 1), EVENTS_PER_PAGE):
+            fig = Figure(figsize=PAGE_SIZE, facecolor="white")
+            fig.text(0.05, 0.95, "Event log", fontsize=12)
+            table(fig, (0.05, 0.05, 0.9, 0.88), ("Time", "Kind", "Details"),
+                  event_rows[first:first + EVENTS_PER_PAGE], font_size=6)
+            pdf.savefig(fig)
+
+
+def write(report, output, fmt=None):
+    """Wait for the plots of a prepare()d report and write it to output as HTML or PDF"""
+    fmt = fmt or ("pdf" if output.lower().endswith(".pdf") else "html")
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown report format: {fmt}")
+    plots = [(title, future.result()) for title, future in report["plots"]]
+    if fmt == "pdf":
+        _write_pdf(report, plots, output)
+    else:
+        _write_html(report, plots, output)
+    return output
+
+
+def render_pool(workers=None):
+    """Process pool for the plots; spawned so a GUI's threads and Tk state are never forked"""
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+
+
+def export_report(path, output, fmt=None, tolerance=analysis.DEFAULT_TOLERANCE, workers=None):
+    """Write the report of the session at path to output, rendering its plots in parallel"""
+    with render_pool(workers) as pool:
+        return write(prepare(path, pool, tolerance), output, fmt)
+
+
+def export_reports(paths, output_dir, fmt="html", tolerance=analysis.DEFAULT_TOLERANCE, workers=None):
+    """Write one report per session into output_dir, yielding (path, output, error) in order
+
+    The plots of the next few sessions, about two per worker, are queued
+    ahead of the report being written, so the workers stay busy across
+    sessions while only that many sessions' images are held in memory.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    lookahead = 2 * (workers or os.cpu_count() or 1)
+
+    with render_pool(workers) as pool:
+        def queue(path):
+            try:
+                return path, prepare(path, pool, tolerance), None
+            except (OSError, ValueError, KeyError) as e:
+                return path, None, e
+
+        def finish(path, report, error):
+            if error is not None:
+                return path, None, error
+            output = os.path.join(output_dir, f"{os.path.basename(os.path.normpath(path))}.{fmt}")
+            try:
+                return path, write(report, output, fmt), None
+            except (OSError, ValueError, KeyError) as e:
+                return path, None, e
+
+        pending = deque()
+        for path in paths:
+            pending.append(queue(path))
+            if len(pending) > lookahead:
+                yield finish(*pending.popleft())
+        while pending:
+            yield finish(*pending.popleft())
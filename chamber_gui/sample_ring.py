@@ -0,0 +1,139 @@
+"""Single-writer sample ring buffer in shared memory"""
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from chamber_gui.samples import COLUMN_NAMES
+
+FIELDS = COLUMN_NAMES
+
+# Header layout (int64): write sequence, capacity, number of fields and one
+# reserved word that keeps the rows 32-byte aligned
+_HEADER_WORDS = 4
+_SEQ, _CAPACITY, _NFIELDS = 0, 1, 2
+
+
+def attach_shared_memory(name):
+    """Open a shared memory block created by another process without taking over its cleanup"""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Before Python 3.13 attaching also registers the block, which is harmless
+        # for multiprocessing children since they share the creator's resource tracker
+        return shared_memory.SharedMemory(name=name)
+
+
+class SharedSampleRing:
+    """Fixed-capacity ring of float64 sample rows shared between processes
+
+    The writer fills a row and only then advances the sequence counter, so a
+    reader that sees sequence n can safely view rows up to n. read_since gives
+    numpy views straight onto the shared block; a reader using them compares
+    oldest_intact() with the first sequence afterwards to check the writer did
+    not lap it while it was looking. copy_since does that check itself for
+    readers that keep the rows.
+    """
+
+    def __init__(self, shm, owner):
+        self.shm = shm
+        self.owner = owner
+        self._header = np.ndarray((_HEADER_WORDS,), dtype=np.int64, buffer=shm.buf)
+        self.capacity = int(self._header[_CAPACITY])
+        self.n_fields = int(self._header[_NFIELDS])
+        self._rows = np.ndarray((self.capacity, self.n_fields), dtype=np.float64,
+                                buffer=shm.buf, offset=_HEADER_WORDS * 8)
+
+    @classmethod
+    def create(cls, capacity, n_fields=len(FIELDS)):
+        """Allocate a new ring; the creator is responsible for unlinking it"""
+        size = _HEADER_WORDS * 8 + capacity * n_fields * 8
+        shm = shared_memory.SharedMemory(create=True, size=size)
+        header = np.ndarray((_HEADER_WORDS,), dtype=np.int64, buffer=shm.buf)
+        header[:] = 0
+        header[_CAPACITY] = capacity
+        header[_NFIELDS] = n_fields
+        del header
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name):
+        """Open a ring created by another process"""
+        return cls(attach_shared_memory(name), owner=False)
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    @property
+    def seq(self):
+        """Total number of rows written so far"""
+        return int(self._header[_SEQ])
+
+    def append(self, row):
+        """Write one row and publish it (single writer only)"""
+        seq = int(self._header[_SEQ])
+        self._rows[seq % self.capacity] = row
+        self._header[_SEQ] = seq + 1
+
+    def extend(self, rows):
+        """Write several rows and publish them together (single writer only)"""
+        rows = np.asarray(rows, dtype=np.float64)
+        seq = int(self._header[_SEQ])
+        for offset in range(0, len(rows), self.capacity):
+            chunk = rows[offset:offset + self.capacity]
+            start = (seq + offset) % self.capacity
+            stop = start + len(chunk)
+            if stop <= self.capacity:
+                self._rows[start:stop] = chunk
+            else:
+                split = self.capacity - start
+                self._rows[start:] = chunk[:split]
+                self._rows[:stop - self.capacity] = chunk[split:]
+            self._header[_SEQ] = seq + offset + len(chunk)
+
+    def read_since(self, seq):
+        """Return (new_seq, first_seq, views) for rows written after seq
+
+        views holds one or two zero-copy arrays (two when the range wraps). If
+        the reader fell more than a full ring behind, first_seq is later than
+        seq and the skipped rows are lost.
+        """
+        new_seq = self.seq
+        first_seq = max(seq, new_seq - self.capacity)
+        if first_seq >= new_seq:
+            return new_seq, first_seq, []
+        start = first_seq % self.capacity
+        stop = start + (new_seq - first_seq)
+        if stop <= self.capacity:
+            return new_seq, first_seq, [self._rows[start:stop]]
+        return new_seq, first_seq, [self._rows[start:], self._rows[:stop - self.capacity]]
+
+    def copy_since(self, seq):
+        """Return (new_seq, rows, lost): a copy of the rows written after seq
+
+        lost counts rows the reader missed, either because it fell more than a
+        full ring behind or because the writer lapped it while copying.
+        """
+        new_seq, first_seq, views = self.read_since(seq)
+        lost = first_seq - seq
+        rows = np.concatenate(views) if views else np.empty((0, self.n_fields))
+        oldest = self.oldest_intact()
+        if oldest > first_seq:
+            # Keep only rows that are certainly intact
+            drop = min(oldest - first_seq, len(rows))
+            lost += drop
+            rows = rows[drop:]
+        return new_seq, rows, lost
+
+    def oldest_intact(self):
+        """Sequence number of the oldest row that cannot be in the middle of being overwritten"""
+        # The writer fills row seq (evicting seq - capacity) before publishing seq + 1
+        return self.seq - self.capacity + 1
+
+    def close(self):
+        """Release the mapping, unlinking the block if this side created it"""
+        self._header = None
+        self._rows = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
@@ -0,0 +1,339 @@
+"""Columnar sample history: timestamp, set point, measured temperature, humidity, status"""
+import math
+import threading
+
+import numpy as np
+
+# Status bits; alarm is only set by backends that can report one
+STATUS_RUNNING = 1
+STATUS_GAP = 2
+STATUS_ALARM = 4
+
+COLUMNS = (
+    ("time", np.float64),
+    ("set_point", np.float64),
+    ("measured", np.float64),
+    ("humidity", np.float64),
+    ("status", np.uint32),
+)
+COLUMN_NAMES = tuple(name for name, _ in COLUMNS)
+
+
+def status_bits(running=False, gap=False, alarm=False):
+    """Pack status flags into the status column value"""
+    return (STATUS_RUNNING if running else 0) | (STATUS_GAP if gap else 0) | (STATUS_ALARM if alarm else 0)
+
+
+def row_from_status(status):
+    """Sample row for a backend ChamberStatus"""
+    humidity = math.nan if status.humidity is None else status.humidity
+    return (status.timestamp, status.set_point, round(status.measured, 2), humidity,
+            status_bits(running=status.running, alarm=bool(status.alarm)))
+
+
+def gap_row(time):
+    """Sample row marking the start of a period without data"""
+    return (time, math.nan, math.nan, math.nan, STATUS_GAP)
+
+
+def decimate_minmax(x, y, max_points):
+    """Reduce a series to about max_points while keeping every peak and gap
+
+    Each bucket is replaced by its minimum and maximum (in the order they are
+    approached), and buckets that contain NaN keep a NaN so gaps stay visible.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+    if n <= max_points or max_points < 4:
+        return x, y
+    starts = np.unique(np.linspace(0, n, max_points // 2, endpoint=False).astype(np.intp))
+    ends = np.append(starts[1:], n) - 1
+
+    with np.errstate(invalid='ignore'):
+        low = np.fmin.reduceat(y, starts)
+        high = np.fmax.reduceat(y, starts)
+    has_gap = np.add.reduceat(np.isnan(y), starts) > 0
+    return _minmax_points(x[starts], x[ends], low, high, y[starts] <= y[ends], has_gap)
+
+
+def _minmax_points(x_start, x_end, low, high, rising, has_gap):
+    """Two points per bucket, min and max in the order they are approached, NaN after gapped buckets"""
+    out_x = np.empty((len(x_start), 3))
+    out_y = np.empty((len(x_start), 3))
+    out_x[:, 0] = x_start
+    out_x[:, 1] = x_end
+    out_x[:, 2] = x_end
+    out_y[:, 0] = np.where(rising, low, high)
+    out_y[:, 1] = np.where(rising, high, low)
+    out_y[:, 2] = np.nan
+    keep = np.ones((len(x_start), 3), dtype=bool)
+    keep[:, 2] = has_gap
+    return out_x[keep], out_y[keep]
+
+
+class SampleStore:
+    """Append-only sample history kept in parallel typed numpy arrays
+
+    Each column lives in its own array so readers touch only the columns they
+    need. Rows are addressed by an absolute index that keeps counting when the
+    oldest rows are dropped (offset is the number of dropped rows). Arrays are
+    replaced rather than modified in place when they grow or are trimmed, so a
+    view returned earlier stays valid, it just stops seeing new rows.
+    """
+
+    def __init__(self, max_samples=2000000, initial_capacity=4096):
+        self.max_samples = max_samples
+        self.offset = 0
+        self._length = 0
+        self._lock = threading.Lock()
+        self._columns = {name: np.empty(initial_capacity, dtype=dtype) for name, dtype in COLUMNS}
+
+    def __len__(self):
+        return self._length
+
+    @property
+    def total(self):
+        """Number of rows ever appended"""
+        return self.offset + self._length
+
+    def _reserve(self, extra):
+        """Make room for extra rows; caller holds the lock"""
+        needed = self._length + extra
+        drop = max(0, needed - self.max_samples)
+        capacity = len(self._columns["time"])
+        if drop == 0 and needed <= capacity:
+            return
+        if drop:
+            # Drop a tenth of the history at once so trimming is not paid on every append
+            drop = min(self._length, max(drop, self.max_samples // 10))
+        keep = self._length - drop
+        new_capacity = max(capacity, 16)
+        while new_capacity < keep + extra:
+            new_capacity *= 2
+        new_capacity = min(new_capacity, max(self.max_samples, keep + extra))
+        for name, dtype in COLUMNS:
+            column = np.empty(new_capacity, dtype=dtype)
+            column[:keep] = self._columns[name][drop:self._length]
+            self._columns[name] = column
+        self.offset += drop
+        self._length = keep
+
+    def append(self, time, set_point, measured, humidity, status):
+        """Append one row"""
+        with self._lock:
+            self._reserve(1)
+            i = self._length
+            columns = self._columns
+            columns["time"][i] = time
+            columns["set_point"][i] = set_point
+            columns["measured"][i] = measured
+            columns["humidity"][i] = humidity
+            columns["status"][i] = status
+            self._length = i + 1
+
+    def extend(self, rows):
+        """Append rows given as a 2-D array-like in COLUMN_NAMES order"""
+        rows = np.asarray(rows, dtype=np.float64)
+        if rows.size == 0:
+            return
+        rows = rows.reshape(-1, len(COLUMNS))
+        with self._lock:
+            self._reserve(len(rows))
+            start = self._length
+            for i, (name, dtype) in enumerate(COLUMNS):
+                self._columns[name][start:start + len(rows)] = rows[:, i]
+            self._length = start + len(rows)
+
+    def columns(self, *names, start=None, stop=None):
+        """Zero-copy views of the named columns for absolute rows start..stop"""
+        with self._lock:
+            first = 0 if start is None else max(0, start - self.offset)
+            last = self._length if stop is None else max(first, min(self._length, stop - self.offset))
+            return [self._columns[name][first:last] for name in names]
+
+    def snapshot(self, *names):
+        """(offset, total, views) with zero-copy views of every retained row of the named columns
+
+        Taken together under the lock, so the views start at absolute row
+        offset even if another thread trims the store right afterwards.
+        """
+        with self._lock:
+            return self.offset, self.offset + self._length, [self._columns[name][:self._length] for name in names]
+
+    def first(self, name):
+        """Oldest retained value of a column, or None if empty"""
+        with self._lock:
+            return self._columns[name][0] if self._length else None
+
+    def last(self, name):
+        """Most recent value of a column, or None if empty"""
+        with self._lock:
+            return self._columns[name][self._length - 1] if self._length else None
+
+    def index_of_time(self, time):
+        """Absolute index of the first row at or after time"""
+        with self._lock:
+            return self.offset + int(np.searchsorted(self._columns["time"][:self._length], time))
+
+    def clear(self):
+        """Drop every row, keeping the absolute row numbering; earlier views keep their data"""
+        with self._lock:
+            capacity = len(self._columns["time"])
+            self._columns = {name: np.empty(capacity, dtype=dtype) for name, dtype in COLUMNS}
+            self.offset += self._length
+            self._length = 0
+
+
+class _PyramidLevel:
+    """Bucket summaries of one size; bucket j covers absolute rows j * size .. (j + 1) * size"""
+
+    def __init__(self, size, names):
+        self.size = size
+        self.names = names
+        self.first = 0
+        self.count = 0
+        self.low = {name: np.empty(0) for name in names}
+        self.high = {name: np.empty(0) for name in names}
+        self.gap = {name: np.empty(0, dtype=bool) for name in names}
+
+    def reset(self, first):
+        self.first = first
+        self.count = 0
+
+    def write(self, bucket, low, high, gap):
+        """Store summaries for buckets bucket.. (dicts of arrays by column name)"""
+        i = bucket - self.first
+        end = i + len(next(iter(low.values())))
+        capacity = len(self.low[self.names[0]])
+        if end > capacity:
+            capacity = max(end, 2 * capacity, 64)
+            for arrays in (self.low, self.high, self.gap):
+                for name in self.names:
+                    grown = np.empty(capacity, dtype=arrays[name].dtype)
+                    grown[:self.count] = arrays[name][:self.count]
+                    arrays[name] = grown
+        for name in self.names:
+            self.low[name][i:end] = low[name]
+            self.high[name][i:end] = high[name]
+            self.gap[name][i:end] = gap[name]
+        self.count = end
+
+    def drop_before(self, bucket):
+        """Forget buckets before bucket"""
+        drop = min(bucket - self.first, self.count)
+        if drop <= 0:
+            return
+        for arrays in (self.low, self.high, self.gap):
+            for name in self.names:
+                arrays[name] = arrays[name][drop:self.count].copy()
+        self.first += drop
+        self.count -= drop
+
+
+class MinMaxPyramid:
+    """Bucket minima and maxima of SampleStore columns at sizes factor, factor**2, ...
+
+    Kept in step with the store lazily: sync() folds in the rows appended
+    since the last call, recomputing only the buckets they touch, and forgets
+    buckets the store has trimmed. fetch() reduces any row range to about
+    max_points starting from the coarsest level that still resolves it, so
+    the cost of a frame depends on the plot width, not on how much history
+    is visible.
+    """
+
+    def __init__(self, store, names=("set_point", "measured", "humidity"), factor=16, levels=4):
+        self.store = store
+        self.names = tuple(names)
+        self.factor = factor
+        self.levels = [_PyramidLevel(factor ** (k + 1), self.names) for k in range(levels)]
+        self.synced = None
+
+    @staticmethod
+    def _reduce(low, high, gap, starts):
+        with np.errstate(invalid='ignore'):
+            return np.fmin.reduceat(low, starts), np.fmax.reduceat(high, starts), np.add.reduceat(gap, starts) > 0
+
+    def _bucket_starts(self, start, stop, size):
+        """Offsets from start of the bucket boundaries covering start..stop"""
+        boundaries = np.arange((start // size + 1) * size, stop, size) - start
+        return np.concatenate(([0], boundaries)).astype(np.intp)
+
+    def sync(self):
+        """Fold in the rows appended to the store since the last call"""
+        self._sync(*self.store.snapshot(*self.names))
+
+    def _sync(self, offset, total, columns):
+        """sync() against a store snapshot; columns are views of self.names from row offset"""
+        if self.synced is None or self.synced < offset or self.synced > total:
+            # New, cleared or lapped by trimming: rebuild from the oldest retained row
+            for level in self.levels:
+                level.reset(offset // level.size)
+            self.synced = offset
+        for level in self.levels:
+            level.drop_before(offset // level.size)
+        if total <= self.synced:
+            return
+
+        # Finest level straight from the samples, starting at the first touched bucket
+        level = self.levels[0]
+        start = max(self.synced // level.size * level.size, offset)
+        columns = [values[start - offset:] for values in columns]
+        starts = self._bucket_starts(start, total, level.size)
+        low, high, gap = {}, {}, {}
+        for name, values in zip(self.names, columns):
+            low[name], high[name], gap[name] = self._reduce(values, values, np.isnan(values), starts)
+        touched = max(start // level.size, level.first)
+        level.write(touched, low, high, gap)
+
+        # Coarser levels from the level below
+        for child, level in zip(self.levels, self.levels[1:]):
+            parent_bucket = max(touched // self.factor, level.first)
+            first_child = max(parent_bucket * self.factor, child.first)
+            i = first_child - child.first
+            starts = self._bucket_starts(first_child, child.first + child.count, self.factor)
+            low, high, gap = {}, {}, {}
+            for name in self.names:
+                low[name], high[name], gap[name] = self._reduce(child.low[name][i:child.count],
+                                                                child.high[name][i:child.count],
+                                                                child.gap[name][i:child.count], starts)
+            level.write(first_child // self.factor, low, high, gap)
+            touched = first_child // self.factor
+        self.synced = total
+
+    def fetch(self, name, start, stop, max_points):
+        """(times, values) of column name for absolute rows start..stop, about max_points long"""
+        # One snapshot for the pyramid and the raw rows, so a trim in between cannot misalign them
+        offset, total, columns = self.store.snapshot("time", *self.names)
+        self._sync(offset, total, columns[1:])
+        times, values = columns[0], columns[1 + self.names.index(name)]
+        start = max(start, offset)
+        stop = min(stop, total)
+        # Coarsest level that still has a bucket per output bucket, reduced further below
+        buckets = max(1, max_points // 2)
+        fine_enough = [level for level in self.levels if (stop - start) // level.size >= buckets]
+        if stop - start <= max_points or not fine_enough:
+            return decimate_minmax(times[start - offset:stop - offset], values[start - offset:stop - offset],
+                                   max_points)
+        level = fine_enough[-1]
+        size = level.size
+        first_bucket = max(start // size, level.first)
+        last_bucket = min((stop - 1) // size + 1, level.first + level.count)
+        i, j = first_bucket - level.first, last_bucket - level.first
+
+        # Bucket edges clipped to the requested rows, for the x positions and the approach order
+        row_starts = np.maximum(np.arange(first_bucket, last_bucket) * size, start)
+        row_ends = np.minimum(row_starts // size * size + size, stop) - 1
+        row_starts -= offset
+        row_ends -= offset
+        low, high, gap = level.low[name][i:j].copy(), level.high[name][i:j].copy(), level.gap[name][i:j].copy()
+        # The edge buckets reach past the requested rows, summarize the rows they keep from the samples
+        for k in {0, len(low) - 1}:
+            if row_ends[k] - row_starts[k] + 1 < size:
+                edge = values[row_starts[k]:row_ends[k] + 1]
+                (low[k],), (high[k],), (gap[k],) = self._reduce(edge, edge, np.isnan(edge), [0])
+        x, y = _minmax_points(times[row_starts], times[row_ends], low, high,
+                              values[row_starts] <= values[row_ends], gap)
+        if len(x) > max_points:
+            return decimate_minmax(x, y, max_points)
+        return x, y
@@ -0,0 +1,208 @@
+"""Recorded chamber runs: one directory per session holding samples, events and metadata"""
+import json
+import os
+import re
+import threading
+import time
+
+import numpy as np
+
+from chamber_gui import events
+from chamber_gui.markers import MarkerIndex
+from chamber_gui.samples import COLUMN_NAMES, COLUMNS, STATUS_ALARM, STATUS_GAP, SampleStore
+
+SESSION_VERSION = 1
+DEFAULT_SESSION_DIR = os.path.join(os.path.expanduser("~"), ".votsch_gui", "sessions")
+META_FILE = "meta.json"
+SAMPLES_FILE = "samples.bin"
+EVENTS_FILE = "events.jsonl"
+# Seconds between rewrites of meta.json while recording, bounding what a crash loses from it
+META_INTERVAL = 30.0
+
+# One packed little-endian record per sample, in SampleStore column order
+SAMPLE_DTYPE = np.dtype([(name, np.dtype(dtype).newbyteorder("<")) for name, dtype in COLUMNS])
+
+_UNSAFE = re.compile(r"[^\w.-]+")
+
+
+def _session_name(start, chamber):
+    """Directory name sorting by start time, e.g. 20240501-093000-192.168.0.21"""
+    stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(start))
+    chamber = _UNSAFE.sub("_", chamber or "").strip("_")
+    return f"{stamp}-{chamber}" if chamber else stamp
+
+
+def _write_json(path, data):
+    """Write JSON atomically so a crash never leaves a truncated file"""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+class SessionRecorder:
+    """Writes one session to disk while it runs
+
+    Samples are appended to samples.bin as packed SAMPLE_DTYPE records and
+    set point and run events to events.jsonl as they arrive. Temperature
+    extremes, alarm and gap counts are kept running per batch, so the catalog
+    never has to read the samples. meta.json is written when the session
+    opens, at most every META_INTERVAL seconds while it records (after
+    flushing the samples it counts) and when close() sets its end, so a
+    session that crashes is still catalogued with nearly all of its data.
+    """
+
+    def __init__(self, directory, chamber_ip, chamber_id=None, idn=None, profile="", start=None):
+        start = time.time() if start is None else start
+        name = _session_name(start, chamber_ip)
+        path = os.path.join(directory, name)
+        suffix = 1
+        while os.path.exists(path):
+            suffix += 1
+            path = os.path.join(directory, f"{name}-{suffix}")
+        os.makedirs(path)
+        self.path = path
+        self.meta = {"version": SESSION_VERSION, "chamber_ip": chamber_ip, "chamber_id": chamber_id, "idn": idn,
+                     "profile": profile or "", "start": start, "end": None, "samples": 0,
+                     "min_temp": None, "max_temp": None, "min_set_point": None, "max_set_point": None,
+                     "alarm_count": 0, "gap_count": 0}
+        self._alarm = False
+        self._lock = threading.Lock()
+        self._samples = open(os.path.join(path, SAMPLES_FILE), "ab")
+        self._events = open(os.path.join(path, EVENTS_FILE), "a", encoding="utf-8")
+        _write_json(os.path.join(path, META_FILE), self.meta)
+        self._meta_written = time.monotonic()
+
+    @property
+    def closed(self):
+        return self._samples is None
+
+    def _update_range(self, low_key, high_key, values):
+        values = values[values == values]
+        if not len(values):
+            return
+        low, high = float(values.min()), float(values.max())
+        if self.meta[low_key] is None or low < self.meta[low_key]:
+            self.meta[low_key] = low
+        if self.meta[high_key] is None or high > self.meta[high_key]:
+            self.meta[high_key] = high
+
+    def append(self, rows):
+        """Record sample rows given as a 2-D array-like in COLUMN_NAMES order"""
+        rows = np.asarray(rows, dtype=np.float64)
+        if rows.size == 0:
+            return
+        rows = rows.reshape(-1, len(COLUMNS))
+        records = np.empty(len(rows), dtype=SAMPLE_DTYPE)
+        for i, name in enumerate(COLUMN_NAMES):
+            records[name] = rows[:, i]
+        with self._lock:
+            if self._samples is None:
+                return
+            self._samples.write(records.tobytes())
+            self.meta["samples"] += len(records)
+            self._update_range("min_temp", "max_temp", records["measured"])
+            self._update_range("min_set_point", "max_set_point", records["set_point"])
+            self.meta["gap_count"] += int(np.count_nonzero(records["status"] & STATUS_GAP))
+            # Count alarms as they come on, not every sample they stay on; gap rows say nothing either way
+            alarm = (records["status"][(records["status"] & STATUS_GAP) == 0] & STATUS_ALARM) != 0
+            if len(alarm):
+                previous = np.concatenate(([self._alarm], alarm[:-1]))
+                self.meta["alarm_count"] += int(np.count_nonzero(alarm & ~previous))
+                self._alarm = bool(alarm[-1])
+            if time.monotonic() - self._meta_written >= META_INTERVAL:
+                self._samples.flush()
+                self._events.flush()
+                _write_json(os.path.join(self.path, META_FILE), self.meta)
+                self._meta_written = time.monotonic()
+
+    def add_event(self, kind, timestamp=None, **payload):
+        """Record a set point or run event"""
+        timestamp = time.time() if timestamp is None else timestamp
+        line = json.dumps(dict(payload, time=timestamp, kind=kind))
+        with self._lock:
+            if self._events is None:
+                return
+            self._events.write(line + "\n")
+
+    def flush(self):
+        """Push buffered samples and events to disk so readers of the files see them"""
+        with self._lock:
+            if self._samples is not None:
+                self._samples.flush()
+                self._events.flush()
+
+    def close(self, end=None):
+        """Finish the session and return its metadata, including its path"""
+        with self._lock:
+            if self._samples is not None:
+                self._samples.close()
+                self._events.close()
+                self._samples = self._events = None
+                self.meta["end"] = time.time() if end is None else float(end)
+                _write_json(os.path.join(self.path, META_FILE), self.meta)
+            return dict(self.meta, path=self.path)
+
+
+def list_sessions(directory=DEFAULT_SESSION_DIR):
+    """Paths of the session directories under directory, oldest first"""
+    try:
+        names = sorted(os.listdir(directory))
+    except OSError:
+        return []
+    return [os.path.join(directory, name) for name in names
+            if os.path.isfile(os.path.join(directory, name, META_FILE))]
+
+
+def load_meta(path):
+    """Metadata of the session at path, with the path added"""
+    with open(os.path.join(path, META_FILE), "r", encoding="utf-8") as f:
+        meta = json.load(f)
+    if not isinstance(meta, dict) or meta.get("version") != SESSION_VERSION:
+        raise ValueError(f"Unsupported session metadata in {path}")
+    meta["path"] = path
+    return meta
+
+
+def read_samples(path):
+    """Sample records of the session at path, memory-mapped read-only"""
+    samples_path = os.path.join(path, SAMPLES_FILE)
+    # A session that crashed mid-write may end in a partial record
+    count = os.path.getsize(samples_path) // SAMPLE_DTYPE.itemsize
+    if count == 0:
+        return np.empty(0, dtype=SAMPLE_DTYPE)
+    return np.memmap(samples_path, dtype=SAMPLE_DTYPE, mode="r", shape=(count,))
+
+
+def read_events(path):
+    """Event dicts of the session at path in recording order, skipping damaged lines"""
+    records = []
+    try:
+        with open(os.path.join(path, EVENTS_FILE), "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    continue
+    except OSError:
+        pass
+    return records
+
+
+def load_history(path):
+    """SampleStore and MarkerIndex rebuilt from the session at path, ready for a HistoryPlot"""
+    records = read_samples(path)
+    store = SampleStore(max_samples=max(len(records), 1), initial_capacity=max(len(records), 16))
+    if len(records):
+        store.extend(np.column_stack([records[name].astype(np.float64) for name in COLUMN_NAMES]))
+    markers = MarkerIndex()
+    for record in read_events(path):
+        timestamp = record.get("time")
+        if record.get("kind") == events.SETPOINT:
+            markers.add_set_point(timestamp, record.get("temperature"))
+        elif record.get("kind") == events.RUN_STATE:
+            if record.get("state") == "started":
+                markers.start_run(timestamp)
+            else:
+                markers.stop_run(timestamp)
+    return store, markers
@@ -0,0 +1,151 @@
+"""Connection supervision with automatic reconnect and offline command buffering"""
+import random
+import threading
+from collections import OrderedDict
+
+
+def backoff_delay(attempt, base_delay=1.0, max_delay=60.0, jitter=0.5):
+    """Exponential backoff delay for a retry attempt, spread by +/- jitter"""
+    delay = min(max_delay, base_delay * 2 ** attempt)
+    return delay * random.uniform(1 - jitter, 1 + jitter)
+
+
+class ConnectionSupervisor:
+    """Watch a chamber link and reconnect with jittered exponential backoff
+
+    Commands are callables taking the chamber object. While the link is down they
+    are kept in a bounded queue keyed by name, so a newer set point replaces an
+    older one, and they are replayed in order once the chamber is reachable again.
+    """
+
+    def __init__(self, connect, chamber, base_delay=1.0, max_delay=60.0, jitter=0.5, queue_size=32,
+                 on_offline=None, on_reconnected=None, on_retry=None):
+        self.connect = connect
+        self.chamber = chamber
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.queue_size = queue_size
+        self.on_offline = on_offline
+        self.on_reconnected = on_reconnected
+        self.on_retry = on_retry
+
+        self.online = True
+        self.attempts = 0
+        self.dropped_commands = 0
+        self._pending = OrderedDict()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def next_delay(self):
+        """Delay before the next reconnect attempt"""
+        return backoff_delay(self.attempts, self.base_delay, self.max_delay, self.jitter)
+
+    def report_failure(self, error):
+        """Mark the link as down and start reconnecting if not already doing so"""
+        with self._lock:
+            if not self.online or self._stop.is_set():
+                return
+            self.online = False
+            self.attempts = 0
+            self._thread = threading.Thread(target=self._reconnect_loop)
+            self._thread.daemon = True
+            self._thread.start()
+        if self.on_offline:
+            self.on_offline(error)
+
+    def submit(self, name, command):
+        """Run command now if online, otherwise queue it; return True if it ran"""
+        with self._lock:
+            if self.online:
+                chamber = self.chamber
+            else:
+                self._enqueue(name, command)
+                return False
+        try:
+            command(chamber)
+        except Exception as e:
+            with self._lock:
+                self._enqueue(name, command)
+            self.report_failure(e)
+            return False
+        return True
+
+    def pending_count(self):
+        """Number of commands waiting for the link to come back"""
+        with self._lock:
+            return len(self._pending)
+
+    def close(self):
+        """Stop reconnecting and discard queued commands
+
+        A reconnect attempt still in progress closes the chamber it opened
+        instead of replaying commands or reporting the reconnect.
+        """
+        with self._lock:
+            self._stop.set()
+            self._pending.clear()
+
+    def _enqueue(self, name, command):
+        """Queue a command, replacing an older one with the same name; caller holds the lock"""
+        self._pending.pop(name, None)
+        if len(self._pending) >= self.queue_size:
+            self._pending.popitem(last=False)
+            self.dropped_commands += 1
+        self._pending[name] = command
+
+    def _reconnect_loop(self):
+        """Retry connecting until it succeeds or the supervisor is closed"""
+        while not self._stop.wait(self.next_delay()):
+            self.attempts += 1
+            if self.on_retry:
+                self.on_retry(self.attempts)
+            try:
+                chamber = self.connect()
+            except Exception:
+                continue
+            try:
+                flushed = self._flush(chamber)
+            except Exception:
+                _close_quietly(chamber)
+                continue
+            if flushed is None:
+                # Closed while connecting, the operator no longer wants this chamber
+                _close_quietly(chamber)
+                return
+            if self.on_reconnected:
+                self.on_reconnected(chamber, self.attempts, flushed)
+            return
+
+    def _flush(self, chamber):
+        """Replay queued commands in order and go online once the queue is empty
+
+        Returns the number of commands sent, or None if the supervisor was
+        closed meanwhile, in which case nothing more is sent.
+        """
+        flushed = 0
+        while True:
+            with self._lock:
+                if self._stop.is_set():
+                    return None
+                if not self._pending:
+                    # Going online under the lock means no command can slip into the queue unsent
+                    self.chamber = chamber
+                    self.online = True
+                    return flushed
+                name, command = next(iter(self._pending.items()))
+            command(chamber)
+            with self._lock:
+                # Only drop the entry if it was not replaced while the command ran
+                if self._pending.get(name) is command:
+                    del self._pending[name]
+            flushed += 1
+
+
+def _close_quietly(chamber):
+    """Close a chamber connection nobody will use, ignoring errors from a dead link"""
+    try:
+        chamber.close()
+    except Exception:
+        pass
@@ -0,0 +1,63 @@
+"""Visible time window of the history plot"""
+
+
+class Viewport:
+    """Follow-live or fixed time window over the sample history
+
+    While following live the window ends at the newest sample and spans span
+    seconds (the whole history when span is None). Zooming or panning fixes
+    the window; panning it back to the newest sample resumes following.
+    Times are sample timestamps in seconds.
+    """
+
+    # Narrowest window zooming can reach
+    MIN_SPAN = 10.0
+
+    def __init__(self, span=None):
+        self.follow_live = True
+        self.span = span
+        self.start = None
+        self.end = None
+
+    def limits(self, first_time, last_time):
+        """(start, end) of the visible window for a history from first_time to last_time"""
+        if not self.follow_live:
+            return self.start, self.end
+        if self.span is None:
+            return first_time, last_time
+        return last_time - self.span, last_time
+
+    def follow(self, span=None):
+        """Follow the newest samples, showing span seconds or everything when span is None"""
+        self.follow_live = True
+        self.span = span
+
+    def zoom(self, factor, center, first_time, last_time):
+        """Scale the window by factor around timestamp center (factor < 1 zooms in)"""
+        start, end = self.limits(first_time, last_time)
+        width = max(self.MIN_SPAN, (end - start) * factor)
+        if self.follow_live:
+            # Zooming a live window keeps it live, anchored at the newest sample
+            self.follow(None if width >= last_time - first_time else width)
+            return
+        fraction = 0.5 if end <= start else min(1.0, max(0.0, (center - start) / (end - start)))
+        start = center - fraction * width
+        self._fix(start, start + width, first_time, last_time)
+
+    def pan(self, seconds, first_time, last_time):
+        """Move the window by seconds, negative being back in time"""
+        start, end = self.limits(first_time, last_time)
+        self._fix(start + seconds, end + seconds, first_time, last_time)
+
+    def _fix(self, start, end, first_time, last_time):
+        """Set a fixed window kept inside the history, following live again if it reaches the end"""
+        width = end - start
+        if end >= last_time:
+            # Reaching the newest sample hands the window back to follow-live at this width
+            span = None if width >= last_time - first_time else width
+            self.follow(span)
+            return
+        if start < first_time:
+            start, end = first_time, first_time + width
+        self.follow_live = False
+        self.start, self.end = start, end
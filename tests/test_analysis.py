@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from chamber_gui.analysis import segment_kpis
+
+
+def _step_session(gap=None, period=1.0):
+    """25 °C hold for 1000 s, then a first-order step to 85 °C (time constant 200 s) for 4000 s"""
+    times = np.arange(0, 5000, period)
+    set_point = np.where(times < 1000, 25.0, 85.0)
+    measured = np.where(times < 1000, 25.0, 85.0 - 60.0 * np.exp(-(times - 1000) / 200.0))
+    if gap is not None:
+        measured[(times >= gap[0]) & (times < gap[1])] = np.nan
+    return times, set_point, measured
+
+
+def test_step_and_hold():
+    kpis = segment_kpis(*_step_session(), tolerance=1.0)
+    assert len(kpis["start"]) == 2
+    hold, step = 0, 1
+
+    assert kpis["start"][step] == 1000 and kpis["end"][step] == 4999
+    assert kpis["initial"][step] == 25.0
+    # 10 % to 90 % of a first-order step takes tau * ln(9)
+    assert kpis["rise_time"][step] == pytest.approx(200 * np.log(9), abs=1.0)
+    # Within 1 °C of 85 once 60 * exp(-t / 200) <= 1
+    assert kpis["settling_time"][step] == pytest.approx(200 * np.log(60), abs=1.0)
+    assert kpis["arrival_time"][step] == kpis["settling_time"][step]
+    assert kpis["overshoot"][step] == 0.0
+    assert kpis["ramp_rate"][step] > 0
+
+    # A hold has no step to rise through and is settled from its first sample
+    assert np.isnan(kpis["rise_time"][hold])
+    assert np.isnan(kpis["overshoot"][hold])
+    assert kpis["settling_time"][hold] == 0.0
+    assert kpis["soak_in_tolerance"][hold] == 1.0
+    assert kpis["time_in_tolerance"][hold] == 1000.0
+
+
+def test_gap_after_settling_does_not_move_settling_time():
+    baseline = segment_kpis(*_step_session(), tolerance=1.0)
+    kpis = segment_kpis(*_step_session(gap=(3000, 3010)), tolerance=1.0)
+    assert kpis["settling_time"][1] == baseline["settling_time"][1]
+    assert kpis["time_in_tolerance"][1] == pytest.approx(baseline["time_in_tolerance"][1] - 10)
+    assert kpis["steady_state_error"][1] == pytest.approx(baseline["steady_state_error"][1])
+
+
+def test_gap_hides_the_last_excursion():
+    times, set_point, measured = _step_session()
+    measured[4000] = 90.0
+    kpis = segment_kpis(times, set_point, measured, tolerance=1.0)
+    assert kpis["settling_time"][1] == 3001.0
+
+    # A segment whose readings end outside the band never settled, even if a gap follows
+    measured[4001:] = np.nan
+    kpis = segment_kpis(times, set_point, measured, tolerance=1.0)
+    assert np.isnan(kpis["settling_time"][1])
+
+
+def test_set_point_events_define_segments():
+    times, set_point, measured = _step_session()
+    kpis = segment_kpis(times, set_point, measured, tolerance=1.0,
+                        set_point_events=[(0.0, 25.0), (999.5, 85.0)])
+    assert list(kpis["start"]) == [0.0, 1000.0]
+    assert list(kpis["set_point"]) == [25.0, 85.0]
+
+
+def test_no_set_point():
+    kpis = segment_kpis(np.arange(5.0), np.full(5, np.nan), np.zeros(5))
+    assert all(len(values) == 0 for values in kpis.values())
@@ -0,0 +1,33 @@
+import math
+
+from chamber_gui.catalog import SessionCatalog
+from chamber_gui.samples import gap_row, status_bits
+from chamber_gui.sessions import SessionRecorder, load_meta
+
+
+def _row(t, measured, alarm=False):
+    return (t, 25.0, measured, math.nan, status_bits(running=True, alarm=alarm))
+
+
+def test_alarms_are_counted_as_they_come_on(tmp_path):
+    recorder = SessionRecorder(str(tmp_path), "192.168.0.21", start=0.0)
+    recorder.append([_row(0, 25), _row(1, 26, alarm=True), _row(2, 27, alarm=True)])
+    # Still on across a batch boundary and a gap, then off and on again
+    recorder.append([_row(3, 27, alarm=True), gap_row(4), _row(5, 27, alarm=True), _row(6, 25), _row(7, 30, True)])
+    meta = recorder.close(end=8.0)
+    assert meta["alarm_count"] == 2 and meta["gap_count"] == 1
+    assert load_meta(meta["path"])["alarm_count"] == 2
+
+
+def test_query_by_chamber_suffix_and_alarms(tmp_path):
+    catalog = SessionCatalog(":memory:")
+    for start, ip, alarms in ((0.0, "192.168.0.21", 0), (10.0, "192.168.0.121", 1), (20.0, "10.0.0.5", 3)):
+        recorder = SessionRecorder(str(tmp_path), ip, start=start)
+        recorder.append([_row(start + i, 25, alarm=i < alarms and i % 2 == 0) for i in range(6)])
+        catalog.add(recorder.close(end=start + 6))
+
+    assert [s.chamber_ip for s in catalog.query(chamber=".21")] == ["192.168.0.21"]
+    assert [s.chamber_ip for s in catalog.query(chamber="21")] == ["192.168.0.121", "192.168.0.21"]
+    assert catalog.query(chamber="_21") == []
+    assert [s.chamber_ip for s in catalog.query(alarms=True)] == ["10.0.0.5", "192.168.0.121"]
+    assert [s.alarm_count for s in catalog.query()] == [2, 1, 0]
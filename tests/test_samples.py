@@ -0,0 +1,89 @@
+import threading
+
+import numpy as np
+import pytest
+
+from chamber_gui.samples import MinMaxPyramid, SampleStore, decimate_minmax
+
+
+def _store(values, max_samples=2000000):
+    store = SampleStore(max_samples=max_samples)
+    count = len(values)
+    store.extend(np.column_stack([np.arange(count, dtype=np.float64), values, values, values, np.zeros(count)]))
+    return store
+
+
+def _check_range(store, pyramid, start, stop, max_points):
+    x, y = pyramid.fetch("measured", start, stop, max_points)
+    times, values = store.columns("time", "measured", start=start, stop=stop)
+    assert x.min() >= times[0] and x.max() <= times[-1]
+    shown = y[y == y]
+    assert np.nanmin(values) == shown.min()
+    assert np.nanmax(values) == shown.max()
+
+
+def test_fetch_ignores_rows_outside_the_window():
+    values = np.zeros(200000)
+    values[1000] = -100.0
+    values[90000] = 100.0
+    store = _store(values)
+    x, y = MinMaxPyramid(store).fetch("measured", 1001, 90000, 2000)
+    assert y.min() == 0.0 and y.max() == 0.0
+    assert x.min() >= 1001 and x.max() <= 89999
+
+
+def test_fetch_matches_plain_reduction():
+    rng = np.random.default_rng(1)
+    values = np.cumsum(rng.normal(size=300000))
+    values[rng.integers(0, len(values), 50)] = np.nan
+    store = _store(values)
+    pyramid = MinMaxPyramid(store)
+    for _ in range(200):
+        start, stop = np.sort(rng.integers(0, len(values), 2))
+        if stop - start < 10:
+            continue
+        _check_range(store, pyramid, int(start), int(stop), int(rng.integers(100, 3000)))
+
+
+def test_fetch_follows_appends_and_trimming():
+    rng = np.random.default_rng(2)
+    store = SampleStore(max_samples=100000)
+    pyramid = MinMaxPyramid(store)
+    for batch in range(20):
+        values = rng.normal(size=17000) + batch
+        start = store.total
+        store.extend(np.column_stack([np.arange(start, start + len(values), dtype=np.float64), values, values,
+                                      values, np.zeros(len(values))]))
+        _check_range(store, pyramid, store.offset + 123, store.total - 45, 1000)
+
+
+def test_fetch_while_another_thread_trims():
+    # measured equals time, so any misalignment between pyramid and rows shows up as y != x
+    store = _store(np.arange(50000, dtype=np.float64), max_samples=60000)
+    pyramid = MinMaxPyramid(store)
+    stop = threading.Event()
+
+    def feed():
+        total = store.total
+        while not stop.is_set():
+            times = np.arange(total, total + 5000, dtype=np.float64)
+            store.extend(np.column_stack([times, times, times, times, np.zeros(len(times))]))
+            total += len(times)
+
+    feeder = threading.Thread(target=feed)
+    feeder.start()
+    try:
+        for _ in range(300):
+            x, y = pyramid.fetch("measured", 0, store.total, 1000)
+            assert np.array_equal(x, y)
+    finally:
+        stop.set()
+        feeder.join()
+
+
+@pytest.mark.parametrize("count", [10, 5000])
+def test_decimate_minmax_keeps_extremes(count):
+    y = np.sin(np.arange(count) / 7.0)
+    x, out = decimate_minmax(np.arange(count), y, 100)
+    assert out.min() == y.min() and out.max() == y.max()
+    assert len(x) == len(out)
@@ -0,0 +1,49 @@
+import threading
+
+from chamber_gui.supervisor import ConnectionSupervisor
+
+
+class _Chamber:
+    def __init__(self):
+        self.commands = []
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def _supervisor(connect, **callbacks):
+    return ConnectionSupervisor(connect, _Chamber(), base_delay=0.01, max_delay=0.01, jitter=0.0, **callbacks)
+
+
+def test_reconnect_replays_queued_commands():
+    reconnected = threading.Event()
+    fresh = _Chamber()
+    supervisor = _supervisor(lambda: fresh, on_reconnected=lambda *args: reconnected.set())
+    supervisor.report_failure(OSError("link down"))
+    supervisor.submit("set point", lambda chamber: chamber.commands.append(50))
+    assert reconnected.wait(2)
+    assert supervisor.online and supervisor.chamber is fresh
+    assert fresh.commands == [50] and not fresh.closed
+
+
+def test_close_during_connect_discards_the_new_chamber():
+    connecting, release = threading.Event(), threading.Event()
+    fresh = _Chamber()
+    reconnected = []
+
+    def connect():
+        connecting.set()
+        release.wait(2)
+        return fresh
+
+    supervisor = _supervisor(connect, on_reconnected=lambda *args: reconnected.append(args))
+    supervisor.report_failure(OSError("link down"))
+    supervisor.submit("set point", lambda chamber: chamber.commands.append(50))
+    assert connecting.wait(2)
+    supervisor.close()
+    release.set()
+    supervisor._thread.join(2)
+
+    assert fresh.closed and fresh.commands == []
+    assert reconnected == [] and not supervisor.online